@@ -5,8 +5,10 @@ from fastapi import Request, WebSocket
 from ..core.config import Settings
 from ..services.device_registry import DeviceRegistry
 from ..services.prediction_cache import PredictionCache
+from ..services.startup import StartupReport
 from ..services.websocket_manager import WebSocketManager
-from ..workers.pipeline import InferencePipeline
+from ..workers.model_registry import ModelRegistry
+from ..workers.pool import InferenceWorkerPool
 
 
 def get_settings(request: Request) -> Settings:
@@ -26,5 +28,13 @@ async def get_websocket_manager(websocket: WebSocket) -> WebSocketManager:
     return websocket.app.state.websocket_manager  # type: ignore[attr-defined]
 
 
-def get_pipeline(request: Request) -> InferencePipeline:
-    return request.app.state.pipeline  # type: ignore[attr-defined]
+def get_worker_pool(request: Request) -> InferenceWorkerPool:
+    return request.app.state.worker_pool  # type: ignore[attr-defined]
+
+
+def get_model_registry(request: Request) -> ModelRegistry:
+    return request.app.state.model_registry  # type: ignore[attr-defined]
+
+
+def get_startup_report(request: Request) -> StartupReport:
+    return request.app.state.startup  # type: ignore[attr-defined]
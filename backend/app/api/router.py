@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from .routes import csi, devices, health, predictions, signal, stream, training
+from .routes import csi, devices, health, models, predictions, signal, stream, training
 
 api_router = APIRouter()
 api_router.include_router(health.router)
@@ -11,4 +11,5 @@ api_router.include_router(predictions.router)
 api_router.include_router(stream.router)
 api_router.include_router(devices.router)
 api_router.include_router(signal.router)
+api_router.include_router(models.router)
 api_router.include_router(training.router)
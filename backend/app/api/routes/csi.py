@@ -1,24 +1,156 @@
 from __future__ import annotations
 
 import asyncio
+from typing import List, Set, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 
-from ...schemas.csi import CSIIngestResponse, CSIPacket
-from ..deps import get_device_registry
+from ...schemas.csi import (
+    CSIBatch,
+    CSIBatchIngestResponse,
+    CSIFrameRef,
+    CSIIngestResponse,
+    CSIPacket,
+)
+from ...services.csi_codec import (
+    BINARY_CONTENT_TYPE,
+    CSIDecodeError,
+    batch_frame_count,
+    decode_binary_batch,
+)
+from ..deps import get_device_registry, get_settings
 
 router = APIRouter(prefix="/csi", tags=["csi"])
 
 
+def _enqueue(queue, registry, packets: List[CSIPacket]) -> Tuple[List[CSIPacket], Set[str]]:
+    """Queue as many of ``packets`` as fit; returns the frames rejected and MACs accepted.
+
+    Rejected frames are forgotten by the registry's sequence trackers so that a retry
+    is not dropped as a duplicate.
+    """
+
+    rejected: List[CSIPacket] = []
+    accepted_macs: Set[str] = set()
+    for packet in packets:
+        try:
+            queue.put_nowait(packet)
+        except asyncio.QueueFull:
+            rejected.append(packet)
+            continue
+        accepted_macs.add(packet.mac_address)
+    if rejected:
+        registry.forget_packets(rejected)
+    return rejected, accepted_macs
+
+
+async def _read_body(request: Request, max_bytes: int) -> bytes:
+    """Read the request body, refusing with 413 as soon as it exceeds ``max_bytes``."""
+
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Batch exceeds {max_bytes} bytes",
+    )
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_bytes:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
+def _check_frame_count(count: int, max_frames: int) -> None:
+    if count > max_frames:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {max_frames} frames",
+        )
+
+
 @router.post("", response_model=CSIIngestResponse, status_code=status.HTTP_202_ACCEPTED)
 async def ingest_csi(
     payload: CSIPacket,
     request: Request,
     registry=Depends(get_device_registry),
 ) -> CSIIngestResponse:
-    queue: asyncio.Queue = request.app.state.queue  # type: ignore[attr-defined]
-    if queue.full():
+    packets, duplicates = registry.observe_packets([payload])
+    queue = request.app.state.queue  # type: ignore[attr-defined]
+    # With reordering on, ``packets`` may lack the payload (held or a dropped duplicate)
+    # and may carry earlier held frames released by it.
+    rejected, accepted_macs = _enqueue(queue, registry, packets)
+    if any(packet is payload for packet in rejected):
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Queue full")
+
+    for mac_address in accepted_macs | {payload.mac_address}:
+        registry.upsert(mac_address)
+    released = any(packet is payload for packet in packets)
+    return CSIIngestResponse(
+        accepted=released,
+        queued=queue.qsize(),
+        duplicate=bool(duplicates),
+        held=not released and not duplicates,
+    )
+
+
+@router.post(
+    "/batch",
+    response_model=CSIBatchIngestResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": CSIBatch.model_json_schema()},
+                BINARY_CONTENT_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+async def ingest_csi_batch(
+    request: Request,
+    registry=Depends(get_device_registry),
+    settings=Depends(get_settings),
+) -> CSIBatchIngestResponse:
+    # Oversized batches are refused before any parsing: the body is capped while it
+    # is read, and a binary batch's frame count is taken from its header.
+    body = await _read_body(request, settings.csi_batch_max_bytes)
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == BINARY_CONTENT_TYPE:
+        try:
+            _check_frame_count(batch_frame_count(body), settings.csi_batch_max_frames)
+            packets = decode_binary_batch(body)
+        except CSIDecodeError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    else:
+        try:
+            packets = CSIBatch.model_validate_json(body).packets
+        except ValidationError as exc:
+            errors = exc.errors(include_url=False)
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in errors]
+            ) from exc
+        _check_frame_count(len(packets), settings.csi_batch_max_frames)
+
+    packets, duplicates = registry.observe_packets(packets)
+    queue = request.app.state.queue  # type: ignore[attr-defined]
+    rejected, accepted_macs = _enqueue(queue, registry, packets)
+    if packets and len(rejected) == len(packets):
         raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Queue full")
 
-    await queue.put(payload)
-    registry.upsert(payload.mac_address)
-    return CSIIngestResponse(accepted=True, queued=queue.qsize())
+    for mac_address in accepted_macs:
+        registry.upsert(mac_address)
+    return CSIBatchIngestResponse(
+        accepted=len(packets) - len(rejected),
+        rejected=len(rejected),
+        queued=queue.qsize(),
+        duplicates=duplicates,
+        rejected_frames=[
+            CSIFrameRef(mac_address=packet.mac_address, sequence_id=packet.sequence_id)
+            for packet in rejected
+        ],
+    )
@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
-
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from ...schemas.health import HealthCheck, ReadinessProbe
-from ..deps import get_settings
+from ..deps import get_model_registry, get_settings, get_startup_report
 
 router = APIRouter(tags=["health"])
 
@@ -15,10 +13,24 @@ async def health_check() -> HealthCheck:
     return HealthCheck()
 
 
-@router.get("/readiness", response_model=ReadinessProbe)
-async def readiness(settings=Depends(get_settings)) -> ReadinessProbe:
+@router.get(
+    "/readiness",
+    response_model=ReadinessProbe,
+    responses={503: {"model": ReadinessProbe, "description": "Models still loading or failed"}},
+)
+async def readiness(
+    response: Response,
+    settings=Depends(get_settings),
+    models=Depends(get_model_registry),
+    startup=Depends(get_startup_report),
+) -> ReadinessProbe:
+    if not startup.ready:
+        response.status_code = 503
+    live = models.live
     return ReadinessProbe(
+        status=startup.status,
         build_version=settings.readiness_build_version,
-        model_version=settings.model_version,
-        last_model_reload=datetime.now(tz=timezone.utc),
+        model_version=live.version if live is not None else settings.model_version,
+        last_model_reload=models.last_reload,
+        startup_ms=startup.phases_ms(),
     )
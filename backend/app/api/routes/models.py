@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from ...schemas.model import ModelRegistryStatus
+from ..deps import get_model_registry
+
+router = APIRouter(prefix="/models", tags=["models"])
+
+
+@router.get("", response_model=ModelRegistryStatus)
+async def model_status(models=Depends(get_model_registry)) -> ModelRegistryStatus:
+    return models.status()
+
+
+@router.post("/reload", response_model=ModelRegistryStatus)
+async def reload_model(models=Depends(get_model_registry)) -> ModelRegistryStatus:
+    """Check the registry directory now instead of waiting for the next poll."""
+
+    await models.scan()
+    return models.status()
+
+
+@router.post("/promote", response_model=ModelRegistryStatus)
+async def promote_shadow(models=Depends(get_model_registry)) -> ModelRegistryStatus:
+    if await models.promote() is None:
+        raise HTTPException(status_code=409, detail="No shadow model to promote")
+    return models.status()
+
+
+@router.post("/discard", response_model=ModelRegistryStatus)
+async def discard_shadow(models=Depends(get_model_registry)) -> ModelRegistryStatus:
+    if await models.discard() is None:
+        raise HTTPException(status_code=409, detail="No shadow model to discard")
+    return models.status()
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from datetime import datetime
+from typing import Literal
 
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+
+from ...repositories.prediction_rollups import choose_resolution, normalize_range
 from ...schemas.prediction import (
     LatestPredictionsResponse,
     PaginatedPredictionsResponse,
+    PredictionAggregatesResponse,
     PredictionRecord,
 )
 from ..deps import get_prediction_cache
@@ -24,18 +29,80 @@ async def history(
     page: int = 1,
     page_size: int = 100,
     mac_address: str | None = None,
+    cursor: str | None = None,
 ) -> PaginatedPredictionsResponse:
+    """Newest-first prediction history.
+
+    Pass the previous response's ``next_cursor`` as ``cursor`` to page through history at
+    constant cost; ``page`` (offset based) is kept for existing clients. Always raw rows:
+    long ranges are charted from the rollups through ``/predictions/aggregates``.
+    """
+
     repository = getattr(request.app.state, "prediction_repository", None)
+    next_cursor = None
     if repository is None:
+        if cursor is not None:
+            # The in-memory cache never issues cursors; paging it again from the start
+            # would silently repeat rows.
+            raise HTTPException(
+                status_code=400, detail="cursor requires prediction storage; use page"
+            )
         cache = request.app.state.prediction_cache  # type: ignore[attr-defined]
-        items = cache.history(mac_address)
-        total = len(items)
+        # Only the rows up to the requested page are rebuilt from the columnar cache.
+        first = max(0, (page - 1) * page_size)
+        items = cache.history(mac_address, limit=None if mac_address else first + page_size)
+        items = items[first : first + page_size]
+        total = cache.count(mac_address)
     else:
-        items = await repository.history(mac_address=mac_address, page=page, page_size=page_size)
-        total = len(items)
+        try:
+            items, next_cursor = await repository.history_page(
+                mac_address=mac_address,
+                page_size=page_size,
+                cursor=cursor,
+                offset=(page - 1) * page_size if cursor is None else 0,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        total = await repository.count(mac_address)
     return PaginatedPredictionsResponse(
         items=items,
         total=total,
         page=page,
         page_size=page_size,
+        next_cursor=next_cursor,
+    )
+
+
+@router.get("/aggregates", response_model=PredictionAggregatesResponse)
+async def aggregates(
+    request: Request,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    mac_address: str | None = None,
+    resolution: Literal["auto", "minute", "hour"] = "auto",
+    max_points: int = Query(500, ge=1, le=10000),
+) -> PredictionAggregatesResponse:
+    """Label counts, mean confidence/latency and signal stats per time bucket.
+
+    Served from the per-minute/per-hour rollup tables; with ``resolution=auto`` the finest
+    resolution yielding at most ``max_points`` buckets is used, so long ranges cost the
+    same as short ones.
+    """
+
+    repository = getattr(request.app.state, "prediction_repository", None)
+    if repository is None:
+        raise HTTPException(status_code=503, detail="Prediction storage is not configured")
+    try:
+        start, end = normalize_range(start, end)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if resolution == "auto":
+        resolution = choose_resolution(start, end, max_points)
+    items = await repository.aggregates(start, end, resolution, mac_address=mac_address)
+    return PredictionAggregatesResponse(
+        resolution=resolution,
+        start=start,
+        end=end,
+        mac_address=mac_address,
+        items=items,
     )
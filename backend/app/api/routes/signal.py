@@ -1,32 +1,71 @@
 from __future__ import annotations
 
-from statistics import mean
+from datetime import datetime
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request
 
+from ...repositories.prediction_rollups import choose_resolution, normalize_range
+from ...schemas.prediction import PredictionAggregate, SignalStats
 from ...schemas.signal import SignalOverview
-from ..deps import get_prediction_cache
+from ..deps import get_device_registry, get_prediction_cache
 
 router = APIRouter(prefix="/signal", tags=["signal"])
 
+_LATENCY_POINTS = 50
 
-@router.get("/overview", response_model=SignalOverview)
-async def signal_overview(cache=Depends(get_prediction_cache)) -> SignalOverview:
-    history = cache.history()
-    rssi_values = [record.rssi for record in history if record.rssi is not None]
-    noise_values = [record.noise_floor for record in history if record.noise_floor is not None]
-    snr_values = [record.snr for record in history if record.snr is not None]
-    latency_values = [record.latency_ms for record in history]
 
-    def avg(values: list[float]) -> float:
-        return float(mean(values)) if values else 0.0
+def _weighted_mean(stats: List[Optional[SignalStats]]) -> float:
+    stats = [item for item in stats if item is not None]
+    count = sum(item.count for item in stats)
+    return sum(item.mean * item.count for item in stats) / count if count else 0.0
 
-    histogram = sorted(latency_values)[:50]
 
+def overview_from_aggregates(items: List[PredictionAggregate]) -> SignalOverview:
     return SignalOverview(
-        average_rssi=avg(rssi_values),
-        average_noise_floor=avg(noise_values),
-        average_snr=avg(snr_values),
+        average_rssi=_weighted_mean([item.rssi for item in items]),
+        average_noise_floor=_weighted_mean([item.noise_floor for item in items]),
+        average_snr=_weighted_mean([item.snr for item in items]),
         packet_loss_percentage=0.0,
-        inference_latency_ms=histogram,
+        # One mean latency per bucket, most recent last.
+        inference_latency_ms=[item.mean_latency_ms for item in items[-_LATENCY_POINTS:]],
     )
+
+
+@router.get("/overview", response_model=SignalOverview)
+async def signal_overview(
+    request: Request,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    mac_address: str | None = None,
+    cache=Depends(get_prediction_cache),
+    registry=Depends(get_device_registry),
+) -> SignalOverview:
+    """Running signal summary since startup, or of ``[start, end)`` when given.
+
+    The running summary is maintained as predictions are cached and costs O(devices).
+    Ranged requests are answered from the rollup tables at a resolution of at most
+    ``500`` buckets, so the range length does not change the query cost. Packet loss,
+    duplicates and jitter always come from the device registry's sequence trackers.
+    """
+
+    link = registry.link_stats(mac_address)
+    link_fields = {
+        "packet_loss_percentage": link.packet_loss_percentage,
+        "duplicate_percentage": link.duplicate_percentage,
+        "reordered_packets": link.reordered,
+        "jitter_ms": link.jitter_ms,
+    }
+
+    repository = getattr(request.app.state, "prediction_repository", None)
+    if repository is not None and (start is not None or end is not None):
+        try:
+            start, end = normalize_range(start, end)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        items = await repository.aggregates(
+            start, end, choose_resolution(start, end, 500), mac_address=mac_address
+        )
+        return overview_from_aggregates(items).model_copy(update=link_fields)
+
+    return cache.signal.overview(mac_address).model_copy(update=link_fields)
@@ -1,27 +1,88 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from pydantic import ValidationError
+from starlette.datastructures import QueryParams
 
+from ...schemas.stream import StreamSubscription
+from ...services.websocket_manager import WebSocketManager
 from ..deps import get_websocket_manager
 
 router = APIRouter(tags=["stream"])
 
 
+def _split(params: QueryParams, key: str) -> Optional[List[str]]:
+    values = [item for value in params.getlist(key) for item in value.split(",") if item]
+    return values or None
+
+
+def subscription_from_query(params: QueryParams) -> StreamSubscription:
+    """Build a subscription from ``?mac=..&label=..&min_confidence=..&max_rate_hz=..``.
+
+    ``mac`` and ``label`` may be repeated or comma separated.
+    """
+
+    data: Dict[str, Any] = {
+        "mac_addresses": _split(params, "mac"),
+        "labels": _split(params, "label"),
+    }
+    for key in ("min_confidence", "max_rate_hz"):
+        if params.get(key):
+            data[key] = params[key]
+    return StreamSubscription.model_validate(data)
+
+
+async def _ping(websocket: WebSocket, manager: WebSocketManager, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        # Pings go through the client's send queue so they never interleave with a
+        # frame the writer task is sending.
+        await manager.send_control(websocket, {"type": "ping"})
+
+
 @router.websocket("/ws/predictions")
 async def predictions_stream(
     websocket: WebSocket,
 ) -> None:
+    """Stream prediction batches as ``{"type": "predictions", "items": [...]}`` frames.
+
+    Filters come from the query string and can be replaced at any time by sending a
+    ``{"type": "subscribe", ...}`` message; each change is acknowledged with a
+    ``{"type": "subscribed", ...}`` frame.
+    """
+
     settings = websocket.app.state.settings  # type: ignore[attr-defined]
     manager = await get_websocket_manager(websocket)
-    await manager.connect(websocket)
+    try:
+        subscription = subscription_from_query(websocket.query_params)
+    except ValidationError as exc:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(exc)[:120])
+        return
+
+    await manager.connect(websocket, subscription)
+    pinger = asyncio.create_task(_ping(websocket, manager, settings.websocket_ping_interval))
     try:
         while True:
-            await asyncio.sleep(settings.websocket_ping_interval)
-            await websocket.send_json({"type": "ping"})
+            message = await websocket.receive_text()
+            try:
+                subscription = StreamSubscription.model_validate_json(message)
+            except ValidationError as exc:
+                detail = exc.errors(include_url=False, include_context=False)
+                await manager.send_control(websocket, {"type": "error", "detail": detail})
+                continue
+            await manager.subscribe(websocket, subscription)
+            await manager.send_control(
+                websocket, {"type": "subscribed", **subscription.model_dump(exclude={"type"})}
+            )
     except WebSocketDisconnect:
-        await manager.disconnect(websocket)
+        pass
     except Exception:
+        with contextlib.suppress(Exception):
+            await websocket.close()
+    finally:
+        pinger.cancel()
         await manager.disconnect(websocket)
-        await websocket.close()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Literal, Optional
+from typing import List, Literal, Optional, Tuple
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -23,22 +23,68 @@ class Settings(BaseSettings):
 
     redis_url: str = "redis://localhost:6379/0"
     postgres_dsn: Optional[str] = None
+    persist_batch_size: int = 500
+    persist_flush_interval_ms: int = 1000
+    persist_max_buffered: int = 50000
+    persist_max_attempts: int = 3
+    rollups_enabled: bool = True
+    retention_days: int = 14
+    rollup_minute_retention_days: int = 60
+    rollup_hour_retention_days: int = 730
+    partition_predictions: bool = True
+    partition_premake_days: int = 3
+    storage_maintenance_interval_s: float = 3600.0
 
     model_artifact_path: Path = Path("models/artifacts/model.ts")
     model_version: str = "unversioned"
+    model_registry_dir: Optional[Path] = None
+    model_registry_poll_interval_s: float = 5.0
+    model_shadow_fraction: float = 0.0
+    model_shadow_promote_after: int = 0
+    model_shadow_min_agreement: float = 0.95
+    model_optimize_for_inference: bool = False
+    model_backend: Literal["torchscript", "torch_int8", "onnxruntime"] = "torchscript"
 
     inference_batch_size: int = 32
     inference_poll_timeout_ms: int = 50
+    inference_max_batch_delay_ms: int = 20
+    inference_min_batch_size: int = 1
+    inference_adaptive_batching: bool = True
+    inference_workers: int = 1
+    inference_execution_mode: Literal["inline", "thread", "process"] = "inline"
+    inference_torch_threads: Optional[int] = None
+    inference_max_inflight_batches: int = 2
+    inference_warmup: bool = True
+    inference_warmup_runs: int = 3
+    inference_csi_shapes: List[Tuple[int, int]] = [(64, 2)]
+    inference_rate_limit_burst: float = 1.0
+    inference_rate_limit_fold_skipped: bool = True
     queue_maxsize: int = 4096
+    ingest_shed_policy: Literal["reject", "drop_oldest", "decimate"] = "reject"
+    ingest_max_queue_delay_ms: float = 1000.0
+    csi_batch_max_frames: int = 1024
+    csi_batch_max_bytes: int = 16 * 1024 * 1024
     prediction_cache_size: int = 200
+    device_sequence_reorder_window: int = 256
+    ingest_deduplicate: bool = True
+    ingest_reorder_depth: int = 0
+    ingest_reorder_max_delay_ms: float = 50.0
+
+    temporal_window_size: int = 0
+    temporal_doppler_bins: int = 4
+    temporal_max_devices: int = 1024
+    temporal_idle_seconds: float = 300.0
 
     readiness_build_version: str = "0.1.0"
     metrics_enabled: bool = True
 
     websocket_ping_interval: float = 20.0
     websocket_ping_timeout: float = 10.0
+    websocket_send_queue_size: int = 32
+    websocket_slow_client_policy: Literal["drop_oldest", "conflate", "disconnect"] = "conflate"
 
     redis_prediction_ttl_seconds: int = 60
+    redis_background_writes: bool = True
 
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""Daily range partitioning of the ``predictions`` table (PostgreSQL only).
+
+``create_partitioned_predictions`` creates ``predictions`` as a ``PARTITION BY RANGE
+(timestamp)`` parent; the helpers below then keep ``predictions_YYYYMMDD`` children ahead
+of the clock and drop whole children once they age out of retention, which is a metadata
+operation instead of a table-wide ``DELETE`` plus vacuum. Rows that land in the
+``DEFAULT`` partition (timestamps outside the pre-created days) are moved into a day's
+child when it is created, and pruned by retention like the rest.
+"""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Executed one statement at a time (asyncpg rejects multi-statement strings). The primary
+# key must include the partition key, hence ``(timestamp, id)``.
+PARTITIONED_PREDICTIONS_DDL = (
+    """
+    CREATE TABLE IF NOT EXISTS predictions (
+        id BIGINT GENERATED BY DEFAULT AS IDENTITY,
+        mac_address VARCHAR(17) NOT NULL,
+        timestamp TIMESTAMP NOT NULL,
+        label VARCHAR(32) NOT NULL,
+        confidence DOUBLE PRECISION NOT NULL,
+        distance_m DOUBLE PRECISION NOT NULL,
+        model_version VARCHAR(64) NOT NULL,
+        latency_ms DOUBLE PRECISION NOT NULL,
+        sequence_id INTEGER,
+        rssi DOUBLE PRECISION,
+        noise_floor DOUBLE PRECISION,
+        snr DOUBLE PRECISION,
+        PRIMARY KEY (timestamp, id)
+    ) PARTITION BY RANGE (timestamp)
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_predictions_label ON predictions (label)",
+    "CREATE INDEX IF NOT EXISTS ix_predictions_timestamp_id ON predictions (timestamp, id)",
+    "CREATE INDEX IF NOT EXISTS ix_predictions_mac_timestamp_id"
+    " ON predictions (mac_address, timestamp, id)",
+    # Catches rows outside the pre-created days (e.g. devices with a skewed clock).
+    "CREATE TABLE IF NOT EXISTS predictions_default PARTITION OF predictions DEFAULT",
+)
+
+_MOVED = "_partition_rows_moved"
+
+_SUFFIX_FORMAT = "%Y%m%d"
+
+
+def partition_name(table: str, day: date) -> str:
+    return f"{table}_{day.strftime(_SUFFIX_FORMAT)}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def partition_day(table: str, name: str) -> Optional[date]:
+    """Day encoded in a child name, or ``None`` for children this module did not create."""
+
+    prefix = f"{table}_"
+    if not name.startswith(prefix):
+        return None
+    try:
+        return datetime.strptime(name[len(prefix) :], _SUFFIX_FORMAT).date()
+    except ValueError:
+        return None
+
+
+async def create_partitioned_predictions(session: AsyncSession) -> None:
+    for statement in PARTITIONED_PREDICTIONS_DDL:
+        await session.execute(text(statement))
+
+
+async def is_partitioned(session: AsyncSession, table: str) -> bool:
+    result = await session.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid"
+            " WHERE c.relname = :table"
+        ),
+        {"table": table},
+    )
+    return result.first() is not None
+
+
+async def list_partitions(session: AsyncSession, table: str) -> List[str]:
+    result = await session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits i"
+            " JOIN pg_class child ON child.oid = i.inhrelid"
+            " JOIN pg_class parent ON parent.oid = i.inhparent"
+            " WHERE parent.relname = :table"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result]
+
+
+async def ensure_daily_partitions(
+    session: AsyncSession, table: str, first_day: date, days: int
+) -> List[str]:
+    """Create the children for ``first_day`` and the following ``days - 1`` days."""
+
+    existing = set(await list_partitions(session, table))
+    default = default_partition_name(table)
+    created: List[str] = []
+    for offset in range(max(1, days)):
+        day = first_day + timedelta(days=offset)
+        name = partition_name(table, day)
+        if name in existing:
+            continue
+        # Names and bounds are generated here from dates, never from user input.
+        start, end = day.isoformat(), (day + timedelta(days=1)).isoformat()
+        in_day = f"timestamp >= '{start}' AND timestamp < '{end}'"
+        # Postgres refuses to create a child while the default partition holds rows in
+        # its range, so park those rows and re-insert them through the parent.
+        moved = False
+        if default in existing:
+            found = await session.execute(
+                text(f"SELECT 1 FROM {default} WHERE {in_day} LIMIT 1")
+            )
+            moved = found.first() is not None
+        if moved:
+            await session.execute(
+                text(
+                    f"CREATE TEMPORARY TABLE {_MOVED} ON COMMIT DROP"
+                    f" AS SELECT * FROM {default} WHERE {in_day}"
+                )
+            )
+            await session.execute(text(f"DELETE FROM {default} WHERE {in_day}"))
+        await session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table}"
+                f" FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+        )
+        if moved:
+            await session.execute(text(f"INSERT INTO {table} SELECT * FROM {_MOVED}"))
+            await session.execute(text(f"DROP TABLE {_MOVED}"))
+        created.append(name)
+    return created
+
+
+async def drop_partitions_before(session: AsyncSession, table: str, cutoff: date) -> List[str]:
+    """Drop every daily child whose whole range lies before ``cutoff``."""
+
+    dropped: List[str] = []
+    for name in sorted(await list_partitions(session, table)):
+        day = partition_day(table, name)
+        if day is not None and day < cutoff:
+            await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+            dropped.append(name)
+    return dropped
+
+
+async def prune_default_partition(session: AsyncSession, table: str, cutoff: date) -> int:
+    """Delete rows before ``cutoff`` from the default partition; returns the count."""
+
+    default = default_partition_name(table)
+    if default not in await list_partitions(session, table):
+        return 0
+    result = await session.execute(
+        text(f"DELETE FROM {default} WHERE timestamp < '{cutoff.isoformat()}'")
+    )
+    return max(0, result.rowcount or 0)
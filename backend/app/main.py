@@ -11,73 +11,120 @@ from prometheus_client import make_asgi_app
 
 from .api.router import api_router
 from .core.config import settings
-from .core.logging import configure_logging
+from .core.logging import configure_logging, get_logger
 from .infrastructure.postgres import (
     create_engine as create_db_engine,
     create_session_factory,
     dispose_engine,
 )
 from .infrastructure.redis_client import close_redis, create_redis
+from .repositories.prediction_persister import PredictionPersister
 from .repositories.prediction_repository import PredictionRepository
+from .repositories.storage_maintenance import StorageMaintenance
 from .services.device_registry import DeviceRegistry
-from .services.inference_engine import InferenceEngine
 from .services.prediction_cache import PredictionCache
 from .services.websocket_manager import WebSocketManager
-from .workers.pipeline import InferencePipeline
+from .services.metrics import QUEUE_SIZE
+from .services.startup import StartupReport
+from .workers.pool import InferenceWorkerPool
+
+logger = get_logger(__name__)
+
+
+async def _warm_up(workers: InferenceWorkerPool, startup: StartupReport) -> None:
+    """Load and warm the models off the startup path; readiness flips when done."""
+
+    try:
+        for name, seconds in (await workers.warm_up()).items():
+            startup.record(name, seconds)
+    except Exception:
+        logger.exception("model_warmup_failed")
+        startup.finish(failed=True)
+        return
+    startup.finish()
+    logger.info("startup_complete", **startup.phases_ms())
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     configure_logging(settings.log_level)
+    startup = StartupReport()
 
-    queue: asyncio.Queue = asyncio.Queue(maxsize=settings.queue_maxsize)
     cache = PredictionCache(settings.prediction_cache_size)
-    devices = DeviceRegistry()
-    websocket_manager = WebSocketManager()
-    inference_engine = InferenceEngine(settings.model_artifact_path, settings.model_version)
+    devices = DeviceRegistry.from_settings(settings)
+    websocket_manager = WebSocketManager.from_settings(settings)
 
-    redis = await create_redis(settings.redis_url) if settings.redis_url else None
+    with startup.phase("redis"):
+        redis = await create_redis(settings.redis_url) if settings.redis_url else None
 
     session_factory = None
     repository: Optional[PredictionRepository] = None
+    persister: Optional[PredictionPersister] = None
+    maintenance: Optional[StorageMaintenance] = None
     db_engine = None
     db_session = None
     if settings.postgres_dsn:
-        db_engine = create_db_engine(settings.postgres_dsn)
-        session_factory = create_session_factory(db_engine)
-        db_session = session_factory()
-        repository = PredictionRepository(db_session)  # type: ignore[arg-type]
-
-    pipeline = InferencePipeline(
-        queue=queue,
-        settings=settings,
-        engine=inference_engine,
-        cache=cache,
-        devices=devices,
-        websocket_manager=websocket_manager,
-        redis_client=redis,
-        repository=repository,
-    )
-    pipeline_task = asyncio.create_task(pipeline.run())
+        with startup.phase("database"):
+            db_engine = create_db_engine(settings.postgres_dsn)
+            session_factory = create_session_factory(db_engine)
+            db_session = session_factory()
+            repository = PredictionRepository(db_session)  # type: ignore[arg-type]
+            maintenance = StorageMaintenance.from_settings(
+                session_factory, settings, counts=repository.counts
+            )
+            try:
+                # Before the persister starts, so rows land in today's partition.
+                await maintenance.ensure_schema()
+            except Exception:
+                # An unreachable database must not block ingest; the persister retries.
+                logger.exception("database_schema_failed")
+            persister = PredictionPersister.from_settings(
+                session_factory, settings, counts=repository.counts
+            )
+            persister.start()
+            maintenance.start()
+
+    with startup.phase("workers"):
+        workers = InferenceWorkerPool(
+            settings=settings,
+            cache=cache,
+            devices=devices,
+            websocket_manager=websocket_manager,
+            redis_client=redis,
+            persister=persister,
+        )
+        QUEUE_SIZE.set_function(workers.queue.qsize)
+        workers.start()
+    # Frames are accepted meanwhile; they queue until the models are loaded and the
+    # workers start draining.
+    warmup = asyncio.create_task(_warm_up(workers, startup), name="model-warmup")
 
     app.state.settings = settings
-    app.state.queue = queue
+    app.state.startup = startup
+    app.state.queue = workers.queue
     app.state.prediction_cache = cache
     app.state.device_registry = devices
     app.state.websocket_manager = websocket_manager
-    app.state.pipeline = pipeline
-    app.state.pipeline_task = pipeline_task
+    app.state.worker_pool = workers
+    app.state.model_registry = workers.models
     app.state.redis_client = redis
     app.state.prediction_repository = repository
+    app.state.prediction_persister = persister
     app.state.db_session = db_session
     app.state.training_annotations = []  # type: ignore[attr-defined]
 
     try:
         yield
     finally:
-        pipeline_task.cancel()
+        warmup.cancel()
         with contextlib.suppress(asyncio.CancelledError):
-            await pipeline_task
+            await warmup
+        await workers.stop()
+        if maintenance is not None:
+            await maintenance.stop()
+        if persister is not None:
+            # Workers are stopped, so this drains every prediction they produced.
+            await persister.stop()
         await close_redis(redis)
         if db_session is not None:
             await db_session.close()
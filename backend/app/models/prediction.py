@@ -1,9 +1,18 @@
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 
-from sqlalchemy import Float, Integer, String
+from sqlalchemy import (
+    BigInteger,
+    Float,
+    Identity,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+)
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import Mapped, declarative_base, mapped_column
 
 from ..schemas.prediction import PredictionRecord
@@ -11,12 +20,34 @@ from ..schemas.prediction import PredictionRecord
 Base = declarative_base()
 
 
+def naive_utc(timestamp: datetime) -> datetime:
+    """Timestamps are stored as naive UTC; naive inputs are taken to be UTC already."""
+
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
 class PredictionORM(Base):
+    """One stored prediction.
+
+    Matches ``infrastructure.partitioning.PARTITIONED_PREDICTIONS_DDL``: a partitioned
+    table's primary key must include the partition key, hence ``(timestamp, id)``.
+    """
+
     __tablename__ = "predictions"
+    __table_args__ = (
+        PrimaryKeyConstraint("timestamp", "id"),
+        # Back keyset pagination on (timestamp DESC, id DESC), globally and per device.
+        Index("ix_predictions_timestamp_id", "timestamp", "id"),
+        Index("ix_predictions_mac_timestamp_id", "mac_address", "timestamp", "id"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    mac_address: Mapped[str] = mapped_column(String(17), index=True)
-    timestamp: Mapped[datetime] = mapped_column()
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), Identity(), primary_key=True
+    )
+    mac_address: Mapped[str] = mapped_column(String(17))
+    timestamp: Mapped[datetime] = mapped_column(primary_key=True)
     label: Mapped[str] = mapped_column(String(32), index=True)
     confidence: Mapped[float] = mapped_column(Float)
     distance_m: Mapped[float] = mapped_column(Float)
@@ -46,7 +77,7 @@ class PredictionORM(Base):
     def from_schema(cls, record: PredictionRecord) -> "PredictionORM":
         return cls(
             mac_address=record.mac_address,
-            timestamp=record.timestamp,
+            timestamp=naive_utc(record.timestamp),
             label=record.label,
             confidence=record.confidence,
             distance_m=record.distance_m,
@@ -57,3 +88,30 @@ class PredictionORM(Base):
             noise_floor=record.noise_floor,
             snr=record.snr,
         )
+
+    @staticmethod
+    def row_from_schema(record: PredictionRecord) -> Dict[str, Any]:
+        """Column mapping for core ``INSERT`` statements (no ORM object construction)."""
+
+        return {
+            "mac_address": record.mac_address,
+            "timestamp": naive_utc(record.timestamp),
+            "label": record.label,
+            "confidence": record.confidence,
+            "distance_m": record.distance_m,
+            "model_version": record.model_version,
+            "latency_ms": record.latency_ms,
+            "sequence_id": record.sequence_id,
+            "rssi": record.rssi,
+            "noise_floor": record.noise_floor,
+            "snr": record.snr,
+        }
+
+
+@compiles(PrimaryKeyConstraint, "sqlite")
+def _sqlite_primary_key(constraint: PrimaryKeyConstraint, compiler: Any, **kw: Any) -> str:
+    # SQLite only generates ids for a lone INTEGER PRIMARY KEY (the rowid), which is
+    # unique on its own; the local stand-in database keys predictions on ``id`` alone.
+    if constraint.table is PredictionORM.__table__:
+        return "PRIMARY KEY (id)"
+    return compiler.visit_primary_key_constraint(constraint, **kw)
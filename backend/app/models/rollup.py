@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, Optional, Type
+
+from sqlalchemy import Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .prediction import Base
+
+
+class PredictionRollupMixin:
+    """Per ``(bucket, mac_address, label)`` sums from which means/stddevs are derived.
+
+    Storing sums (not means) lets rollups be merged with plain addition, both when a new
+    flush is upserted and when buckets are combined at query time.
+    """
+
+    bucket: Mapped[datetime] = mapped_column(primary_key=True)
+    mac_address: Mapped[str] = mapped_column(String(17), primary_key=True)
+    label: Mapped[str] = mapped_column(String(32), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, default=0)
+    confidence_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    latency_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    rssi_count: Mapped[int] = mapped_column(Integer, default=0)
+    rssi_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    rssi_sq_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    rssi_min: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    rssi_max: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    noise_floor_count: Mapped[int] = mapped_column(Integer, default=0)
+    noise_floor_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    noise_floor_sq_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    noise_floor_min: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    noise_floor_max: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    snr_count: Mapped[int] = mapped_column(Integer, default=0)
+    snr_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    snr_sq_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    snr_min: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    snr_max: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+
+class PredictionRollupMinute(PredictionRollupMixin, Base):
+    __tablename__ = "prediction_rollups_minute"
+    __table_args__ = (Index("ix_prediction_rollups_minute_mac_bucket", "mac_address", "bucket"),)
+
+
+class PredictionRollupHour(PredictionRollupMixin, Base):
+    __tablename__ = "prediction_rollups_hour"
+    __table_args__ = (Index("ix_prediction_rollups_hour_mac_bucket", "mac_address", "bucket"),)
+
+
+ROLLUP_MODELS: Dict[str, Type[PredictionRollupMixin]] = {
+    "minute": PredictionRollupMinute,
+    "hour": PredictionRollupHour,
+}
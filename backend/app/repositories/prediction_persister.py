@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.exc import (
+    DataError,
+    DBAPIError,
+    IntegrityError,
+    InterfaceError,
+    OperationalError,
+    StatementError,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..core.config import Settings
+from ..core.logging import get_logger
+from ..models.prediction import PredictionORM, naive_utc
+from ..schemas.prediction import PredictionRecord
+from ..services.metrics import (
+    PERSIST_BUFFERED,
+    PERSIST_DROPPED,
+    PERSIST_FLUSH_LATENCY,
+    PERSIST_REJECTED,
+    PERSIST_ROWS,
+)
+from ..services.prediction_batch import PredictionBatch
+from .prediction_repository import PredictionCounts
+from .prediction_rollups import upsert_rollups
+
+logger = get_logger(__name__)
+
+
+def _is_data_error(exc: Exception) -> bool:
+    """Errors caused by the rows themselves, which retrying cannot fix."""
+
+    if isinstance(exc, (DataError, IntegrityError)):
+        return True
+    # Values the driver could not bind fail before reaching the database.
+    if isinstance(exc, StatementError) and not isinstance(exc, DBAPIError):
+        return True
+    return isinstance(exc, (OverflowError, TypeError, ValueError))
+
+
+def _is_connection_error(exc: Exception) -> bool:
+    if isinstance(exc, DBAPIError):
+        return exc.connection_invalidated or isinstance(exc, (InterfaceError, OperationalError))
+    return isinstance(exc, OSError)
+
+
+class PredictionPersister:
+    """Write-behind buffer that bulk-inserts predictions off the inference path.
+
+    ``add_many``/``add_batch`` only append column mappings to an in-memory buffer; a background task
+    flushes up to ``batch_size`` rows per multi-row ``INSERT ... VALUES`` whenever the
+    buffer reaches ``batch_size`` or ``flush_interval`` elapses. Each flush uses its own
+    session from ``session_factory``. When ``max_buffered`` rows are pending, callers wait
+    until a flush frees space (backpressure). With ``rollups`` enabled the same
+    transaction also folds the rows into the per-minute and per-hour rollup tables, so
+    rollups never disagree with the raw rows.
+
+    Rows from a failed flush are put back and retried. A flush that fails on the data
+    (a constraint, or a value that cannot be bound) is split in halves until the
+    offending rows are isolated; they are logged, counted in ``csi_persist_rejected_total``
+    and dropped so one bad row cannot stall persistence. Other errors are retried as is
+    up to ``max_attempts`` times before the batch is split the same way. Connection
+    errors never drop rows.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_buffered: int = 50_000,
+        counts: Optional[PredictionCounts] = None,
+        rollups: bool = True,
+        max_attempts: int = 3,
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_attempts = max(1, max_attempts)
+        self._failures = 0
+        self._counts = counts
+        self._rollups = rollups
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._max_buffered = max(self._batch_size, max_buffered)
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @classmethod
+    def from_settings(
+        cls,
+        session_factory: async_sessionmaker[AsyncSession],
+        settings: Settings,
+        counts: Optional[PredictionCounts] = None,
+    ) -> "PredictionPersister":
+        return cls(
+            session_factory,
+            batch_size=settings.persist_batch_size,
+            flush_interval=settings.persist_flush_interval_ms / 1000.0,
+            max_buffered=settings.persist_max_buffered,
+            counts=counts,
+            rollups=settings.rollups_enabled,
+            max_attempts=settings.persist_max_attempts,
+        )
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    async def add_many(self, records: Iterable[PredictionRecord]) -> None:
+        await self._add_rows([PredictionORM.row_from_schema(record) for record in records])
+
+    async def add_batch(self, batch: PredictionBatch) -> None:
+        """Buffer a pipeline batch; its row mappings already match the table columns."""
+
+        # Copies: the batch's rows are shared with the other stages.
+        await self._add_rows(
+            [{**row, "timestamp": naive_utc(row["timestamp"])} for row in batch.rows()]
+        )
+
+    async def _add_rows(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self._task is None:
+            # Not started (e.g. tooling/tests): fall back to a synchronous bulk insert.
+            await self._insert(rows)
+            return
+        async with self._space:
+            await self._space.wait_for(lambda: len(self._buffer) < self._max_buffered)
+        self._buffer.extend(rows)
+        PERSIST_BUFFERED.set(len(self._buffer))
+        if len(self._buffer) >= self._batch_size:
+            self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run(), name="prediction-persister")
+
+    async def stop(self) -> None:
+        """Drain the buffer and stop the background task.
+
+        The task is asked to finish rather than cancelled so an in-flight insert is never
+        abandoned while its transaction is still open.
+        """
+
+        if self._task is not None:
+            self._closing = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        if self._buffer:
+            PERSIST_DROPPED.inc(len(self._buffer))
+            logger.error("prediction_persist_dropped", rows=len(self._buffer))
+            self._buffer.clear()
+        PERSIST_BUFFERED.set(0)
+
+    async def _run(self) -> None:
+        while True:
+            timed_out = False
+            if not self._closing:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+                except asyncio.TimeoutError:
+                    timed_out = True
+            self._wakeup.clear()
+            try:
+                # Partial batches are only flushed when the interval expires or on shutdown.
+                while self._buffer and (
+                    timed_out or self._closing or len(self._buffer) >= self._batch_size
+                ):
+                    await self._flush_once()
+            except Exception:
+                logger.exception("prediction_persist_failed", rows=len(self._buffer))
+                if self._closing:
+                    return
+                await asyncio.sleep(self._flush_interval)
+                continue
+            if self._closing:
+                return
+
+    async def _flush_once(self) -> None:
+        count = min(self._batch_size, len(self._buffer))
+        pending: List[List[Dict[str, Any]]] = [
+            [self._buffer.popleft() for _ in range(count)]
+        ]
+        try:
+            await self._insert_isolating(pending, self._failures >= self._max_attempts)
+        except BaseException as exc:
+            # Put the unsaved rows back in order so they are retried (or flushed on shutdown).
+            self._buffer.extendleft(reversed([row for chunk in reversed(pending) for row in chunk]))
+            if isinstance(exc, Exception):
+                self._failures += 1
+            raise
+        self._failures = 0
+        PERSIST_BUFFERED.set(len(self._buffer))
+        async with self._space:
+            self._space.notify_all()
+
+    async def _insert_isolating(self, pending: List[List[Dict[str, Any]]], isolate: bool) -> None:
+        """Insert the chunks on the ``pending`` stack, splitting any that fail on bad rows.
+
+        Chunks are split on data errors, or on any non-connection error with ``isolate``;
+        a single row that still fails is rejected. On any other error the failed chunk
+        is left on ``pending`` with the unsaved rest and the error is raised.
+        """
+
+        while pending:
+            chunk = pending.pop()
+            try:
+                await self._insert(chunk)
+            except Exception as exc:
+                if _is_connection_error(exc) or not (isolate or _is_data_error(exc)):
+                    pending.append(chunk)
+                    raise
+                if len(chunk) > 1:
+                    middle = len(chunk) // 2
+                    pending.extend((chunk[middle:], chunk[:middle]))
+                    continue
+                PERSIST_REJECTED.inc()
+                logger.error(
+                    "prediction_persist_rejected",
+                    mac_address=chunk[0]["mac_address"],
+                    timestamp=str(chunk[0]["timestamp"]),
+                    error=str(exc),
+                )
+            except BaseException:
+                pending.append(chunk)
+                raise
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        start = time.perf_counter()
+        async with self._session_factory() as session:
+            await session.execute(insert(PredictionORM.__table__), rows)
+            if self._rollups:
+                await upsert_rollups(session, rows)
+            await session.commit()
+        PERSIST_FLUSH_LATENCY.observe((time.perf_counter() - start) * 1000.0)
+        PERSIST_ROWS.inc(len(rows))
+        if self._counts is not None:
+            self._counts.add(row["mac_address"] for row in rows)
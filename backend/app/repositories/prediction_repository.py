@@ -1,12 +1,67 @@
 from __future__ import annotations
 
-from typing import Iterable, Optional
+import asyncio
+import base64
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.prediction import PredictionORM
-from ..schemas.prediction import PredictionRecord
+from ..schemas.prediction import PredictionAggregate, PredictionRecord
+from .prediction_rollups import query_rollups
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of ``encode_cursor``; raises ``ValueError`` for malformed cursors."""
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        timestamp, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+class PredictionCounts:
+    """Row counts per device, loaded once and maintained as predictions are persisted.
+
+    Counting millions of rows per request is what made ``total`` expensive; this keeps
+    it O(1). Inserts that race the initial load may be missed, so treat it as a close
+    estimate. Retention calls ``invalidate`` after removing rows, so the next request
+    reloads it.
+    """
+
+    def __init__(self) -> None:
+        self._by_mac: Dict[str, int] = {}
+        self._total = 0
+        self.loaded = False
+
+    def load(self, rows: Iterable[Tuple[str, int]]) -> None:
+        self._by_mac = {mac_address: count for mac_address, count in rows}
+        self._total = sum(self._by_mac.values())
+        self.loaded = True
+
+    def invalidate(self) -> None:
+        self.loaded = False
+
+    def add(self, mac_addresses: Iterable[str]) -> None:
+        if not self.loaded:
+            return
+        for mac_address in mac_addresses:
+            self._by_mac[mac_address] = self._by_mac.get(mac_address, 0) + 1
+            self._total += 1
+
+    def get(self, mac_address: Optional[str] = None) -> int:
+        if mac_address is None:
+            return self._total
+        return self._by_mac.get(mac_address, 0)
 
 
 class PredictionRepository:
@@ -14,17 +69,24 @@ class PredictionRepository:
 
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
+        # The session is shared by every inference worker and the API routes.
+        self._lock = asyncio.Lock()
+        self.counts = PredictionCounts()
 
     async def add_many(self, records: Iterable[PredictionRecord]) -> None:
-        for record in records:
-            self._session.add(PredictionORM.from_schema(record))
-        await self._session.commit()
+        records = list(records)
+        async with self._lock:
+            for record in records:
+                self._session.add(PredictionORM.from_schema(record))
+            await self._session.commit()
+        self.counts.add(record.mac_address for record in records)
 
     async def latest(self, mac_address: Optional[str] = None, limit: int = 50) -> list[PredictionRecord]:
         query = select(PredictionORM).order_by(PredictionORM.timestamp.desc()).limit(limit)
         if mac_address:
             query = query.where(PredictionORM.mac_address == mac_address)
-        result = await self._session.execute(query)
+        async with self._lock:
+            result = await self._session.execute(query)
         return [row[0].to_schema() for row in result]
 
     async def history(
@@ -33,9 +95,69 @@ class PredictionRepository:
         page: int = 1,
         page_size: int = 100,
     ) -> list[PredictionRecord]:
-        query = select(PredictionORM).order_by(PredictionORM.timestamp.desc())
+        items, _ = await self.history_page(
+            mac_address=mac_address, page_size=page_size, offset=(page - 1) * page_size
+        )
+        return items
+
+    async def history_page(
+        self,
+        mac_address: Optional[str] = None,
+        page_size: int = 100,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+    ) -> Tuple[list[PredictionRecord], Optional[str]]:
+        """Newest-first page plus the cursor for the next one.
+
+        With ``cursor`` the page starts strictly after that ``(timestamp, id)`` position,
+        which the ``(mac_address, timestamp, id)`` / ``(timestamp, id)`` indexes serve
+        without scanning skipped rows; ``offset`` is only kept for legacy page numbers.
+        """
+
+        query = select(PredictionORM).order_by(
+            PredictionORM.timestamp.desc(), PredictionORM.id.desc()
+        )
         if mac_address:
             query = query.where(PredictionORM.mac_address == mac_address)
-        query = query.offset((page - 1) * page_size).limit(page_size)
-        result = await self._session.execute(query)
-        return [row[0].to_schema() for row in result]
+        if cursor is not None:
+            timestamp, row_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(PredictionORM.timestamp, PredictionORM.id) < tuple_(timestamp, row_id)
+            )
+        elif offset:
+            query = query.offset(offset)
+        # Fetch one extra row to learn whether another page exists.
+        query = query.limit(page_size + 1)
+        async with self._lock:
+            result = await self._session.execute(query)
+        rows = [row[0] for row in result]
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+        return [row.to_schema() for row in rows], next_cursor
+
+    async def count(self, mac_address: Optional[str] = None) -> int:
+        if not self.counts.loaded:
+            query = select(PredictionORM.mac_address, func.count()).group_by(
+                PredictionORM.mac_address
+            )
+            async with self._lock:
+                if not self.counts.loaded:
+                    result = await self._session.execute(query)
+                    self.counts.load((mac, count) for mac, count in result)
+        return self.counts.get(mac_address)
+
+    async def aggregates(
+        self,
+        start: datetime,
+        end: datetime,
+        resolution: str,
+        mac_address: Optional[str] = None,
+    ) -> List[PredictionAggregate]:
+        """Rollup buckets over ``[start, end)``; cost follows bucket count, not row count."""
+
+        async with self._lock:
+            return await query_rollups(
+                self._session, start, end, resolution, mac_address=mac_address
+            )
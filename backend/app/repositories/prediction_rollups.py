@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.prediction import naive_utc
+from ..models.rollup import ROLLUP_MODELS
+from ..schemas.prediction import PredictionAggregate, SignalStats
+
+RESOLUTIONS: Dict[str, timedelta] = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1)}
+
+SIGNALS = ("rssi", "noise_floor", "snr")
+
+_SUM_COLUMNS = ("count", "confidence_sum", "latency_sum") + tuple(
+    f"{signal}_{suffix}" for signal in SIGNALS for suffix in ("count", "sum", "sq_sum")
+)
+_EDGE_COLUMNS = tuple(f"{signal}_{edge}" for signal in SIGNALS for edge in ("min", "max"))
+
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    if resolution == "minute":
+        return timestamp.replace(second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def normalize_range(
+    start: Optional[datetime],
+    end: Optional[datetime],
+    default: timedelta = timedelta(days=1),
+) -> Tuple[datetime, datetime]:
+    """Fill in a query range (default: the last day) as naive UTC, how timestamps are stored."""
+
+    end = naive_utc(end) if end is not None else datetime.now(timezone.utc).replace(tzinfo=None)
+    start = naive_utc(start) if start is not None else end - default
+    if start >= end:
+        raise ValueError("start must be before end")
+    return start, end
+
+
+def choose_resolution(start: datetime, end: datetime, max_points: int) -> str:
+    """Finest rollup whose bucket count over ``[start, end)`` stays within ``max_points``."""
+
+    for name, width in RESOLUTIONS.items():
+        if (end - start) / width <= max_points:
+            return name
+    return "hour"
+
+
+def _empty_bucket(key: Tuple[datetime, str, str]) -> Dict[str, Any]:
+    bucket, mac_address, label = key
+    row: Dict[str, Any] = {"bucket": bucket, "mac_address": mac_address, "label": label}
+    row.update({column: 0 for column in _SUM_COLUMNS})
+    row.update({column: None for column in _EDGE_COLUMNS})
+    return row
+
+
+def _add_signal(row: Dict[str, Any], prefix: str, value: Optional[float]) -> None:
+    if value is None:
+        return
+    row[f"{prefix}_count"] += 1
+    row[f"{prefix}_sum"] += value
+    row[f"{prefix}_sq_sum"] += value * value
+    low, high = row[f"{prefix}_min"], row[f"{prefix}_max"]
+    row[f"{prefix}_min"] = value if low is None else min(low, value)
+    row[f"{prefix}_max"] = value if high is None else max(high, value)
+
+
+def aggregate_rows(rows: Iterable[Dict[str, Any]], resolution: str) -> List[Dict[str, Any]]:
+    """Fold raw prediction rows (``PredictionORM.row_from_schema``) into rollup rows."""
+
+    buckets: Dict[Tuple[datetime, str, str], Dict[str, Any]] = {}
+    for row in rows:
+        key = (bucket_start(row["timestamp"], resolution), row["mac_address"], row["label"])
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = _empty_bucket(key)
+        bucket["count"] += 1
+        bucket["confidence_sum"] += row["confidence"]
+        bucket["latency_sum"] += row["latency_ms"]
+        for signal in SIGNALS:
+            _add_signal(bucket, signal, row.get(signal))
+    return list(buckets.values())
+
+
+_UPSERTS: Dict[Tuple[str, str], Any] = {}
+
+
+def _upsert_statement(dialect: str, resolution: str):
+    """``INSERT ... ON CONFLICT DO UPDATE`` for one rollup table, built once per dialect.
+
+    Executed with a parameter list (executemany) rather than a multi-row ``VALUES`` so
+    SQLAlchemy's compiled-statement cache applies; compiling a fresh multi-row statement
+    per flush costs more than running it.
+    """
+
+    key = (dialect, resolution)
+    statement = _UPSERTS.get(key)
+    if statement is not None:
+        return statement
+    table = ROLLUP_MODELS[resolution].__table__
+    insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+    statement = insert(table)
+    excluded = statement.excluded
+    updates: Dict[str, Any] = {
+        column: table.c[column] + excluded[column] for column in _SUM_COLUMNS
+    }
+    for prefix in SIGNALS:
+        low, high = f"{prefix}_min", f"{prefix}_max"
+        updates[low] = case(
+            (table.c[low].is_(None), excluded[low]),
+            (excluded[low] < table.c[low], excluded[low]),
+            else_=table.c[low],
+        )
+        updates[high] = case(
+            (table.c[high].is_(None), excluded[high]),
+            (excluded[high] > table.c[high], excluded[high]),
+            else_=table.c[high],
+        )
+    statement = _UPSERTS[key] = statement.on_conflict_do_update(
+        index_elements=[table.c.bucket, table.c.mac_address, table.c.label], set_=updates
+    )
+    return statement
+
+
+async def upsert_rollups(session: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """Merge a flushed batch into every rollup table inside the caller's transaction.
+
+    Rows are pre-aggregated per bucket/device/label, then sums are added and min/max
+    widened with ``INSERT ... ON CONFLICT DO UPDATE`` (Postgres and SQLite).
+    """
+
+    dialect = session.get_bind().dialect.name
+    for resolution in ROLLUP_MODELS:
+        values = aggregate_rows(rows, resolution)
+        if values:
+            await session.execute(_upsert_statement(dialect, resolution), values)
+
+
+def _stats(count: int, total: float, sq_total: float, low, high) -> Optional[SignalStats]:
+    if not count:
+        return None
+    mean = total / count
+    variance = max(0.0, sq_total / count - mean * mean)
+    return SignalStats(count=count, mean=mean, std=math.sqrt(variance), min=low, max=high)
+
+
+async def query_rollups(
+    session: AsyncSession,
+    start: datetime,
+    end: datetime,
+    resolution: str,
+    mac_address: Optional[str] = None,
+) -> List[PredictionAggregate]:
+    """Per-bucket aggregates over ``[start, end)``, merged across devices unless filtered.
+
+    Reads at most ``buckets x labels`` rows, independent of how many raw predictions
+    the range covers.
+    """
+
+    model = ROLLUP_MODELS[resolution]
+    sums = [func.sum(getattr(model, column)).label(column) for column in _SUM_COLUMNS]
+    edges = [
+        (func.min if column.endswith("_min") else func.max)(getattr(model, column)).label(column)
+        for column in _EDGE_COLUMNS
+    ]
+    query = (
+        select(model.bucket, model.label, *sums, *edges)
+        .where(model.bucket >= start, model.bucket < end)
+        .group_by(model.bucket, model.label)
+        .order_by(model.bucket)
+    )
+    if mac_address:
+        query = query.where(model.mac_address == mac_address)
+
+    merged: Dict[datetime, Dict[str, Any]] = {}
+    for row in (await session.execute(query)).mappings():
+        bucket = merged.get(row["bucket"])
+        if bucket is None:
+            bucket = merged[row["bucket"]] = _empty_bucket((row["bucket"], "", ""))
+            bucket["label_counts"] = {}
+        bucket["label_counts"][row["label"]] = row["count"]
+        for column in _SUM_COLUMNS:
+            bucket[column] += row[column] or 0
+        for prefix in SIGNALS:
+            for edge, pick in (("min", min), ("max", max)):
+                key = f"{prefix}_{edge}"
+                if row[key] is not None:
+                    current = bucket[key]
+                    bucket[key] = row[key] if current is None else pick(current, row[key])
+
+    return [_to_aggregate(bucket) for bucket in merged.values()]
+
+
+def _to_aggregate(bucket: Dict[str, Any]) -> PredictionAggregate:
+    count = bucket["count"]
+    signals = {
+        signal: _stats(
+            bucket[f"{signal}_count"],
+            bucket[f"{signal}_sum"],
+            bucket[f"{signal}_sq_sum"],
+            bucket[f"{signal}_min"],
+            bucket[f"{signal}_max"],
+        )
+        for signal in SIGNALS
+    }
+    return PredictionAggregate(
+        bucket=bucket["bucket"],
+        count=count,
+        label_counts=bucket["label_counts"],
+        mean_confidence=bucket["confidence_sum"] / count if count else 0.0,
+        mean_latency_ms=bucket["latency_sum"] / count if count else 0.0,
+        **signals,
+    )
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, inspect
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..core.config import Settings
+from ..core.logging import get_logger
+from ..infrastructure import partitioning
+from ..models.prediction import Base, PredictionORM
+from ..models.rollup import PredictionRollupHour, PredictionRollupMinute
+from ..services.metrics import RETENTION_PARTITIONS_DROPPED, RETENTION_ROWS_DELETED
+from .prediction_repository import PredictionCounts
+
+logger = get_logger(__name__)
+
+
+class StorageMaintenance:
+    """Periodic partition management and retention for prediction storage.
+
+    On a partitioned Postgres ``predictions`` table (see ``infrastructure.partitioning``)
+    each run pre-creates the next ``premake_days`` daily partitions and drops the ones
+    older than ``retention_days``. Other databases fall back to a ranged ``DELETE``.
+    Rollup tables are small, so they are always trimmed with ``DELETE``. A retention of
+    ``0`` days keeps data forever. ``counts`` is invalidated whenever raw predictions
+    were removed.
+
+    ``ensure_schema`` creates missing tables at startup; with ``partition`` a new
+    Postgres ``predictions`` table is created partitioned.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        retention_days: int = 14,
+        minute_retention_days: int = 60,
+        hour_retention_days: int = 730,
+        premake_days: int = 3,
+        interval: float = 3600.0,
+        counts: Optional[PredictionCounts] = None,
+        partition: bool = True,
+    ) -> None:
+        self._session_factory = session_factory
+        self._partition = partition
+        self._retention_days = retention_days
+        self._minute_retention_days = minute_retention_days
+        self._hour_retention_days = hour_retention_days
+        self._premake_days = premake_days
+        self._interval = interval
+        self._counts = counts
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(
+        cls,
+        session_factory: async_sessionmaker[AsyncSession],
+        settings: Settings,
+        counts: Optional[PredictionCounts] = None,
+    ) -> "StorageMaintenance":
+        return cls(
+            session_factory,
+            retention_days=settings.retention_days,
+            minute_retention_days=settings.rollup_minute_retention_days,
+            hour_retention_days=settings.rollup_hour_retention_days,
+            premake_days=settings.partition_premake_days,
+            interval=settings.storage_maintenance_interval_s,
+            counts=counts,
+            partition=settings.partition_predictions,
+        )
+
+    async def ensure_schema(self) -> None:
+        """Create missing tables and, on a partitioned table, today's partitions.
+
+        An existing unpartitioned ``predictions`` table is left as is (retention then
+        deletes rows); converting it means migrating its data, which is not done here.
+        """
+
+        table = PredictionORM.__tablename__
+        async with self._session_factory() as session:
+            postgres = session.get_bind().dialect.name == "postgresql"
+            exists = await session.run_sync(
+                lambda sync: inspect(sync.connection()).has_table(table)
+            )
+            if postgres and self._partition and not exists:
+                await partitioning.create_partitioned_predictions(session)
+                logger.info("predictions_table_partitioned", table=table)
+            await session.run_sync(lambda sync: Base.metadata.create_all(sync.connection()))
+            if postgres and await partitioning.is_partitioned(session, table):
+                today = datetime.now(timezone.utc).date()
+                await partitioning.ensure_daily_partitions(
+                    session, table, today, self._premake_days
+                )
+            elif postgres and self._partition:
+                logger.warning("predictions_table_not_partitioned", table=table)
+            await session.commit()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="storage-maintenance")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        # Stored timestamps are naive UTC.
+        now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+        summary: Dict[str, Any] = {"created": [], "dropped": [], "deleted": {}}
+        async with self._session_factory() as session:
+            table = PredictionORM.__tablename__
+            partitioned = session.get_bind().dialect.name == "postgresql" and (
+                await partitioning.is_partitioned(session, table)
+            )
+            if partitioned:
+                summary["created"] = await partitioning.ensure_daily_partitions(
+                    session, table, now.date(), self._premake_days
+                )
+                if self._retention_days > 0:
+                    cutoff = now.date() - timedelta(days=self._retention_days)
+                    summary["dropped"] = await partitioning.drop_partitions_before(
+                        session, table, cutoff
+                    )
+                    summary["deleted"][
+                        partitioning.default_partition_name(table)
+                    ] = await partitioning.prune_default_partition(session, table, cutoff)
+            elif self._retention_days > 0:
+                summary["deleted"][table] = await self._delete_before(
+                    session,
+                    PredictionORM.__table__,
+                    PredictionORM.timestamp,
+                    now - timedelta(days=self._retention_days),
+                )
+            for model, days in (
+                (PredictionRollupMinute, self._minute_retention_days),
+                (PredictionRollupHour, self._hour_retention_days),
+            ):
+                if days > 0:
+                    summary["deleted"][model.__tablename__] = await self._delete_before(
+                        session, model.__table__, model.bucket, now - timedelta(days=days)
+                    )
+            await session.commit()
+        deleted = summary["deleted"]
+        raw_deleted = deleted.get(table, 0) + deleted.get(
+            partitioning.default_partition_name(table), 0
+        )
+        if (summary["dropped"] or raw_deleted) and self._counts is not None:
+            self._counts.invalidate()
+        RETENTION_PARTITIONS_DROPPED.inc(len(summary["dropped"]))
+        for name, rows in summary["deleted"].items():
+            RETENTION_ROWS_DELETED.labels(table=name).inc(rows)
+        return summary
+
+    @staticmethod
+    async def _delete_before(session: AsyncSession, table, column, cutoff: datetime) -> int:
+        result = await session.execute(delete(table).where(column < cutoff))
+        return max(0, result.rowcount or 0)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                summary = await self.run_once()
+                if summary["created"] or summary["dropped"] or any(summary["deleted"].values()):
+                    logger.info("storage_maintenance", **summary)
+            except Exception:
+                logger.exception("storage_maintenance_failed")
+            await asyncio.sleep(self._interval)
@@ -38,6 +38,35 @@ class CSIPacket(BaseModel):
         return matrix_list
 
 
+class CSIBatch(BaseModel):
+    """Multiple CSI frames delivered in a single request."""
+
+    packets: List[CSIPacket] = Field(..., min_length=1)
+
+
 class CSIIngestResponse(BaseModel):
+    """``accepted`` is whether this frame was queued for inference.
+
+    It is ``False`` for a dropped duplicate and for a frame ``held`` for reordering,
+    which is queued later, once the gap before it fills or times out.
+    """
+
     accepted: bool
     queued: int
+    duplicate: bool = False
+    held: bool = False
+
+
+class CSIFrameRef(BaseModel):
+    mac_address: str
+    sequence_id: int
+
+
+class CSIBatchIngestResponse(BaseModel):
+    """``rejected_frames`` lists the frames the queue refused; they are safe to resend."""
+
+    accepted: int
+    rejected: int
+    queued: int
+    duplicates: int = 0
+    rejected_frames: List[CSIFrameRef] = Field(default_factory=list)
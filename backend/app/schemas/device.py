@@ -13,6 +13,26 @@ class DeviceStatus(BaseModel):
     online: bool = False
     inference_frequency_hz: Optional[float] = None
     distance_calibration_m: Optional[float] = Field(None, ge=0.0)
+    packets_received: int = 0
+    packet_loss_percentage: float = 0.0
+    duplicate_percentage: float = 0.0
+    reordered_packets: int = 0
+    jitter_ms: float = 0.0
+    skipped_frames: int = Field(0, description="Frames not inferred because of the rate limit")
+    shed_frames: int = Field(0, description="Frames rejected or dropped by admission control")
+
+
+class LinkStats(BaseModel):
+    """Radio link quality derived from frame sequence IDs, per device or merged."""
+
+    packets_received: int = 0
+    packets_expected: int = 0
+    packets_lost: int = 0
+    duplicates: int = 0
+    reordered: int = 0
+    packet_loss_percentage: float = Field(0.0, ge=0.0, le=100.0)
+    duplicate_percentage: float = Field(0.0, ge=0.0, le=100.0)
+    jitter_ms: float = 0.0
 
 
 class DeviceSettingsUpdate(BaseModel):
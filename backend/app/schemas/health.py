@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class HealthCheck(BaseModel):
@@ -17,3 +17,6 @@ class ReadinessProbe(BaseModel):
     build_version: str
     model_version: Optional[str] = None
     last_model_reload: Optional[datetime] = None
+    startup_ms: Dict[str, float] = Field(
+        default_factory=dict, description="Wall time of each startup phase, in milliseconds"
+    )
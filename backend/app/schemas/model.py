@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ModelInfo(BaseModel):
+    version: str
+    path: str
+    loaded_at: datetime
+
+
+class ShadowStats(BaseModel):
+    """Live vs shadow comparison on the sampled batches since the shadow was loaded."""
+
+    frames: int = 0
+    agreement_percentage: float = Field(0.0, ge=0.0, le=100.0)
+    live_latency_ms: float = 0.0
+    shadow_latency_ms: float = 0.0
+
+
+class ModelRegistryStatus(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
+    registry_dir: Optional[str] = None
+    live: Optional[ModelInfo] = None
+    shadow: Optional[ModelInfo] = None
+    shadow_fraction: float = 0.0
+    shadow_stats: Optional[ShadowStats] = None
+    last_model_reload: Optional[datetime] = None
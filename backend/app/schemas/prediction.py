@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 
 from pydantic import BaseModel, Field, ConfigDict
 
@@ -37,3 +37,33 @@ class PaginatedPredictionsResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next (older) page; absent on the last page"
+    )
+
+
+class SignalStats(BaseModel):
+    count: int
+    mean: float
+    std: float
+    min: Optional[float] = None
+    max: Optional[float] = None
+
+
+class PredictionAggregate(BaseModel):
+    bucket: datetime = Field(..., description="Start of the rollup bucket")
+    count: int
+    label_counts: Dict[str, int]
+    mean_confidence: float
+    mean_latency_ms: float
+    rssi: Optional[SignalStats] = None
+    noise_floor: Optional[SignalStats] = None
+    snr: Optional[SignalStats] = None
+
+
+class PredictionAggregatesResponse(BaseModel):
+    resolution: Literal["minute", "hour"]
+    start: datetime
+    end: datetime
+    mac_address: Optional[str] = None
+    items: list[PredictionAggregate]
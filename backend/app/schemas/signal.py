@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Dict, List
 
 from pydantic import BaseModel, Field
 
@@ -10,4 +10,12 @@ class SignalOverview(BaseModel):
     average_noise_floor: float = Field(..., description="Average noise floor")
     average_snr: float = Field(..., description="Average SNR")
     packet_loss_percentage: float = Field(..., ge=0.0, le=100.0)
-    inference_latency_ms: List[float] = Field(..., description="Latency histogram buckets")
+    inference_latency_ms: List[float] = Field(
+        ..., description="Latency distribution as evenly spaced quantiles, ascending"
+    )
+    latency_quantiles_ms: Dict[str, float] = Field(default_factory=dict)
+    rssi_std: float = 0.0
+    snr_std: float = 0.0
+    duplicate_percentage: float = Field(0.0, ge=0.0, le=100.0)
+    reordered_packets: int = 0
+    jitter_ms: float = Field(0.0, description="RFC 3550 interarrival jitter, traffic-weighted")
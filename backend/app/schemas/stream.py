@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field, field_validator
+
+from .prediction import PredictionLabel
+
+
+class StreamSubscription(BaseModel):
+    """Filters and rate limit applied to one ``/ws/predictions`` client.
+
+    Unset filters match everything. With ``max_rate_hz`` set the client receives at most
+    that many frames per second, each carrying the newest record per matching device.
+    """
+
+    type: Literal["subscribe"] = "subscribe"
+    mac_addresses: Optional[List[str]] = Field(None, description="Only stream these devices")
+    labels: Optional[List[PredictionLabel]] = Field(None, description="Only stream these labels")
+    min_confidence: float = Field(0.0, ge=0.0, le=1.0)
+    max_rate_hz: Optional[float] = Field(None, gt=0.0, description="Frames per second cap")
+
+    @field_validator("mac_addresses")
+    @classmethod
+    def _normalize_macs(cls, values: Optional[List[str]]) -> Optional[List[str]]:
+        if values is None:
+            return None
+        macs = {value.strip().replace("-", ":").lower() for value in values if value.strip()}
+        return sorted(macs) or None
+
+    @property
+    def is_unfiltered(self) -> bool:
+        return self.mac_addresses is None and self.labels is None and self.min_confidence <= 0.0
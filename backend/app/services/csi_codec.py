@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import math
+import struct
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from ..schemas.csi import CSIPacket
+
+BINARY_CONTENT_TYPE = "application/octet-stream"
+BINARY_MAGIC = b"CSIB"
+BINARY_VERSION = 1
+
+# Batch header: magic, format version, frame count.
+BATCH_HEADER = struct.Struct("<4sHI")
+# Frame header: raw MAC, sequence id, capture time (µs since epoch), rssi, noise floor,
+# snr (NaN when absent), CSI rows (subcarriers), CSI columns (antennas). The header is
+# followed by rows * cols little-endian float32 values in row-major order.
+FRAME_HEADER = struct.Struct("<6sIqfffHH")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_FLOAT32_LE = np.dtype("<f4")
+
+
+class CSIDecodeError(ValueError):
+    """Raised when a binary CSI batch is malformed."""
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if math.isnan(value) else float(value)
+
+
+def _encode_optional(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+def batch_frame_count(data: bytes) -> int:
+    """Validate the batch header of ``data`` and return the frame count it declares."""
+
+    if len(data) < BATCH_HEADER.size:
+        raise CSIDecodeError("Payload shorter than batch header")
+    magic, version, count = BATCH_HEADER.unpack_from(data, 0)
+    if magic != BINARY_MAGIC:
+        raise CSIDecodeError("Invalid batch magic")
+    if version != BINARY_VERSION:
+        raise CSIDecodeError(f"Unsupported batch version {version}")
+    return count
+
+
+def decode_binary_batch(data: bytes) -> List[CSIPacket]:
+    """Decode a binary CSI batch into packets whose ``csi`` is a float32 NumPy view.
+
+    The matrices are never expanded into Python float lists; packets are built with
+    ``model_construct`` since the binary layout already guarantees a rectangular matrix.
+    """
+
+    count = batch_frame_count(data)
+    packets: List[CSIPacket] = []
+    offset = BATCH_HEADER.size
+    for _ in range(count):
+        if offset + FRAME_HEADER.size > len(data):
+            raise CSIDecodeError("Truncated frame header")
+        mac, sequence_id, timestamp_us, rssi, noise_floor, snr, rows, cols = (
+            FRAME_HEADER.unpack_from(data, offset)
+        )
+        offset += FRAME_HEADER.size
+        if rows == 0 or cols == 0:
+            raise CSIDecodeError("CSI matrix cannot be empty")
+        values = rows * cols
+        end = offset + values * _FLOAT32_LE.itemsize
+        if end > len(data):
+            raise CSIDecodeError("Truncated CSI matrix")
+        matrix = np.frombuffer(data, dtype=_FLOAT32_LE, count=values, offset=offset)
+        offset = end
+
+        packets.append(
+            CSIPacket.model_construct(
+                mac_address=mac.hex(":"),
+                sequence_id=sequence_id,
+                timestamp=_EPOCH + timedelta(microseconds=timestamp_us),
+                rssi=_optional(rssi),
+                noise_floor=_optional(noise_floor),
+                snr=_optional(snr),
+                csi=matrix.reshape(rows, cols),
+            )
+        )
+
+    if offset != len(data):
+        raise CSIDecodeError("Trailing bytes after last frame")
+    return packets
+
+
+def encode_binary_batch(packets: Iterable[CSIPacket]) -> bytes:
+    """Encode packets into the binary batch layout understood by ``decode_binary_batch``."""
+
+    chunks: List[bytes] = []
+    for packet in packets:
+        matrix = np.ascontiguousarray(packet.csi, dtype=_FLOAT32_LE)
+        if matrix.ndim != 2:
+            raise ValueError("CSI matrix must be two-dimensional")
+        rows, cols = matrix.shape
+        timestamp = packet.timestamp
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        delta = timestamp - _EPOCH
+        timestamp_us = (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+        chunks.append(
+            FRAME_HEADER.pack(
+                bytes.fromhex(packet.mac_address.replace(":", "")),
+                packet.sequence_id,
+                timestamp_us,
+                _encode_optional(packet.rssi),
+                _encode_optional(packet.noise_floor),
+                _encode_optional(packet.snr),
+                rows,
+                cols,
+            )
+        )
+        chunks.append(matrix.tobytes())
+    header = BATCH_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, len(chunks) // 2)
+    return header + b"".join(chunks)
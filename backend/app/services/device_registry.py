@@ -1,16 +1,78 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timezone
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-from ..schemas.device import DeviceSettingsResponse, DeviceStatus, DeviceSettingsUpdate
+from ..core.config import Settings
+from ..schemas.csi import CSIPacket
+from ..schemas.device import (
+    DeviceSettingsResponse,
+    DeviceSettingsUpdate,
+    DeviceStatus,
+    LinkStats,
+)
+from .metrics import (
+    PACKET_JITTER,
+    PACKETS_DUPLICATE,
+    PACKETS_EXPECTED,
+    PACKETS_RECEIVED,
+    PACKETS_REORDERED,
+    RATE_LIMITED_FRAMES,
+    REORDER_HELD,
+    REORDER_SKIPPED,
+)
+from .rate_limiter import TokenBucket
+from .reorder_buffer import ReorderBuffer
+from .sequence_tracker import DEFAULT_REORDER_WINDOW, SequenceTracker
 
 
 class DeviceRegistry:
-    """Track device activity and per-device configuration."""
+    """Track device activity and per-device configuration.
 
-    def __init__(self) -> None:
+    Also the ingest gate for sequence IDs: with ``deduplicate`` set, frames whose ID
+    was already seen within ``reorder_window`` are dropped before they reach the queue,
+    and with ``reorder_depth > 0`` each device's frames are released in sequence order
+    through a ``ReorderBuffer``.
+    """
+
+    def __init__(
+        self,
+        reorder_window: int = DEFAULT_REORDER_WINDOW,
+        deduplicate: bool = False,
+        reorder_depth: int = 0,
+        reorder_max_delay_ms: float = 50.0,
+        rate_limit_burst: float = 1.0,
+    ) -> None:
         self._devices: Dict[str, DeviceStatus] = {}
+        self._sequences: Dict[str, SequenceTracker] = {}
+        self._reorder: Dict[str, ReorderBuffer] = {}
+        self._limits: Dict[str, TokenBucket] = {}
+        self._skipped: Dict[str, int] = {}
+        self._shed: Dict[str, int] = {}
+        self._rate_limit_burst = rate_limit_burst
+        self._reorder_window = reorder_window
+        self._deduplicate = deduplicate
+        self._reorder_depth = max(0, reorder_depth)
+        self._reorder_max_delay_s = reorder_max_delay_ms / 1000.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "DeviceRegistry":
+        return cls(
+            reorder_window=settings.device_sequence_reorder_window,
+            deduplicate=settings.ingest_deduplicate,
+            reorder_depth=settings.ingest_reorder_depth,
+            reorder_max_delay_ms=settings.ingest_reorder_max_delay_ms,
+            rate_limit_burst=settings.inference_rate_limit_burst,
+        )
+
+    @property
+    def reordering(self) -> bool:
+        return self._reorder_depth > 0
+
+    @property
+    def reorder_max_delay_s(self) -> float:
+        return self._reorder_max_delay_s
 
     def upsert(self, mac_address: str) -> DeviceStatus:
         record = self._devices.setdefault(mac_address, DeviceStatus(mac_address=mac_address))
@@ -18,9 +80,147 @@ class DeviceRegistry:
         record.online = True
         return record
 
-    def mark_prediction(self, mac_address: str) -> None:
+    def mark_prediction(self, mac_address: str, count: int = 1) -> None:
         record = self.upsert(mac_address)
-        record.detection_count += 1
+        record.detection_count += count
+
+    def observe_packets(
+        self, packets: Iterable[CSIPacket], arrival: Optional[float] = None
+    ) -> Tuple[List[CSIPacket], int]:
+        """Feed ingested frames to their device's sequence tracker.
+
+        Returns the frames to enqueue and the number of duplicates seen. The frames are
+        all of the input by default, minus duplicates when
+        deduplicating, and per device in sequence order (possibly including frames
+        held back by earlier calls) when reordering. Called at the HTTP edge for every
+        decoded frame, so the loss reported here is radio-side; backend drops show up
+        as rejected/429 responses instead.
+        """
+
+        arrival = time.time() if arrival is None else arrival
+        accepted: List[CSIPacket] = []
+        received = expected = duplicates = reordered = skipped = 0
+        touched: Dict[str, SequenceTracker] = {}
+        for packet in packets:
+            tracker = self._sequences.get(packet.mac_address)
+            if tracker is None:
+                tracker = SequenceTracker(reorder_window=self._reorder_window)
+                self._sequences[packet.mac_address] = tracker
+            seen_expected, seen_reordered = tracker.expected, tracker.reordered
+            extended = tracker.observe(packet.sequence_id, packet.timestamp, arrival)
+            touched[packet.mac_address] = tracker
+            if extended is None:
+                duplicates += 1
+                if not self._deduplicate:
+                    accepted.append(packet)
+                continue
+            received += 1
+            expected += tracker.expected - seen_expected
+            reordered += tracker.reordered - seen_reordered
+            if not self._reorder_depth:
+                accepted.append(packet)
+                continue
+            buffer = self._reorder.get(packet.mac_address)
+            if buffer is None:
+                buffer = ReorderBuffer(self._reorder_depth, self._reorder_max_delay_s)
+                self._reorder[packet.mac_address] = buffer
+            released, gap = buffer.push(extended, packet, arrival)
+            accepted.extend(released)
+            skipped += gap
+        PACKETS_RECEIVED.inc(received)
+        PACKETS_EXPECTED.inc(expected)
+        if duplicates:
+            PACKETS_DUPLICATE.inc(duplicates)
+        if reordered:
+            PACKETS_REORDERED.inc(reordered)
+        for tracker in touched.values():
+            PACKET_JITTER.observe(tracker.jitter_s * 1000.0)
+        if self._reorder_depth:
+            self._account_reorder(skipped)
+        return accepted, duplicates
+
+    def forget_packets(self, packets: Iterable[CSIPacket]) -> None:
+        """Un-mark frames that were observed but then rejected by the queue.
+
+        Without this a bridge retry of a rejected frame would be dropped as a duplicate.
+        """
+
+        for packet in packets:
+            tracker = self._sequences.get(packet.mac_address)
+            if tracker is not None:
+                tracker.forget(packet.sequence_id)
+
+    def release_expired(self, now: Optional[float] = None) -> List[CSIPacket]:
+        """Frames whose reorder gap timed out while no newer frame for the device came."""
+
+        now = time.time() if now is None else now
+        released: List[CSIPacket] = []
+        skipped = 0
+        for buffer in self._reorder.values():
+            if len(buffer):
+                frames, gap = buffer.expire(now)
+                released.extend(frames)
+                skipped += gap
+        self._account_reorder(skipped)
+        return released
+
+    def _account_reorder(self, skipped: int) -> None:
+        if skipped:
+            REORDER_SKIPPED.inc(skipped)
+        REORDER_HELD.set(sum(len(buffer) for buffer in self._reorder.values()))
+
+    def admit(self, packets: Sequence[CSIPacket]) -> List[bool]:
+        """Apply each device's ``inference_frequency_hz``; ``False`` marks a frame to skip.
+
+        Devices without a configured frequency are never limited.
+        """
+
+        if not self._limits:
+            return [True] * len(packets)
+        admitted: List[bool] = []
+        skipped = 0
+        for packet in packets:
+            bucket = self._limits.get(packet.mac_address)
+            keep = bucket is None or bucket.admit(packet.timestamp)
+            if not keep:
+                skipped += 1
+                self._skipped[packet.mac_address] = self._skipped.get(packet.mac_address, 0) + 1
+            admitted.append(keep)
+        if skipped:
+            RATE_LIMITED_FRAMES.inc(skipped)
+        return admitted
+
+    def record_shed(self, mac_address: str, frames: int) -> None:
+        """Count frames admission control rejected or dropped for a device."""
+
+        self._shed[mac_address] = self._shed.get(mac_address, 0) + frames
+
+    def link_stats(self, mac_address: Optional[str] = None) -> LinkStats:
+        """Sequence-derived link quality for one device, or summed over all devices."""
+
+        if mac_address is not None:
+            tracker = self._sequences.get(mac_address)
+            trackers = [tracker] if tracker is not None else []
+        else:
+            trackers = list(self._sequences.values())
+        received = sum(tracker.received for tracker in trackers)
+        jitter_weighted = sum(tracker.jitter_s * tracker.received for tracker in trackers)
+        expected = sum(tracker.expected for tracker in trackers)
+        duplicates = sum(tracker.duplicates for tracker in trackers)
+        lost = sum(tracker.lost for tracker in trackers)
+        return LinkStats(
+            packets_received=received,
+            packets_expected=expected,
+            packets_lost=lost,
+            duplicates=duplicates,
+            reordered=sum(tracker.reordered for tracker in trackers),
+            packet_loss_percentage=100.0 * lost / expected if expected else 0.0,
+            duplicate_percentage=(
+                100.0 * duplicates / (received + duplicates) if received + duplicates else 0.0
+            ),
+            # Mean of the per-device estimates, weighted by traffic.
+            jitter_ms=1000.0 * jitter_weighted / received if received else 0.0,
+        )
 
     def set_offline(self, mac_address: str) -> None:
         record = self._devices.get(mac_address)
@@ -31,6 +231,13 @@ class DeviceRegistry:
         record = self._devices.setdefault(mac_address, DeviceStatus(mac_address=mac_address))
         record.inference_frequency_hz = payload.inference_frequency_hz or record.inference_frequency_hz
         record.distance_calibration_m = payload.distance_calibration_m or record.distance_calibration_m
+        bucket = self._limits.get(mac_address)
+        if record.inference_frequency_hz is None:
+            self._limits.pop(mac_address, None)
+        elif bucket is None or bucket.rate_hz != record.inference_frequency_hz:
+            self._limits[mac_address] = TokenBucket(
+                record.inference_frequency_hz, self._rate_limit_burst
+            )
         return DeviceSettingsResponse(
             mac_address=mac_address,
             inference_frequency_hz=record.inference_frequency_hz,
@@ -38,7 +245,22 @@ class DeviceRegistry:
         )
 
     def list(self) -> list[DeviceStatus]:
+        for mac_address, record in self._devices.items():
+            tracker = self._sequences.get(mac_address)
+            if tracker is not None:
+                record.packets_received = tracker.received
+                record.packet_loss_percentage = 100.0 * tracker.loss_ratio
+                record.duplicate_percentage = 100.0 * tracker.duplicate_ratio
+                record.reordered_packets = tracker.reordered
+                record.jitter_ms = tracker.jitter_s * 1000.0
+            record.skipped_frames = self._skipped.get(mac_address, 0)
+            record.shed_frames = self._shed.get(mac_address, 0)
         return sorted(self._devices.values(), key=lambda record: record.mac_address)
 
     def clear(self) -> None:
         self._devices.clear()
+        self._sequences.clear()
+        self._reorder.clear()
+        self._limits.clear()
+        self._skipped.clear()
+        self._shed.clear()
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Literal, Optional, Type
+
+import numpy as np
+
+from ..core.logging import get_logger
+
+if TYPE_CHECKING:
+    import torch
+
+logger = get_logger(__name__)
+
+BackendName = Literal["torchscript", "torch_int8", "onnxruntime"]
+
+
+class InferenceBackend(ABC):
+    """A loaded model artifact that maps a padded input tensor to logits.
+
+    Backends are created by ``create_backend`` and driven by ``InferenceEngine``, which
+    owns input buffering, softmax and prediction batches. ``suffix`` is the artifact file
+    extension the backend loads; ``supports_cuda`` whether it can run on a CUDA device.
+    """
+
+    suffix = ".ts"
+    supports_cuda = False
+
+    @abstractmethod
+    def __init__(
+        self,
+        path: Path,
+        device: "torch.device",
+        optimize: bool = False,
+        num_threads: Optional[int] = None,
+    ) -> None:
+        """Load the artifact at ``path`` onto ``device``."""
+
+    @abstractmethod
+    def __call__(self, tensor: "torch.Tensor") -> np.ndarray:
+        """Return the logits for ``tensor`` as a host array."""
+
+
+class TorchScriptBackend(InferenceBackend):
+    """Full-precision TorchScript, optionally frozen for inference."""
+
+    supports_cuda = True
+
+    def __init__(
+        self,
+        path: Path,
+        device: "torch.device",
+        optimize: bool = False,
+        num_threads: Optional[int] = None,
+    ) -> None:
+        import torch
+
+        model = torch.jit.load(str(path), map_location=device)
+        model.eval()
+        self._model = self._prepare(model, path, optimize)
+
+    def _prepare(
+        self, model: "torch.jit.ScriptModule", path: Path, optimize: bool
+    ) -> "torch.jit.ScriptModule":
+        import torch
+
+        if optimize:
+            try:
+                return torch.jit.optimize_for_inference(torch.jit.freeze(model))
+            except Exception as exc:
+                logger.warning("model_optimize_failed", path=str(path), error=str(exc))
+        return model
+
+    def __call__(self, tensor: "torch.Tensor") -> np.ndarray:
+        import torch
+
+        with torch.inference_mode():
+            return self._model(tensor).cpu().numpy()
+
+
+class QuantizedTorchBackend(TorchScriptBackend):
+    """TorchScript with ``nn.Linear`` layers dynamically quantized to int8 (CPU only).
+
+    Weights are quantized once at load and activations per batch. Artifacts that are
+    already quantized (``scripts.export_model`` writes ``<stem>.int8.ts``) load as is.
+    """
+
+    supports_cuda = False
+
+    def _prepare(
+        self, model: "torch.jit.ScriptModule", path: Path, optimize: bool
+    ) -> "torch.jit.ScriptModule":
+        if is_quantized(model):
+            return model
+        return quantize_dynamic(model)
+
+
+def quantize_dynamic(model: "torch.jit.ScriptModule") -> "torch.jit.ScriptModule":
+    """Dynamically quantize the linear layers of a TorchScript module to int8."""
+
+    from torch.ao.quantization import default_dynamic_qconfig, quantize_dynamic_jit
+
+    return quantize_dynamic_jit(model, {"": default_dynamic_qconfig})
+
+
+def is_quantized(model: "torch.jit.ScriptModule") -> bool:
+    return any(node.kind().startswith("quantized::") for node in model.inlined_graph.nodes())
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """ONNX Runtime on CPU; needs the ``onnx`` extra (``pip install '.[onnx]'``)."""
+
+    suffix = ".onnx"
+
+    def __init__(
+        self,
+        path: Path,
+        device: "torch.device",
+        optimize: bool = False,
+        num_threads: Optional[int] = None,
+    ) -> None:
+        try:
+            import onnxruntime as ort
+        except ImportError as exc:
+            raise RuntimeError(
+                "the onnxruntime backend needs onnxruntime: pip install '.[onnx]'"
+            ) from exc
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+            options.inter_op_num_threads = 1
+        self._session = ort.InferenceSession(
+            str(path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self._input = self._session.get_inputs()[0].name
+
+    def __call__(self, tensor: "torch.Tensor") -> np.ndarray:
+        # Input buckets live in CPU memory, so this is a view of the buffer, not a copy.
+        return self._session.run(None, {self._input: tensor.numpy()})[0]
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+BACKENDS: Dict[str, Type[InferenceBackend]] = {
+    "torchscript": TorchScriptBackend,
+    "torch_int8": QuantizedTorchBackend,
+    "onnxruntime": OnnxRuntimeBackend,
+}
+
+
+def backend_suffix(name: str) -> str:
+    return BACKENDS[name].suffix
+
+
+def create_backend(
+    name: str,
+    path: Path,
+    device: "torch.device",
+    optimize: bool = False,
+    num_threads: Optional[int] = None,
+) -> InferenceBackend:
+    try:
+        backend = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"unknown inference backend: {name}") from None
+    return backend(path, device, optimize=optimize, num_threads=num_threads)
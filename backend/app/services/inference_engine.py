@@ -2,78 +2,157 @@ from __future__ import annotations
 
 import time
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Sequence
 
 import numpy as np
-import torch
 
+from ..core.logging import get_logger
 from ..schemas.csi import CSIPacket
-from ..schemas.prediction import InferenceEnvelope
+from .inference_backends import BACKENDS, InferenceBackend, create_backend, softmax
+from .input_buckets import InputBuckets, Shape
+from .prediction_batch import LABELS, PredictionBatch
+
+# torch is imported when the first engine is built, so processes that never run a model
+# (the API process in process execution mode, tools importing the app) do not pay for it.
+
+logger = get_logger(__name__)
+
+
+def batch_buckets(max_batch_size: int) -> List[int]:
+    """Padded batch sizes: powers of two below ``max_batch_size``, then the maximum."""
+
+    sizes = []
+    size = 1
+    while size < max_batch_size:
+        sizes.append(size)
+        size *= 2
+    sizes.append(max(1, max_batch_size))
+    return sizes
 
 
 class InferenceEngine:
-    """Wrap TorchScript model inference with fallbacks for missing artifacts."""
+    """Run model inference through a pluggable backend, with fallbacks for missing artifacts.
+
+    ``backend`` picks how the artifact is executed (see ``inference_backends``): full
+    precision TorchScript, dynamically quantized int8 TorchScript, or ONNX Runtime.
+    Model inputs are written into preallocated ``InputBuckets`` of ``batch_sizes`` rows
+    (padded along the batch axis only) per frame shape, so configured ``frame_shapes``
+    only ever reach the model at those batch sizes. With
+    ``optimize`` a TorchScript module is frozen and passed through
+    ``torch.jit.optimize_for_inference``; models that cannot be frozen run unoptimized.
+    """
+
+    def __init__(
+        self,
+        artifact_path: Path,
+        model_version: str,
+        optimize: bool = False,
+        batch_sizes: Optional[Sequence[int]] = None,
+        frame_shapes: Sequence[Shape] = (),
+        backend: str = "torchscript",
+        num_threads: Optional[int] = None,
+    ) -> None:
+        import torch
 
-    def __init__(self, artifact_path: Path, model_version: str) -> None:
         self._artifact_path = artifact_path
         self._model_version = model_version
-        self._device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self._model: Optional[torch.jit.ScriptModule] = None
+        self._optimize = optimize
+        self._backend_name = backend
+        self._num_threads = num_threads
+        cuda = BACKENDS[backend].supports_cuda and torch.cuda.is_available()
+        self._device = torch.device("cuda" if cuda else "cpu")
+        self._backend: Optional[InferenceBackend] = None
+        self._inputs = InputBuckets(
+            batch_sizes if batch_sizes is not None else batch_buckets(32),
+            frame_shapes,
+            self._device,
+        )
         self._load_model()
 
     def _load_model(self) -> None:
-        if self._artifact_path.exists():
-            self._model = torch.jit.load(str(self._artifact_path), map_location=self._device)
-            self._model.eval()
-        else:
-            self._model = None
+        if not self._artifact_path.exists():
+            self._backend = None
+            return
+        self._backend = create_backend(
+            self._backend_name,
+            self._artifact_path,
+            self._device,
+            optimize=self._optimize,
+            num_threads=self._num_threads,
+        )
+
+    def with_artifact(self, artifact_path: Path, model_version: str) -> "InferenceEngine":
+        """A new engine for another artifact, configured like this one."""
+
+        return InferenceEngine(
+            artifact_path,
+            model_version,
+            optimize=self._optimize,
+            batch_sizes=self._inputs.batch_sizes,
+            frame_shapes=self._inputs.frame_shapes,
+            backend=self._backend_name,
+            num_threads=self._num_threads,
+        )
 
     @property
     def model_version(self) -> str:
         return self._model_version
 
+    @property
+    def artifact_path(self) -> Path:
+        return self._artifact_path
+
+    @property
+    def backend(self) -> str:
+        return self._backend_name
+
+    @property
+    def optimize(self) -> bool:
+        return self._optimize
+
     @property
     def has_model(self) -> bool:
-        return self._model is not None
+        return self._backend is not None
+
+    @property
+    def inputs(self) -> InputBuckets:
+        return self._inputs
 
     def reload(self) -> None:
         self._load_model()
 
-    def run_batch(self, batch: Iterable[tuple[np.ndarray, CSIPacket]]) -> List[InferenceEnvelope]:
-        start = time.perf_counter()
-        envelopes: List[InferenceEnvelope] = []
+    def warm_up(self, runs: int = 3) -> None:
+        """Run every input bucket through the model so live batches skip JIT profiling."""
+
+        if self._backend is None:
+            return
+        for tensor in self._inputs.buffers():
+            for _ in range(runs):
+                self._backend(tensor)
 
-        features = [item[0] for item in batch]
-        packets = [item[1] for item in batch]
+    def run_batch(self, batch: Iterable[tuple[np.ndarray, CSIPacket]]) -> PredictionBatch:
+        start = time.perf_counter()
+        items = list(batch)
+        features = [item[0] for item in items]
+        packets = [item[1] for item in items]
         if not packets:
-            return envelopes
-
-        latency_ms = 0.0
-        if self._model is not None:
-            tensor = torch.from_numpy(np.stack(features)).to(self._device)
-            with torch.inference_mode():
-                logits = self._model(tensor)
-            probs = torch.softmax(logits, dim=-1).cpu().numpy()
-            predicted = probs.argmax(axis=1)
+            return PredictionBatch.empty(self._model_version)
+
+        if self._backend is not None:
+            probs: Optional[np.ndarray] = None
+            for indices, tensor in self._inputs.batches(features):
+                chunk = softmax(self._backend(tensor)[: len(indices)])
+                if probs is None:
+                    probs = np.empty((len(features), chunk.shape[1]), dtype=chunk.dtype)
+                probs[indices] = chunk
         else:
             probs = np.tile(np.array([[0.2, 0.6, 0.2, 0.0]]), (len(features), 1))
-            predicted = probs.argmax(axis=1)
-
-        elapsed = time.perf_counter() - start
-        latency_ms = elapsed * 1000.0
-
-        labels = ["empty", "human", "object", "unknown"]
-        for idx, packet in enumerate(packets):
-            label_idx = int(predicted[idx]) if idx < len(predicted) else 3
-            confidence = float(probs[idx][label_idx]) if idx < len(probs) else 0.0
-            envelope = InferenceEnvelope(
-                mac_address=packet.mac_address,
-                timestamp=packet.timestamp,
-                label=labels[label_idx] if label_idx < len(labels) else "unknown",
-                confidence=confidence,
-                distance_m=max(0.0, float(packet.snr or 0.0) * 0.5),
-                model_version=self._model_version,
-                latency_ms=latency_ms,
-            )
-            envelopes.append(envelope)
-        return envelopes
+        best = probs.argmax(axis=1)
+        confidence = probs[np.arange(len(probs)), best]
+        # Models with more outputs than known labels report the extras as "unknown".
+        predicted = np.minimum(best, len(LABELS) - 1)
+
+        latency_ms = (time.perf_counter() - start) * 1000.0
+        return PredictionBatch.from_packets(
+            packets, predicted, confidence, self._model_version, latency_ms
+        )
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import bisect
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.logging import get_logger
+
+if TYPE_CHECKING:
+    import torch
+
+Shape = Tuple[int, ...]
+
+logger = get_logger(__name__)
+
+
+class InputBuckets:
+    """Preallocated model input tensors for a fixed set of batch sizes and frame shapes.
+
+    Frames are grouped by shape and only ever padded along the batch axis: the model has
+    no mask input, so zero-padding a frame up to a larger shape would change its
+    prediction. A frame whose shape is not configured becomes a bucket of its own (and
+    is logged once). Each group is written in place into the buffer of the smallest batch
+    size that holds it, in chunks of the largest; rows past the group are zeroed and
+    their outputs dropped. Buffers are created on first use
+    (``buffers()`` creates them all) and reused afterwards, so batches after warm-up
+    allocate no input memory and always hit a shape the model has already run. On CUDA
+    the host buffers are pinned and copied into matching device buffers.
+
+    Not thread-safe: one instance serves one inference thread.
+    """
+
+    def __init__(
+        self,
+        batch_sizes: Sequence[int],
+        frame_shapes: Sequence[Shape] = (),
+        device: Optional["torch.device"] = None,
+    ) -> None:
+        import torch
+
+        self._batch_sizes = sorted({max(1, size) for size in batch_sizes}) or [1]
+        self._frame_shapes: List[Shape] = []
+        for shape in frame_shapes:
+            self._add_frame_shape(tuple(shape))
+        self._device = device if device is not None else torch.device("cpu")
+        self._pin = self._device.type == "cuda"
+        # (rows, frame shape) -> (host array view, host tensor, device tensor)
+        self._buffers: Dict[Tuple[int, Shape], Tuple[np.ndarray, torch.Tensor, torch.Tensor]] = {}
+        self.allocations = 0
+
+    @property
+    def batch_sizes(self) -> List[int]:
+        return list(self._batch_sizes)
+
+    @property
+    def frame_shapes(self) -> List[Shape]:
+        return list(self._frame_shapes)
+
+    def _add_frame_shape(self, shape: Shape) -> None:
+        if shape not in self._frame_shapes:
+            self._frame_shapes.append(shape)
+            self._frame_shapes.sort(key=lambda bucket: (int(np.prod(bucket)), bucket))
+
+    def frame_bucket(self, shape: Shape) -> Shape:
+        if shape not in self._frame_shapes:
+            logger.warning(
+                "input_bucket_unconfigured_shape",
+                shape=list(shape),
+                configured=[list(bucket) for bucket in self._frame_shapes],
+            )
+            self._add_frame_shape(shape)
+        return shape
+
+    def batch_bucket(self, rows: int) -> int:
+        index = bisect.bisect_left(self._batch_sizes, rows)
+        return self._batch_sizes[min(index, len(self._batch_sizes) - 1)]
+
+    def _buffer(self, rows: int, frame: Shape) -> Tuple[np.ndarray, "torch.Tensor", "torch.Tensor"]:
+        buffer = self._buffers.get((rows, frame))
+        if buffer is None:
+            import torch
+
+            host = torch.zeros((rows, *frame), dtype=torch.float32, pin_memory=self._pin)
+            device = torch.zeros_like(host, device=self._device) if self._pin else host
+            buffer = self._buffers[(rows, frame)] = (host.numpy(), host, device)
+            self.allocations += 1
+        return buffer
+
+    def buffers(self) -> Iterator["torch.Tensor"]:
+        """Yield the (device) input tensor of every bucket, creating missing ones."""
+
+        for frame in self.frame_shapes:
+            for rows in self._batch_sizes:
+                yield self._buffer(rows, frame)[2]
+
+    def batches(self, features: Sequence[np.ndarray]) -> Iterator[Tuple[List[int], "torch.Tensor"]]:
+        """Yield ``(indices, tensor)`` per group; the first ``len(indices)`` rows are real."""
+
+        groups: Dict[Shape, List[int]] = {}
+        for index, feature in enumerate(features):
+            groups.setdefault(self.frame_bucket(feature.shape), []).append(index)
+        largest = self._batch_sizes[-1]
+        for frame, indices in groups.items():
+            for offset in range(0, len(indices), largest):
+                chunk = indices[offset : offset + largest]
+                yield chunk, self._fill(frame, [features[index] for index in chunk])
+
+    def _fill(self, frame: Shape, rows: List[np.ndarray]) -> "torch.Tensor":
+        count = len(rows)
+        array, host, device = self._buffer(self.batch_bucket(count), frame)
+        np.stack(rows, out=array[:count])
+        array[count:] = 0.0
+        if device is not host:
+            device.copy_(host, non_blocking=True)
+        return device
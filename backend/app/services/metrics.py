@@ -19,6 +19,146 @@ QUEUE_SIZE = Gauge(
     "csi_ingest_queue_size",
     "Number of CSI packets waiting for inference",
 )
+WORKER_QUEUE_SIZE = Gauge(
+    "csi_worker_queue_size",
+    "Number of CSI packets waiting in each inference worker's shard",
+    labelnames=("worker",),
+)
+BATCH_SIZE = Histogram(
+    "csi_inference_batch_size",
+    "Number of packets per inference batch",
+    labelnames=("worker",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512),
+)
+BATCH_TARGET_SIZE = Gauge(
+    "csi_inference_batch_target_size",
+    "Current adaptive batch size target per inference worker",
+    labelnames=("worker",),
+)
+QUEUE_DELAY = Histogram(
+    "csi_queue_delay_ms",
+    "Time packets spend queued before their batch is dispatched, in milliseconds",
+    labelnames=("worker",),
+    buckets=(0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+WORKER_PACKETS = Counter(
+    "csi_worker_packets_total",
+    "CSI packets processed by each inference worker",
+    labelnames=("worker",),
+)
+WEBSOCKET_CLIENTS = Gauge(
+    "csi_websocket_clients",
+    "Number of connected prediction stream clients",
+)
+WEBSOCKET_DROPPED_FRAMES = Counter(
+    "csi_websocket_dropped_total",
+    "Prediction frames or records dropped for slow websocket clients",
+    labelnames=("policy",),
+)
+REDIS_FLUSH_LATENCY = Histogram(
+    "csi_redis_flush_ms",
+    "Time to write one pipelined batch of predictions to Redis, in milliseconds",
+    buckets=(0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500),
+)
+REDIS_KEYS_WRITTEN = Counter(
+    "csi_redis_keys_written_total",
+    "Prediction keys written to Redis after per-device deduplication",
+)
+PERSIST_BUFFERED = Gauge(
+    "csi_persist_buffered_rows",
+    "Predictions waiting in the write-behind buffer for a database flush",
+)
+PERSIST_FLUSH_LATENCY = Histogram(
+    "csi_persist_flush_ms",
+    "Time to bulk insert one flush of predictions, in milliseconds",
+    buckets=(1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500),
+)
+PERSIST_ROWS = Counter(
+    "csi_persist_rows_total",
+    "Predictions written to the database",
+)
+PERSIST_DROPPED = Counter(
+    "csi_persist_dropped_total",
+    "Predictions dropped because they could not be written at shutdown",
+)
+PERSIST_REJECTED = Counter(
+    "csi_persist_rejected_total",
+    "Predictions dropped because the database refused them",
+)
+PACKETS_RECEIVED = Counter(
+    "csi_packets_received_total",
+    "Distinct CSI frames received at ingest (before queue admission)",
+)
+PACKETS_EXPECTED = Counter(
+    "csi_packets_expected_total",
+    "CSI frames expected from sequence IDs; 1 - received/expected is the radio loss rate",
+)
+PACKETS_DUPLICATE = Counter(
+    "csi_packets_duplicate_total",
+    "CSI frames received more than once (same sequence ID within the reorder window); "
+    "dropped before the queue when ingest deduplication is on",
+)
+PACKETS_REORDERED = Counter(
+    "csi_packets_reordered_total",
+    "CSI frames that arrived after a frame with a higher sequence ID",
+)
+PACKET_JITTER = Histogram(
+    "csi_packet_jitter_ms",
+    "Per-device RFC 3550 interarrival jitter estimate, sampled per ingest call",
+    buckets=(0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+SHED_FRAMES = Counter(
+    "csi_ingest_shed_frames_total",
+    "CSI frames rejected or dropped by ingest admission control; per device in /devices",
+    labelnames=("policy",),
+)
+RATE_LIMITED_FRAMES = Counter(
+    "csi_rate_limited_frames_total",
+    "CSI frames not inferred because their device exceeded inference_frequency_hz",
+)
+REORDER_HELD = Gauge(
+    "csi_reorder_held_frames",
+    "CSI frames held in per-device reorder buffers waiting for a sequence gap to fill",
+)
+REORDER_SKIPPED = Counter(
+    "csi_reorder_skipped_total",
+    "Sequence IDs the reorder buffers stopped waiting for (depth or delay exceeded)",
+)
+MODEL_RELOADS = Counter(
+    "csi_model_reloads_total",
+    "Model registry transitions: loaded (live), shadowed, promoted, rejected, failed",
+    labelnames=("result",),
+)
+SHADOW_FRAMES = Counter(
+    "csi_model_shadow_frames_total",
+    "Frames run through both the live and the shadow model",
+    labelnames=("version",),
+)
+SHADOW_AGREED = Counter(
+    "csi_model_shadow_agreed_total",
+    "Shadow-compared frames where the shadow model predicted the live model's label",
+    labelnames=("version",),
+)
+SHADOW_LATENCY = Histogram(
+    "csi_model_shadow_latency_ms",
+    "Model latency on shadow-compared batches, in milliseconds, for each role",
+    labelnames=("model",),
+    buckets=(1, 2.5, 5, 7.5, 10, 25, 50, 75, 100, 250, 500, 1000),
+)
+STARTUP_PHASE = Gauge(
+    "csi_startup_phase_seconds",
+    "Wall time of each application startup phase, in seconds",
+    labelnames=("phase",),
+)
+RETENTION_PARTITIONS_DROPPED = Counter(
+    "csi_retention_partitions_dropped_total",
+    "Daily prediction partitions dropped by the retention job",
+)
+RETENTION_ROWS_DELETED = Counter(
+    "csi_retention_rows_deleted_total",
+    "Rows deleted by the retention job from unpartitioned tables",
+    labelnames=("table",),
+)
 
 
 @contextmanager
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import orjson
+
+from ..schemas.csi import CSIPacket
+from ..schemas.prediction import PredictionRecord
+
+LABELS: Tuple[str, ...] = ("empty", "human", "object", "unknown")
+LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+NO_SEQUENCE = -1
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Matches ``PredictionRecord.model_dump(mode="json")``: aware UTC timestamps end in ``Z``.
+_JSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def timestamp_us(timestamp: datetime) -> int:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    delta = timestamp - _EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _optional(values: List[float]) -> List[Any]:
+    return [None if value != value else value for value in values]
+
+
+@dataclass
+class PredictionBatch:
+    """Predictions for one inference batch, stored as columns.
+
+    The pipeline stages (prediction cache, websocket broadcast, Redis, database) read
+    the columns directly; ``PredictionRecord`` objects are only built by ``records()``
+    at API boundaries. Label columns hold codes into ``LABELS``; missing signal values
+    are NaN and a missing sequence ID is ``NO_SEQUENCE``. Every row comes from the same
+    model run, so ``model_version`` and ``latency_ms`` are per batch.
+    """
+
+    mac_addresses: List[str]
+    timestamps: List[datetime]
+    labels: np.ndarray
+    confidence: np.ndarray
+    distance_m: np.ndarray
+    sequence_id: np.ndarray
+    rssi: np.ndarray
+    noise_floor: np.ndarray
+    snr: np.ndarray
+    model_version: str
+    latency_ms: float
+    # Derived once per batch on first use and shared by every stage.
+    _rows: List[Dict[str, Any]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _groups: Dict[str, List[int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def from_packets(
+        cls,
+        packets: Sequence[CSIPacket],
+        labels: np.ndarray,
+        confidence: np.ndarray,
+        model_version: str,
+        latency_ms: float,
+    ) -> "PredictionBatch":
+        """Results for ``packets``; distance is the SNR-based estimate for each frame."""
+
+        snr = np.array(
+            [np.nan if packet.snr is None else packet.snr for packet in packets], dtype=np.float64
+        )
+        return cls(
+            mac_addresses=[packet.mac_address for packet in packets],
+            timestamps=[packet.timestamp for packet in packets],
+            labels=labels.astype(np.uint8, copy=False),
+            confidence=confidence.astype(np.float64, copy=False),
+            distance_m=np.maximum(0.0, np.nan_to_num(snr) * 0.5),
+            sequence_id=np.array(
+                [NO_SEQUENCE if p.sequence_id is None else p.sequence_id for p in packets],
+                dtype=np.int64,
+            ),
+            rssi=np.array(
+                [np.nan if p.rssi is None else p.rssi for p in packets], dtype=np.float64
+            ),
+            noise_floor=np.array(
+                [np.nan if p.noise_floor is None else p.noise_floor for p in packets],
+                dtype=np.float64,
+            ),
+            snr=snr,
+            model_version=model_version,
+            latency_ms=latency_ms,
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[PredictionRecord]) -> "PredictionBatch":
+        """Columns for existing records, which must share a model version and latency."""
+
+        def column(name: str, missing: float, dtype: Any) -> np.ndarray:
+            values = [getattr(record, name) for record in records]
+            return np.array([missing if v is None else v for v in values], dtype=dtype)
+
+        return cls(
+            mac_addresses=[record.mac_address for record in records],
+            timestamps=[record.timestamp for record in records],
+            labels=np.array(
+                [LABEL_CODES.get(record.label, LABEL_CODES["unknown"]) for record in records],
+                dtype=np.uint8,
+            ),
+            confidence=column("confidence", np.nan, np.float64),
+            distance_m=column("distance_m", np.nan, np.float64),
+            sequence_id=column("sequence_id", NO_SEQUENCE, np.int64),
+            rssi=column("rssi", np.nan, np.float64),
+            noise_floor=column("noise_floor", np.nan, np.float64),
+            snr=column("snr", np.nan, np.float64),
+            model_version=records[0].model_version if records else "",
+            latency_ms=records[0].latency_ms if records else 0.0,
+        )
+
+    @classmethod
+    def empty(cls, model_version: str = "") -> "PredictionBatch":
+        return cls.from_packets(
+            [], np.empty(0, np.uint8), np.empty(0, np.float64), model_version, 0.0
+        )
+
+    def __len__(self) -> int:
+        return len(self.mac_addresses)
+
+    def label_names(self) -> List[str]:
+        return [LABELS[code] for code in self.labels.tolist()]
+
+    def timestamp_us(self) -> np.ndarray:
+        return np.fromiter(
+            (timestamp_us(timestamp) for timestamp in self.timestamps),
+            dtype=np.int64,
+            count=len(self.timestamps),
+        )
+
+    def by_device(self) -> Dict[str, List[int]]:
+        """Row indices per MAC address, in arrival order. Shared: do not mutate."""
+
+        if not self._groups:
+            for index, mac_address in enumerate(self.mac_addresses):
+                self._groups.setdefault(mac_address, []).append(index)
+        return self._groups
+
+    def label_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.labels, minlength=len(LABELS))
+        return {label: int(count) for label, count in zip(LABELS, counts) if count}
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """One dict per row with ``PredictionRecord`` field names, order and ``None``s.
+
+        Built once per batch and shared: callers must not mutate the dicts.
+        """
+
+        if self._rows or not len(self):
+            return self._rows
+        model_version, latency_ms = self.model_version, self.latency_ms
+        self._rows = [
+            {
+                "mac_address": mac_address,
+                "timestamp": timestamp,
+                "label": LABELS[label],
+                "confidence": confidence,
+                "distance_m": distance_m,
+                "model_version": model_version,
+                "latency_ms": latency_ms,
+                "sequence_id": None if sequence_id == NO_SEQUENCE else sequence_id,
+                "rssi": rssi,
+                "noise_floor": noise_floor,
+                "snr": snr,
+            }
+            for (
+                mac_address,
+                timestamp,
+                label,
+                confidence,
+                distance_m,
+                sequence_id,
+                rssi,
+                noise_floor,
+                snr,
+            ) in zip(
+                self.mac_addresses,
+                self.timestamps,
+                self.labels.tolist(),
+                self.confidence.tolist(),
+                self.distance_m.tolist(),
+                self.sequence_id.tolist(),
+                _optional(self.rssi.tolist()),
+                _optional(self.noise_floor.tolist()),
+                _optional(self.snr.tolist()),
+            )
+        ]
+        return self._rows
+
+    def json(self, index: int) -> bytes:
+        """Row ``index`` serialized like ``PredictionRecord.model_dump(mode="json")``."""
+
+        return orjson.dumps(self.rows()[index], option=_JSON_OPTIONS)
+
+    def records(self) -> List[PredictionRecord]:
+        return [PredictionRecord(**row) for row in self.rows()]
@@ -1,38 +1,339 @@
 from __future__ import annotations
 
-from collections import deque
-from typing import Deque, Dict, Iterable, Optional
+import heapq
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
 
 from ..schemas.prediction import PredictionRecord
+from .prediction_batch import (
+    LABEL_CODES,
+    LABELS,
+    NO_SEQUENCE,
+    PredictionBatch,
+    timestamp_us,
+)
+from .signal_stats import SignalStatistics
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# ``utc_offset_s`` of a naive timestamp, which is stored as UTC and handed back naive.
+NAIVE = np.iinfo(np.int32).min
+
+# Field -> dtype. Optional floats use NaN for ``None``; ``sequence_id`` uses -1.
+COLUMNS: Dict[str, np.dtype] = {
+    "timestamp_us": np.dtype(np.int64),
+    "label": np.dtype(np.uint8),
+    "confidence": np.dtype(np.float64),
+    "distance_m": np.dtype(np.float64),
+    "latency_ms": np.dtype(np.float64),
+    "model_version": np.dtype(np.uint16),
+    "sequence_id": np.dtype(np.int64),
+    "rssi": np.dtype(np.float64),
+    "noise_floor": np.dtype(np.float64),
+    "snr": np.dtype(np.float64),
+    "utc_offset_s": np.dtype(np.int32),
+}
+
+
+ROW_DTYPE = np.dtype(list(COLUMNS.items()))
+
+
+def _utc_offset_s(timestamp: datetime) -> int:
+    offset = timestamp.utcoffset()
+    return NAIVE if offset is None else offset.days * 86_400 + offset.seconds
+
+
+@lru_cache(maxsize=None)
+def _zone(utc_offset_s: int) -> timezone:
+    return timezone(timedelta(seconds=utc_offset_s))
+
+
+def _timestamp(timestamp_us: int, utc_offset_s: int) -> datetime:
+    """Rebuild a timestamp with the offset it was pushed with (naive stays naive)."""
+
+    timestamp = _EPOCH + timedelta(microseconds=timestamp_us)
+    if utc_offset_s == NAIVE:
+        return timestamp.replace(tzinfo=None)
+    if utc_offset_s:
+        return timestamp.astimezone(_zone(utc_offset_s))
+    return timestamp
 
-class PredictionCache:
-    """Manage per-device rolling prediction buffers."""
+
+class _DeviceColumns:
+    """Ring buffer of one device's predictions in a NumPy structured array.
+
+    Each field of the array is a column (``rows["confidence"]`` is a strided float64
+    view), so a push is a single row assignment. The array holds up to
+    ``2 * max_size`` rows and the live window ``[start, end)`` is always contiguous:
+    once ``end`` reaches the capacity the window is moved back to the front. That copy
+    happens at most once every ``max_size`` pushes, so pushes stay amortised O(1) and
+    every window is a zero-copy slice.
+    """
+
+    __slots__ = ("_max_size", "_start", "_end", "_last_timestamp", "rows", "ordered")
 
     def __init__(self, max_size: int) -> None:
         self._max_size = max_size
-        self._store: Dict[str, Deque[PredictionRecord]] = {}
+        self._start = 0
+        self._end = 0
+        self._last_timestamp = -(2**63)
+        self.rows = np.empty(min(16, 2 * max_size), ROW_DTYPE)
+        # False once a row arrived older than its predecessor; history then sorts.
+        self.ordered = True
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def _make_room(self) -> None:
+        size = len(self)
+        window = self.rows[self._start : self._end]
+        if len(self.rows) < 2 * self._max_size:
+            # Still filling up: grow geometrically instead of sizing every device upfront.
+            grown = np.empty(min(2 * len(self.rows), 2 * self._max_size), ROW_DTYPE)
+            grown[:size] = window
+            self.rows = grown
+        else:
+            # start >= max_size >= size here, so source and destination never overlap.
+            self.rows[:size] = window
+            if not self.ordered:
+                timestamps = self.rows["timestamp_us"][:size]
+                self.ordered = bool(np.all(timestamps[1:] >= timestamps[:-1]))
+        self._start, self._end = 0, size
+
+    def append(self, row: Tuple) -> None:
+        if self._end == len(self.rows):
+            self._make_room()
+        if row[0] < self._last_timestamp:
+            self.ordered = False
+        self._last_timestamp = row[0]
+        self.rows[self._end] = row
+        self._end += 1
+        if self._end - self._start > self._max_size:
+            self._start += 1
+
+    def extend(self, rows: np.ndarray) -> None:
+        """Append ``rows`` (``ROW_DTYPE``) with one slice copy per free stretch."""
+
+        stamps = rows["timestamp_us"]
+        if stamps[0] < self._last_timestamp or bool(np.any(stamps[1:] < stamps[:-1])):
+            self.ordered = False
+        self._last_timestamp = int(stamps[-1])
+        # Rows that would be evicted within this call are never copied in.
+        rows = rows[-self._max_size :]
+        offset = 0
+        while offset < len(rows):
+            if self._end == len(self.rows):
+                self._make_room()
+            count = min(len(rows) - offset, len(self.rows) - self._end)
+            self.rows[self._end : self._end + count] = rows[offset : offset + count]
+            self._end += count
+            offset += count
+            self._start = max(self._start, self._end - self._max_size)
+
+    def view(self) -> np.ndarray:
+        return self.rows[self._start : self._end]
+
+    def sorted_view(self) -> np.ndarray:
+        rows = self.view()
+        if self.ordered:
+            return rows
+        return rows[np.argsort(rows["timestamp_us"], kind="stable")]
+
+
+class PredictionCache:
+    """Manage per-device rolling prediction buffers.
+
+    Predictions are stored column-wise per device (see ``COLUMNS``) rather than as
+    ``PredictionRecord`` objects; records are only rebuilt for the rows a caller reads,
+    with timestamps in the UTC offset (or naive) they were pushed with.
+    ``signal`` holds running signal/latency statistics over every pushed prediction, so
+    summaries never have to walk the buffers.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max(1, max_size)
+        self._store: Dict[str, _DeviceColumns] = {}
+        self._model_versions: List[str] = []
+        self._model_codes: Dict[str, int] = {}
+        self.signal = SignalStatistics()
+
+    def _model_code(self, model_version: str) -> int:
+        code = self._model_codes.get(model_version)
+        if code is None:
+            code = self._model_codes[model_version] = len(self._model_versions)
+            self._model_versions.append(model_version)
+        return code
 
     def push(self, prediction: PredictionRecord) -> None:
-        buffer = self._store.setdefault(prediction.mac_address, deque(maxlen=self._max_size))
-        buffer.append(prediction)
+        buffer = self._store.get(prediction.mac_address)
+        if buffer is None:
+            buffer = self._store[prediction.mac_address] = _DeviceColumns(self._max_size)
+        buffer.append(
+            (
+                timestamp_us(prediction.timestamp),
+                LABEL_CODES.get(prediction.label, LABEL_CODES["unknown"]),
+                prediction.confidence,
+                prediction.distance_m,
+                prediction.latency_ms,
+                self._model_code(prediction.model_version),
+                NO_SEQUENCE if prediction.sequence_id is None else prediction.sequence_id,
+                np.nan if prediction.rssi is None else prediction.rssi,
+                np.nan if prediction.noise_floor is None else prediction.noise_floor,
+                np.nan if prediction.snr is None else prediction.snr,
+                _utc_offset_s(prediction.timestamp),
+            )
+        )
+        self.signal.add(prediction)
 
     def bulk_push(self, predictions: Iterable[PredictionRecord]) -> None:
         for prediction in predictions:
             self.push(prediction)
 
+    def push_batch(self, batch: PredictionBatch) -> None:
+        """Store a columnar batch: one structured array, then one slice copy per device."""
+
+        if not len(batch):
+            return
+        rows = np.empty(len(batch), ROW_DTYPE)
+        rows["timestamp_us"] = batch.timestamp_us()
+        rows["label"] = batch.labels
+        rows["confidence"] = batch.confidence
+        rows["distance_m"] = batch.distance_m
+        rows["latency_ms"] = batch.latency_ms
+        rows["model_version"] = self._model_code(batch.model_version)
+        rows["sequence_id"] = batch.sequence_id
+        rows["rssi"] = batch.rssi
+        rows["noise_floor"] = batch.noise_floor
+        rows["snr"] = batch.snr
+        rows["utc_offset_s"] = [_utc_offset_s(timestamp) for timestamp in batch.timestamps]
+        for mac_address, indices in batch.by_device().items():
+            buffer = self._store.get(mac_address)
+            if buffer is None:
+                buffer = self._store[mac_address] = _DeviceColumns(self._max_size)
+            buffer.extend(rows[indices])
+        self.signal.add_batch(batch)
+
+    def columns(self, mac: str) -> Dict[str, np.ndarray]:
+        """Zero-copy, arrival-ordered column views of one device's buffer.
+
+        Views alias the live buffer: copy them before the next push if they must persist.
+        """
+
+        buffer = self._store.get(mac)
+        rows = buffer.view() if buffer is not None else np.empty(0, ROW_DTYPE)
+        return {name: rows[name] for name in COLUMNS}
+
+    def _records(self, macs: Sequence[str], rows: np.ndarray) -> list[PredictionRecord]:
+        """Rebuild records for ``rows`` (one MAC per row) in a single columnar pass."""
+
+        columns = {name: rows[name].tolist() for name in COLUMNS}
+        versions = self._model_versions
+        # Plain construction: with pydantic-core it is cheaper than ``model_construct``.
+        return [
+            PredictionRecord(
+                mac_address=mac,
+                timestamp=_timestamp(timestamp_us, utc_offset_s),
+                label=LABELS[label],
+                confidence=confidence,
+                distance_m=distance_m,
+                model_version=versions[model_version],
+                latency_ms=latency_ms,
+                sequence_id=None if sequence_id == NO_SEQUENCE else sequence_id,
+                rssi=None if rssi != rssi else rssi,
+                noise_floor=None if noise_floor != noise_floor else noise_floor,
+                snr=None if snr != snr else snr,
+            )
+            for (
+                mac,
+                timestamp_us,
+                label,
+                confidence,
+                distance_m,
+                latency_ms,
+                model_version,
+                sequence_id,
+                rssi,
+                noise_floor,
+                snr,
+                utc_offset_s,
+            ) in zip(macs, *(columns[name] for name in COLUMNS))
+        ]
+
+    def count(self, mac: Optional[str] = None) -> int:
+        if mac:
+            buffer = self._store.get(mac)
+            return len(buffer) if buffer is not None else 0
+        return sum(len(buffer) for buffer in self._store.values())
+
     def latest(self) -> list[PredictionRecord]:
-        return [buffer[-1] for buffer in self._store.values() if buffer]
+        buffers = [(mac, buffer) for mac, buffer in self._store.items() if len(buffer)]
+        if not buffers:
+            return []
+        rows = np.concatenate([buffer.view()[-1:] for _, buffer in buffers])
+        return self._records([mac for mac, _ in buffers], rows)
+
+    def _merge_newest(self, limit: int) -> Tuple[List[str], np.ndarray]:
+        """K-way merge of the per-device windows, stopping after ``limit`` rows.
+
+        Costs O(devices + limit * log(devices)), independent of how much is cached.
+        """
+
+        macs = list(self._store)
+        windows = [self._store[mac].sorted_view() for mac in macs]
+        stamps = [window["timestamp_us"] for window in windows]
+        heap = [
+            (-int(timestamps[-1]), device, len(timestamps) - 1)
+            for device, timestamps in enumerate(stamps)
+            if len(timestamps)
+        ]
+        heapq.heapify(heap)
+        picked: List[Tuple[int, int]] = []
+        while heap and len(picked) < limit:
+            _, device, index = heap[0]
+            picked.append((device, index))
+            if index:
+                heapq.heapreplace(heap, (-int(stamps[device][index - 1]), device, index - 1))
+            else:
+                heapq.heappop(heap)
+        if not picked:
+            return [], np.empty(0, ROW_DTYPE)
+        rows = np.concatenate([windows[device][index : index + 1] for device, index in picked])
+        return [macs[device] for device, _ in picked], rows
+
+    def _all_newest(self) -> Tuple[List[str], np.ndarray]:
+        """Every cached row, newest first.
+
+        The per-device windows are sorted runs, so NumPy's stable sort (timsort/radix)
+        merges them in close to linear time.
+        """
+
+        macs = list(self._store)
+        windows = [self._store[mac].sorted_view() for mac in macs]
+        if not windows:
+            return [], np.empty(0, ROW_DTYPE)
+        rows = np.concatenate(windows)
+        owners = np.repeat(np.arange(len(macs)), [len(window) for window in windows])
+        order = np.argsort(rows["timestamp_us"], kind="stable")[::-1]
+        return [macs[owner] for owner in owners[order].tolist()], rows[order]
+
+    def history(
+        self, mac: Optional[str] = None, limit: Optional[int] = None
+    ) -> list[PredictionRecord]:
+        """One device's buffer oldest-first, or all devices newest-first (up to ``limit``)."""
 
-    def history(self, mac: Optional[str] = None) -> list[PredictionRecord]:
         if mac:
             buffer = self._store.get(mac)
-            return list(buffer) if buffer else []
-        results: list[PredictionRecord] = []
-        for buffer in self._store.values():
-            results.extend(buffer)
-        results.sort(key=lambda record: record.timestamp, reverse=True)
-        return results
+            if buffer is None:
+                return []
+            rows = buffer.view()
+            if limit is not None:
+                rows = rows[max(0, len(rows) - limit) :]
+            return self._records([mac] * len(rows), rows)
+        macs, rows = self._all_newest() if limit is None else self._merge_newest(limit)
+        return self._records(macs, rows)
 
     def reset(self) -> None:
         self._store.clear()
+        self.signal.reset()
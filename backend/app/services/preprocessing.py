@@ -1,18 +1,52 @@
 from __future__ import annotations
 
-from typing import Tuple
+from typing import Dict, List, Sequence, Tuple
 
 import numpy as np
 
 from ..schemas.csi import CSIPacket
 
 
+def _transform(matrix: np.ndarray) -> np.ndarray:
+    """Normalize CSI matrices stacked along the leading axis of ``matrix``.
+
+    ``matrix`` has shape ``(batch, subcarriers, antennas)``; each sample is normalized
+    with its own mean and standard deviation.
+    """
+
+    phase = np.unwrap(np.angle(matrix + 0j), axis=1)
+    spectrum = np.fft.fft(phase, axis=1)
+    magnitude = np.abs(spectrum)
+    mean = magnitude.mean(axis=(1, 2), keepdims=True)
+    std = magnitude.std(axis=(1, 2), keepdims=True)
+    normalized = (magnitude - mean) / (std + 1e-6)
+    return normalized.astype(np.float32)
+
+
 def preprocess_packet(packet: CSIPacket) -> Tuple[np.ndarray, CSIPacket]:
     """Return normalized CSI features ready for inference."""
 
     matrix = np.array(packet.csi, dtype=np.float32)
-    phase = np.unwrap(np.angle(matrix + 0j), axis=0)
-    spectrum = np.fft.fft(phase, axis=0)
-    magnitude = np.abs(spectrum)
-    normalized = (magnitude - magnitude.mean()) / (magnitude.std() + 1e-6)
-    return normalized.astype(np.float32), packet
+    return _transform(matrix[np.newaxis])[0], packet
+
+
+def preprocess_batch(packets: Sequence[CSIPacket]) -> List[Tuple[np.ndarray, CSIPacket]]:
+    """Vectorized ``preprocess_packet`` over a drained batch, preserving packet order.
+
+    Packets are grouped by CSI matrix shape and each group is transformed as a single
+    ``(batch, subcarriers, antennas)`` array.
+    """
+
+    groups: Dict[Tuple[int, ...], List[int]] = {}
+    matrices: List[np.ndarray] = []
+    for index, packet in enumerate(packets):
+        matrix = np.asarray(packet.csi, dtype=np.float32)
+        matrices.append(matrix)
+        groups.setdefault(matrix.shape, []).append(index)
+
+    features: List[np.ndarray] = [np.empty(0, dtype=np.float32)] * len(matrices)
+    for indices in groups.values():
+        stacked = np.stack([matrices[index] for index in indices])
+        for index, normalized in zip(indices, _transform(stacked)):
+            features[index] = normalized
+    return [(feature, packet) for feature, packet in zip(features, packets)]
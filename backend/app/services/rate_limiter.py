@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Optional
+
+# Rates such as 100 Hz -> 10 Hz add 0.1 tokens per frame; allow for float round-off.
+_EPSILON = 1e-9
+
+
+class TokenBucket:
+    """Admit frames at ``rate_hz`` on average with bursts of up to ``burst`` frames.
+
+    Time is the frame's capture timestamp rather than when the worker sees it, so the
+    decimation pattern does not depend on queueing delay: a 100 Hz stream limited to
+    10 Hz keeps exactly every tenth frame. A timestamp that goes backwards (device
+    reboot or clock reset) restarts the bucket.
+    """
+
+    __slots__ = ("rate_hz", "burst", "_tokens", "_last")
+
+    def __init__(self, rate_hz: float, burst: float = 1.0) -> None:
+        self.rate_hz = rate_hz
+        self.burst = max(1.0, burst)
+        self._tokens = self.burst
+        self._last: Optional[datetime] = None
+
+    def admit(self, timestamp: datetime) -> bool:
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        if self._last is not None:
+            # Datetime arithmetic keeps microsecond precision that epoch floats lose.
+            elapsed = (timestamp - self._last).total_seconds()
+            if elapsed < 0:
+                self._tokens = self.burst
+            else:
+                self._tokens = min(self.burst, self._tokens + elapsed * self.rate_hz)
+        self._last = timestamp
+        if self._tokens >= 1.0 - _EPSILON:
+            self._tokens -= 1.0
+            return True
+        return False
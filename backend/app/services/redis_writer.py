@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from typing import Dict, Optional
+
+from redis.asyncio import Redis
+
+from ..core.config import Settings
+from ..core.logging import get_logger
+from .metrics import REDIS_FLUSH_LATENCY, REDIS_KEYS_WRITTEN
+from .prediction_batch import PredictionBatch
+
+logger = get_logger(__name__)
+
+
+def prediction_key(mac_address: str) -> str:
+    return f"prediction:{mac_address}"
+
+
+class RedisPredictionWriter:
+    """Cache the latest prediction per device in Redis with one round trip per flush.
+
+    Predictions are deduplicated to the newest per MAC and written as a single non-transactional
+    pipeline of ``SET key value EX ttl`` commands. In background mode ``write`` only merges
+    records into a pending map and a writer task flushes it, so Redis latency never blocks
+    inference; batches arriving during a flush are coalesced into the next one.
+    """
+
+    def __init__(self, redis: Redis, ttl_seconds: int, background: bool = True) -> None:
+        self._redis = redis
+        self._ttl = ttl_seconds
+        self._background = background
+        self._pending: Dict[str, str] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_settings(cls, redis: Redis, settings: Settings) -> "RedisPredictionWriter":
+        return cls(
+            redis,
+            ttl_seconds=settings.redis_prediction_ttl_seconds,
+            background=settings.redis_background_writes,
+        )
+
+    @staticmethod
+    def latest_by_key(batch: PredictionBatch) -> Dict[str, str]:
+        # Dedupe before serializing so superseded rows are never encoded.
+        return {
+            prediction_key(mac_address): batch.json(indices[-1]).decode()
+            for mac_address, indices in batch.by_device().items()
+        }
+
+    async def write(self, batch: PredictionBatch) -> None:
+        latest = self.latest_by_key(batch)
+        if not latest:
+            return
+        if self._background and self._task is not None:
+            self._pending.update(latest)
+            self._wakeup.set()
+            return
+        await self._flush(latest)
+
+    def start(self) -> None:
+        if self._background and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="redis-prediction-writer")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            with contextlib.suppress(Exception):
+                await self._flush(pending)
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            pending, self._pending = self._pending, {}
+            if not pending:
+                continue
+            try:
+                await self._flush(pending)
+            except Exception:
+                logger.exception("redis_flush_failed", keys=len(pending))
+
+    async def _flush(self, mapping: Dict[str, str]) -> None:
+        start = time.perf_counter()
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key, payload in mapping.items():
+                pipe.set(key, payload, ex=self._ttl)
+            await pipe.execute()
+        REDIS_FLUSH_LATENCY.observe((time.perf_counter() - start) * 1000.0)
+        REDIS_KEYS_WRITTEN.inc(len(mapping))
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import heapq
+from typing import List, Optional, Tuple
+
+from ..schemas.csi import CSIPacket
+
+
+class ReorderBuffer:
+    """Holds one device's early frames until the gap before them fills or times out.
+
+    Frames are keyed by the extended sequence ID from ``SequenceTracker``. A frame that
+    continues the released run goes straight out, together with any held frames it
+    makes contiguous. Otherwise it is held; once more than ``depth`` frames are held,
+    or the lowest held frame has waited ``max_delay_s``, the gap is declared lost and
+    release resumes from the lowest held frame. A frame older than the released run
+    (its slot was already given up) is passed through rather than dropped.
+    """
+
+    __slots__ = ("_depth", "_max_delay_s", "_next", "_held")
+
+    def __init__(self, depth: int, max_delay_s: float) -> None:
+        self._depth = max(0, depth)
+        self._max_delay_s = max_delay_s
+        self._next: Optional[int] = None
+        self._held: List[Tuple[int, float, CSIPacket]] = []
+
+    def __len__(self) -> int:
+        return len(self._held)
+
+    def push(self, extended: int, packet: CSIPacket, now: float) -> Tuple[List[CSIPacket], int]:
+        """Add a frame; returns the frames now releasable, in order, and IDs skipped."""
+
+        if self._next is None or extended == self._next:
+            self._next = extended + 1
+            released = [packet]
+        elif extended < self._next:
+            return [packet], 0
+        else:
+            heapq.heappush(self._held, (extended, now, packet))
+            released = []
+        skipped = self._release(released, now)
+        return released, skipped
+
+    def expire(self, now: float) -> Tuple[List[CSIPacket], int]:
+        """Release frames that waited ``max_delay_s`` for a gap to fill."""
+
+        released: List[CSIPacket] = []
+        return released, self._release(released, now)
+
+    def _release(self, released: List[CSIPacket], now: float) -> int:
+        held = self._held
+        skipped = 0
+        while held:
+            extended, arrival, packet = held[0]
+            if extended != self._next:
+                if len(held) <= self._depth and now - arrival < self._max_delay_s:
+                    break
+                # Give up on the gap; the tracker already counts these IDs as lost.
+                skipped += extended - self._next
+            heapq.heappop(held)
+            released.append(packet)
+            self._next = extended + 1
+        return skipped
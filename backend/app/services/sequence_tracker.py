@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+SEQUENCE_MODULUS = 4096  # firmware sequence_id is a 12-bit counter
+DEFAULT_REORDER_WINDOW = 256
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class SequenceTracker:
+    """Loss, duplicate, reordering and jitter accounting for one device's frames.
+
+    Sequence IDs are unwrapped into a monotonically growing "extended" number, as RTP
+    receivers do. A frame up to ``reorder_window`` IDs behind the highest one seen is
+    a late (reordered) or duplicate frame; anything else is a forward jump, and the
+    skipped IDs count as expected-but-missing until a late frame fills them in.
+    ``expected - received`` is therefore the number of frames lost so far. Which IDs in
+    the window have been seen is one bit each, so duplicate checks cost a shift and a
+    mask whatever the window size.
+
+    Jitter is the RFC 3550 interarrival estimate: the smoothed absolute change in
+    ``arrival - capture timestamp`` between consecutive frames. Constant clock offsets
+    between device and backend cancel out.
+    """
+
+    __slots__ = (
+        "_modulus",
+        "_window",
+        "_mask",
+        "_seen",
+        "_highest",
+        "_last_transit",
+        "received",
+        "expected",
+        "duplicates",
+        "reordered",
+        "jitter_s",
+    )
+
+    def __init__(
+        self, modulus: int = SEQUENCE_MODULUS, reorder_window: int = DEFAULT_REORDER_WINDOW
+    ) -> None:
+        self._modulus = modulus
+        self._window = max(1, min(reorder_window, modulus // 2))
+        self._mask = (1 << self._window) - 1
+        # Bitmap of the window: bit ``k`` is set once extended ID ``highest - k`` was seen.
+        self._seen = 0
+        self._highest: Optional[int] = None
+        self._last_transit: Optional[float] = None
+        self.received = 0
+        self.expected = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.jitter_s = 0.0
+
+    def observe(
+        self,
+        sequence_id: int,
+        timestamp: Optional[datetime] = None,
+        arrival: Optional[float] = None,
+    ) -> Optional[int]:
+        """Account for one frame; returns its extended ID, or ``None`` for a duplicate."""
+
+        sequence_id %= self._modulus
+        if self._highest is None:
+            extended = sequence_id
+            self._highest = extended
+            self._seen = 1
+            self.expected += 1
+        else:
+            forward = (sequence_id - self._highest) % self._modulus
+            if forward and forward <= self._modulus - self._window:
+                extended = self._highest + forward
+                self._highest = extended
+                if forward < self._window:
+                    self._seen = ((self._seen << forward) | 1) & self._mask
+                else:
+                    self._seen = 1
+                self.expected += forward
+            else:
+                behind = (self._modulus - forward) % self._modulus
+                bit = 1 << behind
+                if self._seen & bit:
+                    self.duplicates += 1
+                    return None
+                extended = self._highest - behind
+                self._seen |= bit
+                self.reordered += 1
+        self.received += 1
+        if timestamp is not None:
+            self._update_jitter(timestamp, time.time() if arrival is None else arrival)
+        return extended
+
+    def forget(self, sequence_id: int) -> bool:
+        """Undo ``observe`` for a frame that was never delivered, so a retry is accepted.
+
+        The ID stays expected, so it counts as lost until the retry fills it in (as a
+        reordered frame). Returns ``False`` if the ID already left the window.
+        """
+
+        if self._highest is None:
+            return False
+        behind = (self._highest - sequence_id) % self._modulus
+        bit = 1 << behind
+        if behind >= self._window or not self._seen & bit:
+            return False
+        self._seen &= ~bit
+        self.received -= 1
+        return True
+
+    def _update_jitter(self, timestamp: datetime, arrival: float) -> None:
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        transit = arrival - (timestamp - _EPOCH).total_seconds()
+        if self._last_transit is not None:
+            self.jitter_s += (abs(transit - self._last_transit) - self.jitter_s) / 16.0
+        self._last_transit = transit
+
+    @property
+    def lost(self) -> int:
+        return max(0, self.expected - self.received)
+
+    @property
+    def loss_ratio(self) -> float:
+        return self.lost / self.expected if self.expected else 0.0
+
+    @property
+    def duplicate_ratio(self) -> float:
+        seen = self.received + self.duplicates
+        return self.duplicates / seen if seen else 0.0
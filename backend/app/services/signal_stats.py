@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..schemas.prediction import PredictionRecord
+from ..schemas.signal import SignalOverview
+from .prediction_batch import PredictionBatch
+
+# Quantile points returned as the latency distribution (min to max, ascending).
+LATENCY_POINTS = 50
+
+
+class RunningStats:
+    """Welford running mean/variance; ``merge`` combines two streams (Chan et al.)."""
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def add_values(self, values: np.ndarray) -> None:
+        """Add a batch of values, skipping NaNs (missing readings)."""
+
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        batch = RunningStats()
+        batch.count = len(values)
+        batch.mean = float(values.mean())
+        batch._m2 = float(np.square(values - batch.mean).sum())
+        self.merge(batch)
+
+    def merge(self, other: "RunningStats") -> None:
+        if not other.count:
+            return
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with bounded relative error (DDSketch style).
+
+    Every value lands in bucket ``ceil(log_gamma(value))``, so any reported quantile is
+    within ``relative_accuracy`` of the true value, memory grows with the log of the
+    value range (not the number of samples), and sketches merge by adding counts.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-3) -> None:
+        self._gamma = (1.0 + relative_accuracy) / (1.0 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._min_value = min_value
+        self._buckets: Dict[int, int] = {}
+        self._zero = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.count += count
+        if value <= self._min_value:
+            self._zero += count
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self._buckets[index] = self._buckets.get(index, 0) + count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        self.count += other.count
+        self._zero += other._zero
+        for index, count in other._buckets.items():
+            self._buckets[index] = self._buckets.get(index, 0) + count
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Values at the (ascending) quantiles ``qs`` in one pass over the buckets."""
+
+        qs = list(qs)
+        if not self.count:
+            return [0.0 for _ in qs]
+        results: List[float] = []
+        ranks = iter(q * (self.count - 1) for q in qs)
+        rank = next(ranks)
+        seen = self._zero
+        while seen > rank:
+            results.append(0.0)
+            rank = next(ranks, None)
+            if rank is None:
+                return results
+        for index in sorted(self._buckets):
+            seen += self._buckets[index]
+            # Midpoint of (gamma^(i-1), gamma^i] in relative terms.
+            value = 2.0 * self._gamma**index / (self._gamma + 1.0)
+            while seen > rank:
+                results.append(value)
+                rank = next(ranks, None)
+                if rank is None:
+                    return results
+        last = results[-1] if results else 0.0
+        return results + [last] * (len(qs) - len(results))
+
+    def quantile(self, q: float) -> float:
+        return self.quantiles([q])[0]
+
+
+class _DeviceSignal:
+    __slots__ = (
+        "rssi",
+        "noise_floor",
+        "snr",
+        "latency_sketch",
+    )
+
+    def __init__(self) -> None:
+        self.rssi = RunningStats()
+        self.noise_floor = RunningStats()
+        self.snr = RunningStats()
+        self.latency_sketch = QuantileSketch()
+
+
+class SignalStatistics:
+    """Running signal and latency aggregates, updated as predictions are cached.
+
+    Per-device state is a handful of Welford accumulators and a latency sketch, so a
+    summary costs O(devices) however many predictions were seen.
+    A global latency sketch is kept alongside so the unfiltered summary need not merge
+    per-device sketches.
+    """
+
+    def __init__(self) -> None:
+        self._devices: Dict[str, _DeviceSignal] = {}
+        self._latency_sketch = QuantileSketch()
+
+    def add(self, record: PredictionRecord) -> None:
+        device = self._devices.get(record.mac_address)
+        if device is None:
+            device = self._devices[record.mac_address] = _DeviceSignal()
+        if record.rssi is not None:
+            device.rssi.add(record.rssi)
+        if record.noise_floor is not None:
+            device.noise_floor.add(record.noise_floor)
+        if record.snr is not None:
+            device.snr.add(record.snr)
+        device.latency_sketch.add(record.latency_ms)
+        self._latency_sketch.add(record.latency_ms)
+
+    def add_many(self, records: Iterable[PredictionRecord]) -> None:
+        for record in records:
+            self.add(record)
+
+    def add_batch(self, batch: PredictionBatch) -> None:
+        """Fold a columnar batch in with one update per device and statistic."""
+
+        for mac_address, indices in batch.by_device().items():
+            device = self._devices.get(mac_address)
+            if device is None:
+                device = self._devices[mac_address] = _DeviceSignal()
+            device.rssi.add_values(batch.rssi[indices])
+            device.noise_floor.add_values(batch.noise_floor[indices])
+            device.snr.add_values(batch.snr[indices])
+            # One model run, so every row of the batch shares its latency.
+            device.latency_sketch.add(batch.latency_ms, len(indices))
+        self._latency_sketch.add(batch.latency_ms, len(batch))
+
+    def overview(self, mac_address: Optional[str] = None) -> SignalOverview:
+        """Summary for one device (``mac_address``) or merged across all of them."""
+
+        if mac_address is not None:
+            device = self._devices.get(mac_address)
+            devices = [device] if device is not None else []
+            sketch = device.latency_sketch if device is not None else QuantileSketch()
+        else:
+            devices = list(self._devices.values())
+            sketch = self._latency_sketch
+        rssi, noise_floor, snr = RunningStats(), RunningStats(), RunningStats()
+        for device in devices:
+            rssi.merge(device.rssi)
+            noise_floor.merge(device.noise_floor)
+            snr.merge(device.snr)
+        points = sketch.quantiles(
+            [index / (LATENCY_POINTS - 1) for index in range(LATENCY_POINTS)]
+        )
+        p50, p90, p99 = sketch.quantiles([0.5, 0.9, 0.99])
+        return SignalOverview(
+            average_rssi=rssi.mean,
+            average_noise_floor=noise_floor.mean,
+            average_snr=snr.mean,
+            # Link quality comes from the device registry's sequence trackers.
+            packet_loss_percentage=0.0,
+            inference_latency_ms=points if sketch.count else [],
+            latency_quantiles_ms={"p50": p50, "p90": p90, "p99": p99},
+            rssi_std=rssi.std,
+            snr_std=snr.std,
+        )
+
+    def reset(self) -> None:
+        self._devices.clear()
+        self._latency_sketch = QuantileSketch()
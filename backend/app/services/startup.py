@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Literal
+
+from .metrics import STARTUP_PHASE
+
+StartupStatus = Literal["starting", "ready", "failed"]
+
+
+class StartupReport:
+    """Wall time of each startup phase; the app reports ready once ``finish`` is called.
+
+    Phases are recorded in the order they complete, together with ``total`` (time from
+    construction to ``finish``). Each phase is also exported as ``csi_startup_phase_seconds``.
+    """
+
+    def __init__(self) -> None:
+        self._began = time.perf_counter()
+        self._phases: Dict[str, float] = {}
+        self._status: StartupStatus = "starting"
+
+    @property
+    def status(self) -> StartupStatus:
+        return self._status
+
+    @property
+    def ready(self) -> bool:
+        return self._status == "ready"
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - began)
+
+    def record(self, name: str, seconds: float) -> None:
+        self._phases[name] = seconds
+        STARTUP_PHASE.labels(phase=name).set(seconds)
+
+    def finish(self, failed: bool = False) -> None:
+        self.record("total", time.perf_counter() - self._began)
+        self._status = "failed" if failed else "ready"
+
+    def phases_ms(self) -> Dict[str, float]:
+        return {name: seconds * 1000.0 for name, seconds in self._phases.items()}
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.config import Settings
+from ..schemas.csi import CSIPacket
+
+# Recompute the sliding DFT exactly every ``window * _RESYNC_WINDOWS`` frames so
+# floating point error from the recurrence cannot accumulate without bound.
+_RESYNC_WINDOWS = 64
+
+
+class DeviceWindow:
+    """Preallocated ring buffer of the last ``window`` feature frames for one device.
+
+    Running sums give the windowed mean/variance and a sliding DFT keeps the first
+    ``doppler_bins`` non-DC frequency bins across time, each updated in O(1) per frame
+    (independent of the window length).
+    """
+
+    __slots__ = (
+        "window",
+        "shape",
+        "frames",
+        "head",
+        "count",
+        "total",
+        "total_sq",
+        "spectrum",
+        "twiddle",
+        "pushes",
+        "last_seen",
+    )
+
+    def __init__(self, window: int, shape: Tuple[int, ...], doppler_bins: int) -> None:
+        self.window = window
+        self.shape = shape
+        self.frames = np.zeros((window, *shape), dtype=np.float32)
+        self.head = 0
+        self.count = 0
+        self.total = np.zeros(shape, dtype=np.float64)
+        self.total_sq = np.zeros(shape, dtype=np.float64)
+        self.spectrum = np.zeros((doppler_bins, *shape), dtype=np.complex128)
+        bins = np.arange(1, doppler_bins + 1)
+        twiddle = np.exp(2j * np.pi * bins / window)
+        self.twiddle = twiddle.reshape((doppler_bins,) + (1,) * len(shape))
+        self.pushes = 0
+        self.last_seen = 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return self.frames.nbytes + self.total.nbytes * 2 + self.spectrum.nbytes
+
+    def push(self, frame: np.ndarray, now: float) -> None:
+        oldest = self.frames[self.head]
+        delta = frame.astype(np.float64) - oldest
+        self.total += delta
+        self.total_sq += np.square(frame, dtype=np.float64) - np.square(oldest, dtype=np.float64)
+        self.spectrum = (self.spectrum + delta) * self.twiddle
+
+        self.frames[self.head] = frame
+        self.head = (self.head + 1) % self.window
+        self.count = min(self.count + 1, self.window)
+        self.pushes += 1
+        self.last_seen = now
+        if self.pushes % (self.window * _RESYNC_WINDOWS) == 0:
+            self._resync()
+
+    def features(self) -> np.ndarray:
+        """Return ``[latest, mean, std, |doppler_1..K|]`` stacked as float32 channels."""
+
+        latest = self.frames[(self.head - 1) % self.window]
+        count = max(self.count, 1)
+        mean = self.total / count
+        variance = np.maximum(self.total_sq / count - np.square(mean), 0.0)
+        doppler = np.abs(self.spectrum) / self.window
+        channels = np.empty((3 + len(self.spectrum), *self.shape), dtype=np.float32)
+        channels[0] = latest
+        channels[1] = mean
+        channels[2] = np.sqrt(variance)
+        channels[3:] = doppler
+        return channels
+
+    def _resync(self) -> None:
+        # Chronological order (oldest first, zero-padded before the window fills) matches
+        # the phase convention of the sliding DFT recurrence.
+        ordered = np.roll(self.frames, -self.head, axis=0).astype(np.float64)
+        self.total = ordered.sum(axis=0)
+        self.total_sq = np.square(ordered).sum(axis=0)
+        self.spectrum = np.fft.fft(ordered, axis=0)[1 : len(self.spectrum) + 1]
+
+
+class TemporalFeatureEngine:
+    """Maintain per-device sliding windows and emit windowed feature tensors.
+
+    Memory is bounded by ``max_devices`` (least recently seen devices are evicted first)
+    and windows idle for longer than ``idle_seconds`` are dropped.
+    """
+
+    def __init__(
+        self,
+        window: int,
+        doppler_bins: int = 4,
+        max_devices: int = 1024,
+        idle_seconds: float = 300.0,
+    ) -> None:
+        self._window = window
+        self._doppler_bins = max(0, min(doppler_bins, window - 1))
+        self._max_devices = max_devices
+        self._idle_seconds = idle_seconds
+        self._devices: "OrderedDict[str, DeviceWindow]" = OrderedDict()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> Optional["TemporalFeatureEngine"]:
+        if settings.temporal_window_size <= 1:
+            return None
+        return cls(
+            window=settings.temporal_window_size,
+            doppler_bins=settings.temporal_doppler_bins,
+            max_devices=settings.temporal_max_devices,
+            idle_seconds=settings.temporal_idle_seconds,
+        )
+
+    @property
+    def channels(self) -> int:
+        return 3 + self._doppler_bins
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(window.nbytes for window in self._devices.values())
+
+    def push(
+        self, mac_address: str, frame: np.ndarray, now: Optional[float] = None
+    ) -> DeviceWindow:
+        now = time.monotonic() if now is None else now
+        window = self._devices.get(mac_address)
+        if window is None or window.shape != frame.shape:
+            window = DeviceWindow(self._window, frame.shape, self._doppler_bins)
+            self._devices[mac_address] = window
+        self._devices.move_to_end(mac_address)
+        window.push(frame, now)
+        self._evict(now)
+        return window
+
+    def transform(
+        self,
+        batch: Sequence[Tuple[np.ndarray, CSIPacket]],
+        now: Optional[float] = None,
+        emit: Optional[Sequence[bool]] = None,
+    ) -> List[Tuple[np.ndarray, CSIPacket]]:
+        """Fold each frame into its device window and return windowed features in order.
+
+        With ``emit``, every frame is folded but features are only returned for frames
+        whose flag is set (rate-limited frames still shape the window).
+        """
+
+        now = time.monotonic() if now is None else now
+        if emit is None:
+            return [
+                (self.push(packet.mac_address, frame, now).features(), packet)
+                for frame, packet in batch
+            ]
+        results: List[Tuple[np.ndarray, CSIPacket]] = []
+        for (frame, packet), keep in zip(batch, emit):
+            window = self.push(packet.mac_address, frame, now)
+            if keep:
+                results.append((window.features(), packet))
+        return results
+
+    def evict(self, mac_address: str) -> None:
+        self._devices.pop(mac_address, None)
+
+    def _evict(self, now: float) -> None:
+        while len(self._devices) > self._max_devices:
+            self._devices.popitem(last=False)
+        cutoff = now - self._idle_seconds
+        while self._devices:
+            oldest = next(iter(self._devices.values()))
+            if oldest.last_seen >= cutoff:
+                break
+            self._devices.popitem(last=False)
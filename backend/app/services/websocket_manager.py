@@ -1,40 +1,307 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from typing import Any, Set
+import contextlib
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, Literal, Optional, Set
 
+import orjson
 from fastapi import WebSocket
 
+from ..core.config import Settings
+from ..schemas.stream import StreamSubscription
+from .metrics import WEBSOCKET_CLIENTS, WEBSOCKET_DROPPED_FRAMES
+from .prediction_batch import PredictionBatch
+
+SlowClientPolicy = Literal["drop_oldest", "conflate", "disconnect"]
+SerializedRecord = tuple[str, bytes]
+
+
+@dataclass
+class _Frame:
+    """A serialized message plus the per-device records it carries (for conflation)."""
+
+    payload: str
+    records: List[SerializedRecord] = field(default_factory=list)
+
+
+def _encode_records(records: Iterable[SerializedRecord]) -> str:
+    body = b",".join(serialized for _, serialized in records)
+    return (b'{"type":"predictions","items":[' + body + b"]}").decode("utf-8")
+
+
+class _ClientChannel:
+    """Bounded per-client send queue drained by an independent writer task.
+
+    Rate-limited clients do not queue frames at all: matching records are merged into a
+    newest-per-device map that the writer flushes at most ``max_rate_hz`` times a second.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        max_pending: int,
+        policy: SlowClientPolicy,
+        subscription: StreamSubscription,
+    ) -> None:
+        self.websocket = websocket
+        self._max_pending = max(1, max_pending)
+        self._policy = policy
+        self._pending: Deque[_Frame] = deque()
+        self._control: Deque[str] = deque()
+        self._latest: Dict[str, bytes] = {}
+        self._next_send_at = 0.0
+        self._wakeup = asyncio.Event()
+        self.closed = False
+        self.task: Optional[asyncio.Task] = None
+        self.apply(subscription)
+
+    def apply(self, subscription: StreamSubscription) -> None:
+        self.subscription = subscription
+        self.macs: Optional[FrozenSet[str]] = (
+            frozenset(subscription.mac_addresses) if subscription.mac_addresses else None
+        )
+        self._labels = frozenset(subscription.labels) if subscription.labels is not None else None
+        self._min_confidence = subscription.min_confidence
+        self._interval = 1.0 / subscription.max_rate_hz if subscription.max_rate_hz else 0.0
+        self.unfiltered = subscription.is_unfiltered
+
+    def accepts(self, label: str, confidence: float) -> bool:
+        """Label/confidence check; device filtering is done by the manager's index."""
+
+        if self._labels is not None and label not in self._labels:
+            return False
+        return confidence >= self._min_confidence
+
+    def offer(self, frame: _Frame) -> None:
+        if self.closed:
+            return
+        if self._interval and frame.records:
+            self._merge_latest(frame.records)
+            return
+        if len(self._pending) >= self._max_pending:
+            if self._policy == "disconnect":
+                WEBSOCKET_DROPPED_FRAMES.labels(policy=self._policy).inc(len(self._pending) + 1)
+                self.close()
+                return
+            if self._policy == "conflate":
+                self._conflate(frame)
+                self._wakeup.set()
+                return
+            self._pending.popleft()
+            WEBSOCKET_DROPPED_FRAMES.labels(policy=self._policy).inc()
+        self._pending.append(frame)
+        self._wakeup.set()
+
+    def offer_records(self, records: List[SerializedRecord]) -> None:
+        if self._interval:
+            if not self.closed:
+                self._merge_latest(records)
+            return
+        self.offer(_Frame(payload=_encode_records(records), records=records))
+
+    def offer_control(self, payload: str) -> None:
+        if not self.closed:
+            self._control.append(payload)
+            self._wakeup.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self._wakeup.set()
+
+    def _merge_latest(self, records: Iterable[SerializedRecord]) -> None:
+        superseded = 0
+        for mac_address, serialized in records:
+            if self._latest.pop(mac_address, None) is not None:
+                superseded += 1
+            self._latest[mac_address] = serialized
+        if superseded:
+            WEBSOCKET_DROPPED_FRAMES.labels(policy="rate_limit").inc(superseded)
+        self._wakeup.set()
+
+    def _conflate(self, frame: _Frame) -> None:
+        # Collapse everything pending into one frame holding the newest record per device.
+        latest: Dict[str, bytes] = {}
+        passthrough: List[_Frame] = []
+        merged = 0
+        for pending in (*self._pending, frame):
+            if not pending.records:
+                passthrough.append(pending)
+                continue
+            merged += len(pending.records)
+            for mac_address, serialized in pending.records:
+                latest.pop(mac_address, None)
+                latest[mac_address] = serialized
+        WEBSOCKET_DROPPED_FRAMES.labels(policy=self._policy).inc(merged - len(latest))
+        records = list(latest.items())
+        self._pending = deque(passthrough[-(self._max_pending - 1) :])
+        self._pending.append(_Frame(payload=_encode_records(records), records=records))
+
+    async def run(self) -> None:
+        while not self.closed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while not self.closed and (self._control or self._pending or self._latest):
+                if self._control:
+                    payload = self._control.popleft()
+                elif self._pending:
+                    payload = self._pending.popleft().payload
+                else:
+                    delay = self._next_send_at - time.monotonic()
+                    if delay > 0:
+                        # Records keep merging into ``_latest`` while we wait.
+                        await asyncio.sleep(delay)
+                        continue
+                    payload = _encode_records(self._latest.items())
+                    self._latest.clear()
+                    self._next_send_at = time.monotonic() + self._interval
+                await self.websocket.send_text(payload)
+
 
 class WebSocketManager:
-    """Track active websocket connections and broadcast payloads."""
+    """Track active websocket connections and fan payloads out through per-client queues.
+
+    Broadcasting never awaits a client: each message is serialized once and handed to
+    every matching client's bounded queue, and a writer task per client performs the
+    sends. Prediction records are routed through a subscription index (clients keyed by
+    the MACs they watch, plus clients watching every device) so a record is serialized
+    only if some client wants it. Slow clients are handled according to ``policy`` once
+    their queue is full.
+    """
 
-    def __init__(self) -> None:
-        self._clients: Set[WebSocket] = set()
+    def __init__(self, max_pending: int = 32, policy: SlowClientPolicy = "conflate") -> None:
+        self._clients: Dict[WebSocket, _ClientChannel] = {}
+        self._by_mac: Dict[str, Set[_ClientChannel]] = {}
+        self._all_devices: Set[_ClientChannel] = set()
         self._lock = asyncio.Lock()
+        self._max_pending = max_pending
+        self._policy = policy
 
-    async def connect(self, websocket: WebSocket) -> None:
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "WebSocketManager":
+        return cls(
+            max_pending=settings.websocket_send_queue_size,
+            policy=settings.websocket_slow_client_policy,
+        )
+
+    async def connect(
+        self, websocket: WebSocket, subscription: Optional[StreamSubscription] = None
+    ) -> None:
         await websocket.accept()
+        channel = _ClientChannel(
+            websocket, self._max_pending, self._policy, subscription or StreamSubscription()
+        )
+        channel.task = asyncio.create_task(self._write(channel))
+        async with self._lock:
+            self._clients[websocket] = channel
+            self._index(channel)
+            WEBSOCKET_CLIENTS.set(len(self._clients))
+
+    async def subscribe(self, websocket: WebSocket, subscription: StreamSubscription) -> bool:
+        """Replace a connected client's filters; returns False if it is not connected."""
+
         async with self._lock:
-            self._clients.add(websocket)
+            channel = self._clients.get(websocket)
+            if channel is None:
+                return False
+            self._unindex(channel)
+            channel.apply(subscription)
+            self._index(channel)
+        return True
 
     async def disconnect(self, websocket: WebSocket) -> None:
         async with self._lock:
-            self._clients.discard(websocket)
+            channel = self._clients.pop(websocket, None)
+            if channel is not None:
+                self._unindex(channel)
+            WEBSOCKET_CLIENTS.set(len(self._clients))
+        if channel is not None:
+            channel.close()
+            if channel.task is not None and channel.task is not asyncio.current_task():
+                channel.task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await channel.task
 
     async def broadcast(self, message: Any) -> None:
-        payload = json.dumps(message, default=str)
-        async with self._lock:
-            stale: Set[WebSocket] = set()
-            for client in self._clients:
-                try:
-                    await client.send_text(payload)
-                except Exception:  # pragma: no cover - best effort cleanup
-                    stale.add(client)
-            for client in stale:
-                self._clients.discard(client)
+        frame = _Frame(payload=orjson.dumps(message, default=str).decode("utf-8"))
+        for channel in list(self._clients.values()):
+            channel.offer(frame)
+
+    async def broadcast_batch(self, batch: PredictionBatch) -> None:
+        """Route one pipeline batch to subscribers as ``{"type": "predictions", ...}`` frames.
+
+        Clients without filters share a single frame for the whole batch; filtered clients
+        get a frame assembled from the already-serialized rows they match. Rows are
+        serialized straight from the batch columns, without building records.
+        """
+
+        if not self._clients or not len(batch):
+            return
+        macs = batch.mac_addresses
+        serialized: List[Optional[SerializedRecord]] = [None] * len(batch)
+
+        def encode(index: int) -> SerializedRecord:
+            item = serialized[index]
+            if item is None:
+                item = serialized[index] = (macs[index], batch.json(index))
+            return item
+
+        unfiltered = [channel for channel in self._all_devices if channel.unfiltered]
+        filtered_all = [channel for channel in self._all_devices if not channel.unfiltered]
+        if unfiltered:
+            everything = [encode(index) for index in range(len(batch))]
+            frame = _Frame(payload=_encode_records(everything), records=everything)
+            for channel in unfiltered:
+                channel.offer(frame)
+
+        if not filtered_all and not self._by_mac:
+            return
+        matched: Dict[_ClientChannel, List[SerializedRecord]] = {}
+        labels, confidences = batch.label_names(), batch.confidence.tolist()
+        for index, (mac_address, label, confidence) in enumerate(zip(macs, labels, confidences)):
+            watchers = self._by_mac.get(mac_address, ())
+            for channel in chain(watchers, filtered_all):
+                if channel.accepts(label, confidence):
+                    matched.setdefault(channel, []).append(encode(index))
+        for channel, items in matched.items():
+            channel.offer_records(items)
+
+    async def send_control(self, websocket: WebSocket, message: Any) -> None:
+        """Queue a control message (e.g. ping) ahead of pending prediction frames."""
+
+        channel = self._clients.get(websocket)
+        if channel is not None:
+            channel.offer_control(orjson.dumps(message).decode("utf-8"))
 
     async def count(self) -> int:
         async with self._lock:
             return len(self._clients)
+
+    def _index(self, channel: _ClientChannel) -> None:
+        if channel.macs is None:
+            self._all_devices.add(channel)
+            return
+        for mac_address in channel.macs:
+            self._by_mac.setdefault(mac_address, set()).add(channel)
+
+    def _unindex(self, channel: _ClientChannel) -> None:
+        self._all_devices.discard(channel)
+        for mac_address in channel.macs or ():
+            watchers = self._by_mac.get(mac_address)
+            if watchers is not None:
+                watchers.discard(channel)
+                if not watchers:
+                    del self._by_mac[mac_address]
+
+    async def _write(self, channel: _ClientChannel) -> None:
+        try:
+            await channel.run()
+        except Exception:  # pragma: no cover - best effort cleanup
+            pass
+        if channel.closed:
+            with contextlib.suppress(Exception):
+                await channel.websocket.close()
+        await self.disconnect(channel.websocket)
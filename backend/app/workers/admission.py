@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Literal, Optional
+
+from ..services.metrics import SHED_FRAMES
+from .batcher import QueuedPacket
+
+ShedPolicy = Literal["reject", "drop_oldest", "decimate"]
+
+# Weight given to the newest per-frame service time sample.
+_EWMA_ALPHA = 0.2
+
+
+class FairShareQueue(asyncio.Queue):
+    """Inference shard queue with per-device fair dequeueing and delay-based admission.
+
+    Frames are kept in one FIFO per MAC address and dequeued round-robin across
+    devices, so a chatty receiver only delays itself. The queue counts as overloaded
+    when it is full or when a new frame's estimated wait (``queued x seconds per
+    frame``, fed back from completed batches) would exceed ``max_delay_s``. Shedding
+    then targets a device at or over its fair share of that capacity (the incoming
+    device if it is, otherwise the one with the longest backlog), according to
+    ``policy``:
+
+    - ``reject``: refuse the incoming frame if its device is over its share (HTTP 429),
+      otherwise drop the heaviest device's oldest frame to make room.
+    - ``drop_oldest``: drop the target device's oldest queued frame.
+    - ``decimate``: drop every other queued frame of the target device, halving its
+      backlog while keeping its newest frame and even time coverage.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        policy: ShedPolicy = "reject",
+        max_delay_s: float = 0.0,
+        on_shed: Optional[Callable[[str, int], None]] = None,
+    ) -> None:
+        self._policy = policy
+        self._max_delay_s = max_delay_s
+        self._on_shed = on_shed
+        self._seconds_per_frame = 0.0
+        super().__init__(maxsize)
+
+    # asyncio.Queue storage hooks, as used by PriorityQueue/LifoQueue. ``_queue`` must be
+    # falsy exactly when the queue is empty; empty per-device backlogs are removed.
+    def _init(self, maxsize: int) -> None:
+        self._devices: "OrderedDict[str, Deque[QueuedPacket]]" = OrderedDict()
+        self._queue = self._devices
+        self._size = 0
+
+    def qsize(self) -> int:
+        return self._size
+
+    def _put(self, item: QueuedPacket) -> None:
+        mac_address = item[1].mac_address
+        backlog = self._devices.get(mac_address)
+        if backlog is None:
+            backlog = self._devices[mac_address] = deque()
+        backlog.append(item)
+        self._size += 1
+
+    def _get(self) -> QueuedPacket:
+        mac_address, backlog = next(iter(self._devices.items()))
+        item = backlog.popleft()
+        if backlog:
+            self._devices.move_to_end(mac_address)
+        else:
+            del self._devices[mac_address]
+        self._size -= 1
+        return item
+
+    @property
+    def policy(self) -> ShedPolicy:
+        return self._policy
+
+    def estimated_delay(self) -> float:
+        """Seconds a frame enqueued now is expected to wait before inference."""
+
+        return self._size * self._seconds_per_frame
+
+    def observe_service(self, frames: int, seconds: float) -> None:
+        """Feed back the wall time of a completed batch of ``frames``."""
+
+        if frames <= 0:
+            return
+        sample = seconds / frames
+        if self._seconds_per_frame == 0.0:
+            self._seconds_per_frame = sample
+        else:
+            self._seconds_per_frame += _EWMA_ALPHA * (sample - self._seconds_per_frame)
+
+    def put_nowait(self, item: QueuedPacket) -> None:
+        while self._size and self._overloaded():
+            self._shed(item[1].mac_address)
+        super().put_nowait(item)
+
+    def _capacity(self) -> int:
+        capacity = self.maxsize if self.maxsize > 0 else self._size + 1
+        if self._max_delay_s > 0 and self._seconds_per_frame > 0:
+            capacity = min(capacity, int(self._max_delay_s / self._seconds_per_frame))
+        return max(1, capacity)
+
+    def _overloaded(self) -> bool:
+        return self._size + 1 > self._capacity()
+
+    def _shed(self, mac_address: str) -> None:
+        devices = len(self._devices) + (mac_address not in self._devices)
+        fair_share = max(1, self._capacity() // devices)
+        own = self._devices.get(mac_address)
+        if own is not None and len(own) >= fair_share:
+            victim = mac_address
+        else:
+            victim = max(self._devices, key=lambda mac: len(self._devices[mac]))
+        if self._policy == "reject" and victim == mac_address:
+            self._count_shed(mac_address, 1)
+            raise asyncio.QueueFull
+
+        backlog = self._devices[victim]
+        if self._policy == "decimate" and len(backlog) > 1:
+            # Keep the newest frame and every second one before it.
+            kept = deque(item for index, item in enumerate(reversed(backlog)) if index % 2 == 0)
+            kept.reverse()
+            dropped = len(backlog) - len(kept)
+            self._devices[victim] = kept
+        else:
+            backlog.popleft()
+            dropped = 1
+            if not backlog:
+                del self._devices[victim]
+        self._size -= dropped
+        self._count_shed(victim, dropped)
+
+    def _count_shed(self, mac_address: str, frames: int) -> None:
+        SHED_FRAMES.labels(policy=self._policy).inc(frames)
+        if self._on_shed is not None:
+            self._on_shed(mac_address, frames)
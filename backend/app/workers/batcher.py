@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from typing import Optional
+
+from ..core.config import Settings
+from ..schemas.csi import CSIPacket
+from ..services.metrics import BATCH_SIZE, BATCH_TARGET_SIZE, QUEUE_DELAY
+
+QueuedPacket = tuple[float, CSIPacket]
+
+# Weight given to the newest sample in the arrival-rate and inference-time averages.
+_EWMA_ALPHA = 0.2
+
+
+class AdaptiveBatcher:
+    """Collect queued packets into batches flushed when full or at a latency deadline.
+
+    The deadline is measured from the moment the first packet of the batch was enqueued.
+    With adaptive sizing enabled the target batch size tracks the number of packets
+    expected to arrive while one batch waits and runs
+    (``arrival rate x (max delay + inference time)``), so light traffic is flushed as soon
+    as the expected packets are in instead of idling until the deadline.
+    """
+
+    def __init__(
+        self,
+        queue: asyncio.Queue[QueuedPacket],
+        max_batch_size: int,
+        max_delay: float,
+        min_batch_size: int = 1,
+        adaptive: bool = True,
+        idle_timeout: Optional[float] = None,
+        name: str = "0",
+    ) -> None:
+        self._queue = queue
+        self._max_batch_size = max(1, max_batch_size)
+        self._min_batch_size = max(1, min(min_batch_size, self._max_batch_size))
+        self._max_delay = max_delay
+        self._adaptive = adaptive
+        self._idle_timeout = idle_timeout
+        self._name = name
+        self._arrival_rate = 0.0
+        self._inference_seconds = 0.0
+        self._last_enqueued_at: Optional[float] = None
+        self._target = self._max_batch_size if not adaptive else self._min_batch_size
+        BATCH_TARGET_SIZE.labels(worker=name).set(self._target)
+
+    @classmethod
+    def from_settings(
+        cls, queue: asyncio.Queue[QueuedPacket], settings: Settings, name: str = "0"
+    ) -> "AdaptiveBatcher":
+        return cls(
+            queue,
+            max_batch_size=settings.inference_batch_size,
+            max_delay=settings.inference_max_batch_delay_ms / 1000.0,
+            min_batch_size=settings.inference_min_batch_size,
+            adaptive=settings.inference_adaptive_batching,
+            idle_timeout=settings.inference_poll_timeout_ms / 1000.0,
+            name=name,
+        )
+
+    @property
+    def target_size(self) -> int:
+        return self._target
+
+    async def next_batch(self) -> list[CSIPacket]:
+        """Return the next batch, or an empty list if nothing arrived within the idle timeout."""
+
+        try:
+            first = await asyncio.wait_for(self._queue.get(), self._idle_timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        # Never hold already-queued packets back because the target is small.
+        limit = min(self._max_batch_size, max(self._target, 1 + self._queue.qsize()))
+        items = [first]
+        deadline = first[0] + self._max_delay
+        while len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        now = time.monotonic()
+        queue_delay = QUEUE_DELAY.labels(worker=self._name)
+        for enqueued_at, _ in items:
+            queue_delay.observe((now - enqueued_at) * 1000.0)
+        BATCH_SIZE.labels(worker=self._name).observe(len(items))
+        self._observe_arrivals(items)
+        return [packet for _, packet in items]
+
+    def observe_inference(self, batch_size: int, seconds: float) -> None:
+        """Feed back the wall time of a completed batch to size future batches."""
+
+        if batch_size <= 0:
+            return
+        self._inference_seconds = _ewma(self._inference_seconds, seconds)
+        self._retarget()
+
+    def _observe_arrivals(self, items: list[QueuedPacket]) -> None:
+        newest = items[-1][0]
+        if self._last_enqueued_at is not None and newest > self._last_enqueued_at:
+            rate = len(items) / (newest - self._last_enqueued_at)
+            self._arrival_rate = _ewma(self._arrival_rate, rate)
+        self._last_enqueued_at = newest
+        self._retarget()
+
+    def _retarget(self) -> None:
+        if not self._adaptive:
+            return
+        expected = self._arrival_rate * (self._max_delay + self._inference_seconds)
+        target = min(self._max_batch_size, max(self._min_batch_size, math.ceil(expected)))
+        if target != self._target:
+            self._target = target
+            BATCH_TARGET_SIZE.labels(worker=self._name).set(target)
+
+
+def _ewma(current: float, sample: float) -> float:
+    if current == 0.0:
+        return sample
+    return (1.0 - _EWMA_ALPHA) * current + _EWMA_ALPHA * sample
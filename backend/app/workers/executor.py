@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import random
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Literal, NamedTuple, Optional, Sequence
+
+from ..core.config import Settings
+from ..schemas.csi import CSIPacket
+from ..services import preprocessing
+from ..services.inference_engine import InferenceEngine, batch_buckets
+from ..services.prediction_batch import PredictionBatch
+from ..services.temporal_features import TemporalFeatureEngine
+
+ExecutionMode = Literal["inline", "thread", "process"]
+ModelRole = Literal["live", "shadow"]
+
+# How often a process-mode executor checks whether its worker finished loading a model.
+_LOAD_POLL_S = 0.05
+
+
+@dataclass
+class ShadowSample:
+    """Live and shadow model results for one batch run through both."""
+
+    version: str
+    frames: int
+    agreed: int
+    live_ms: float
+    shadow_ms: float
+
+
+class BatchResult(NamedTuple):
+    predictions: PredictionBatch
+    seconds: float
+    shadow: Optional[ShadowSample] = None
+
+
+@dataclass
+class WorkerState:
+    """Model and per-device temporal state owned by one inference worker.
+
+    ``engine`` and ``shadow`` are replaced whole by ``install_engine`` and
+    ``promote_shadow``; a batch reads them once, so swaps take effect between batches.
+    """
+
+    engine: InferenceEngine
+    temporal: Optional[TemporalFeatureEngine] = None
+    shadow: Optional[InferenceEngine] = None
+    shadow_fraction: float = 0.0
+    warmup_runs: int = 3
+    # Seconds spent importing torch and loading the model when this state was built.
+    load_timings: Dict[str, float] = field(default_factory=dict)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "WorkerState":
+        temporal = TemporalFeatureEngine.from_settings(settings)
+        # Temporal features stack their channels ahead of each CSI frame.
+        prefix = (temporal.channels,) if temporal is not None else ()
+        return cls(
+            engine=InferenceEngine(
+                settings.model_artifact_path,
+                settings.model_version,
+                optimize=settings.model_optimize_for_inference,
+                batch_sizes=batch_buckets(settings.inference_batch_size),
+                frame_shapes=[(*prefix, *shape) for shape in settings.inference_csi_shapes],
+                backend=settings.model_backend,
+                num_threads=settings.inference_torch_threads,
+            ),
+            temporal=temporal,
+            shadow_fraction=settings.model_shadow_fraction,
+            warmup_runs=settings.inference_warmup_runs,
+        )
+
+
+# State owned by a process-pool worker; populated by ``_init_process_worker``.
+_process_state: Optional[WorkerState] = None
+# Background model load running inside a process-pool worker.
+_process_loader: Optional[ThreadPoolExecutor] = None
+_process_load: Optional["Future[InferenceEngine]"] = None
+
+
+def configure_torch_threads(num_threads: Optional[int]) -> None:
+    if num_threads:
+        import torch
+
+        torch.set_num_threads(num_threads)
+
+
+def build_worker_state(settings: Settings) -> WorkerState:
+    began = time.perf_counter()
+    import torch  # noqa: F401  (timed separately from the model load)
+
+    imported = time.perf_counter()
+    configure_torch_threads(settings.inference_torch_threads)
+    state = WorkerState.from_settings(settings)
+    state.load_timings = {
+        "torch_import": imported - began,
+        "model_load": time.perf_counter() - imported,
+    }
+    return state
+
+
+def infer_packets(
+    state: WorkerState, packets: Sequence[CSIPacket], infer: Optional[Sequence[bool]] = None
+) -> BatchResult:
+    """Preprocess and run one batch, returning its predictions and elapsed seconds.
+
+    With ``infer``, only flagged packets are run through the model; the rest are only
+    folded into their device's temporal window. Predictions follow the flagged packets.
+    """
+
+    start = time.perf_counter()
+    engine, shadow = state.engine, state.shadow
+    features = preprocessing.preprocess_batch(packets)
+    if state.temporal is not None:
+        features = state.temporal.transform(features, emit=infer)
+    elif infer is not None:
+        features = [item for item, keep in zip(features, infer) if keep]
+    predictions = engine.run_batch(features)
+    sample = None
+    if (
+        shadow is not None
+        and shadow is not engine
+        and len(predictions)
+        and random.random() < state.shadow_fraction
+    ):
+        sample = _compare_shadow(shadow, features, predictions)
+    return BatchResult(predictions, time.perf_counter() - start, sample)
+
+
+def _compare_shadow(
+    shadow: InferenceEngine, features: list, live: PredictionBatch
+) -> ShadowSample:
+    candidate = shadow.run_batch(features)
+    return ShadowSample(
+        version=shadow.model_version,
+        frames=len(candidate),
+        agreed=int((live.labels == candidate.labels).sum()),
+        live_ms=live.latency_ms,
+        shadow_ms=candidate.latency_ms,
+    )
+
+
+def load_engine(state: WorkerState, path: Path, version: str) -> InferenceEngine:
+    """Load a model artifact configured like ``state``'s engine and warm it up.
+
+    Only reads ``state``, so it may run beside the thread serving batches.
+    """
+
+    engine = state.engine.with_artifact(path, version)
+    if not engine.has_model:
+        raise FileNotFoundError(f"model artifact not found: {path}")
+    engine.warm_up(state.warmup_runs)
+    return engine
+
+
+def warm_up(state: WorkerState) -> None:
+    """Run the live model over every input bucket so first batches skip JIT profiling."""
+
+    state.engine.warm_up(state.warmup_runs)
+
+
+def _load_timings(state: WorkerState) -> Dict[str, float]:
+    return dict(state.load_timings)
+
+
+def install_engine(state: WorkerState, engine: Optional[InferenceEngine], role: ModelRole) -> None:
+    if role == "live":
+        assert engine is not None
+        state.engine = engine
+    else:
+        state.shadow = engine
+
+
+def promote_shadow(state: WorkerState) -> None:
+    if state.shadow is not None:
+        state.engine = state.shadow
+        state.shadow = None
+
+
+def _init_process_worker(settings: Settings) -> None:
+    global _process_state
+    _process_state = build_worker_state(settings)
+
+
+def _infer_in_process(
+    packets: Sequence[CSIPacket], infer: Optional[Sequence[bool]] = None
+) -> BatchResult:
+    assert _process_state is not None, "process worker was not initialized"
+    return infer_packets(_process_state, packets, infer)
+
+
+def _with_process_state(func: Callable[..., Any], *args: Any) -> Any:
+    assert _process_state is not None, "process worker was not initialized"
+    return func(_process_state, *args)
+
+
+def _begin_load(state: WorkerState, path: Path, version: str) -> None:
+    # Loading runs on a side thread so the worker keeps serving batches meanwhile.
+    global _process_loader, _process_load
+    if _process_loader is None:
+        _process_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-load")
+    _process_load = _process_loader.submit(load_engine, state, path, version)
+
+
+def _install_loaded(state: WorkerState, role: ModelRole) -> bool:
+    """Install the model loaded by ``_begin_load`` once ready; False while still loading."""
+
+    global _process_load
+    if _process_load is None or not _process_load.done():
+        return _process_load is None
+    load, _process_load = _process_load, None
+    install_engine(state, load.result(), role)
+    return True
+
+
+class InferenceExecutor:
+    """Run preprocessing + inference inline, on a worker thread, or in a worker process.
+
+    Each executor owns a single worker so batches complete in submission order (which
+    also keeps per-device temporal windows consistent); the pipeline bounds how many
+    submitted batches may be outstanding at once.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._mode: ExecutionMode = settings.inference_execution_mode
+        self._state: Optional[WorkerState] = None
+        self._state_lock = threading.Lock()
+        self._pool: Optional[Executor] = None
+        if self._mode == "process":
+            self._pool = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process_worker,
+                initargs=(settings,),
+            )
+        elif self._mode == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "InferenceExecutor":
+        return cls(settings)
+
+    @property
+    def mode(self) -> ExecutionMode:
+        return self._mode
+
+    def _worker_state(self) -> WorkerState:
+        # Built on first use by the worker itself (or the loop in inline mode), like the
+        # process-mode initializer, so constructing an executor never loads a model.
+        if self._state is None:
+            with self._state_lock:
+                if self._state is None:
+                    self._state = build_worker_state(self._settings)
+        return self._state
+
+    async def _loaded(self) -> Dict[str, float]:
+        if self._mode == "inline":
+            await asyncio.to_thread(self._worker_state)
+        return await self._call(_load_timings)
+
+    def _with_state(self, func: Callable[..., Any], *args: Any) -> Any:
+        return func(self._worker_state(), *args)
+
+    def submit(
+        self, packets: Sequence[CSIPacket], infer: Optional[Sequence[bool]] = None
+    ) -> "asyncio.Future[BatchResult]":
+        """Schedule a batch and return a future resolving to ``(predictions, seconds, shadow)``.
+
+        In inline mode the batch runs immediately on the calling (event loop) thread.
+        See ``infer_packets`` for ``infer``.
+        """
+
+        loop = asyncio.get_running_loop()
+        if self._pool is None:
+            future: asyncio.Future[BatchResult] = loop.create_future()
+            try:
+                future.set_result(infer_packets(self._worker_state(), packets, infer))
+            except Exception as exc:
+                future.set_exception(exc)
+            return future
+        if self._mode == "process":
+            return loop.run_in_executor(self._pool, _infer_in_process, list(packets), infer)
+        return loop.run_in_executor(
+            self._pool, self._with_state, infer_packets, list(packets), infer
+        )
+
+    async def start(self, warmup: bool = True) -> Dict[str, float]:
+        """Load the model on the worker and warm it up; returns seconds per phase.
+
+        Phases are ``torch_import``, ``model_load``, ``warmup`` and, in process mode,
+        ``worker_start``. Neither phase runs on the event loop. Batches should only be
+        submitted once this returns: in inline mode ``submit`` would otherwise build the
+        model on the loop.
+        """
+
+        began = time.perf_counter()
+        timings = await self._loaded()
+        if self._mode == "process":
+            # Spawning the worker and importing the app there.
+            waited = time.perf_counter() - began
+            timings["worker_start"] = max(0.0, waited - sum(timings.values()))
+        if warmup:
+            began = time.perf_counter()
+            if self._mode == "inline":
+                # No batch runs before ``start`` returns, so the buffers are not shared.
+                await asyncio.to_thread(warm_up, self._worker_state())
+            else:
+                await self._call(warm_up)
+            timings["warmup"] = time.perf_counter() - began
+        return timings
+
+    async def load_model(self, path: Path, version: str, role: ModelRole = "live") -> None:
+        """Load and warm ``path`` beside the worker, then install it as the live or shadow model.
+
+        Batches keep running on the current model while the artifact loads; the swap
+        itself is a reference assignment that takes effect at the next batch. Raises if
+        the artifact cannot be loaded, leaving the current models in place.
+        """
+
+        if self._mode == "process":
+            await self._call(_begin_load, path, version)
+            while not await self._call(_install_loaded, role):
+                await asyncio.sleep(_LOAD_POLL_S)
+            return
+        await self._loaded()
+        engine = await asyncio.to_thread(load_engine, self._worker_state(), path, version)
+        await self._call(install_engine, engine, role)
+
+    async def promote_shadow(self) -> None:
+        """Make the shadow model live, dropping the previous live model."""
+
+        await self._call(promote_shadow)
+
+    async def discard_shadow(self) -> None:
+        await self._call(install_engine, None, "shadow")
+
+    async def _call(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(state, *args)`` on the worker, between batches."""
+
+        if self._mode == "inline":
+            if self._state is None:
+                # Never build the model on the loop (e.g. a promote request during startup).
+                await asyncio.to_thread(self._worker_state)
+            return func(self._worker_state(), *args)
+        loop = asyncio.get_running_loop()
+        if self._mode == "process":
+            return await loop.run_in_executor(self._pool, _with_process_state, func, *args)
+        return await loop.run_in_executor(self._pool, self._with_state, func, *args)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from ..core.config import Settings
+from ..core.logging import get_logger
+from ..schemas.model import ModelInfo, ModelRegistryStatus, ShadowStats
+from ..services.inference_backends import backend_suffix
+from ..services.metrics import MODEL_RELOADS, SHADOW_AGREED, SHADOW_FRAMES, SHADOW_LATENCY
+from .executor import InferenceExecutor, ShadowSample
+
+logger = get_logger(__name__)
+
+# Artifacts modified more recently than this may still be being written.
+_SETTLE_S = 1.0
+
+ArtifactKey = Tuple[str, float]
+
+
+class ModelRegistry:
+    """Watch a directory of model artifacts and hot-swap the model without restarts.
+
+    The newest file in ``directory`` (by modification time) ending in ``suffix``, the
+    inference backend's artifact type, is the candidate; its file stem is the model
+    version. A new candidate is loaded and warmed up beside every inference worker
+    (batches keep flowing on the current model), then installed on all of them. A
+    worker swaps models between batches, so the queue is never drained or dropped.
+    Copy artifacts in under a temporary name and rename them into place.
+
+    With ``shadow_fraction`` > 0 a new candidate first runs as a shadow: that fraction
+    of batches also goes through it, and agreement and latency against the live model
+    are tracked (``status()`` and the ``csi_model_shadow_*`` metrics). After
+    ``promote_after`` compared frames it is promoted if agreement reaches
+    ``min_agreement`` and discarded otherwise; ``promote_after=0`` leaves the decision
+    to ``promote()``/``discard()``.
+    """
+
+    def __init__(
+        self,
+        executors: List[InferenceExecutor],
+        directory: Optional[Path] = None,
+        poll_interval: float = 5.0,
+        shadow_fraction: float = 0.0,
+        promote_after: int = 0,
+        min_agreement: float = 0.95,
+        artifact_path: Optional[Path] = None,
+        model_version: str = "unversioned",
+        suffix: str = ".ts",
+    ) -> None:
+        self._executors = executors
+        self._directory = directory
+        self._suffix = suffix
+        self._poll_interval = poll_interval
+        self._shadow_fraction = shadow_fraction
+        self._promote_after = promote_after
+        self._min_agreement = min_agreement
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._decision: Optional[asyncio.Task] = None
+        # Artifacts already loaded, promoted, rejected or failed; never retried as is.
+        self._seen: Set[ArtifactKey] = set()
+        self._live: Optional[ModelInfo] = None
+        self._shadow: Optional[ModelInfo] = None
+        self._last_reload: Optional[datetime] = None
+        self._reset_shadow_stats()
+        # Loaded by the executors at startup; live once ``startup_loaded`` confirms it.
+        self._startup: Optional[Tuple[Path, str]] = None
+        key = self._key(artifact_path) if artifact_path is not None else None
+        if artifact_path is not None and key is not None:
+            self._startup = (artifact_path, model_version)
+            self._seen.add(key)
+
+    @classmethod
+    def from_settings(
+        cls, settings: Settings, executors: List[InferenceExecutor]
+    ) -> "ModelRegistry":
+        return cls(
+            executors,
+            directory=settings.model_registry_dir,
+            poll_interval=settings.model_registry_poll_interval_s,
+            shadow_fraction=settings.model_shadow_fraction,
+            promote_after=settings.model_shadow_promote_after,
+            min_agreement=settings.model_shadow_min_agreement,
+            artifact_path=settings.model_artifact_path,
+            model_version=settings.model_version,
+            suffix=backend_suffix(settings.model_backend),
+        )
+
+    @property
+    def live(self) -> Optional[ModelInfo]:
+        return self._live
+
+    @property
+    def last_reload(self) -> Optional[datetime]:
+        return self._last_reload
+
+    def startup_loaded(self) -> None:
+        """Record that every worker loaded the startup artifact."""
+
+        if self._startup is None or self._live is not None:
+            return
+        path, version = self._startup
+        self._last_reload = datetime.now(tz=timezone.utc)
+        self._live = ModelInfo(version=version, path=str(path), loaded_at=self._last_reload)
+
+    def start(self) -> None:
+        if self._directory is not None and self._task is None:
+            self._task = asyncio.create_task(self._watch(), name="model-registry")
+
+    async def stop(self) -> None:
+        for task in (self._task, self._decision):
+            if task is not None:
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+        self._task = self._decision = None
+
+    async def _watch(self) -> None:
+        while True:
+            try:
+                await self.scan()
+            except Exception:
+                logger.exception("model_registry_scan_failed", directory=str(self._directory))
+            await asyncio.sleep(self._poll_interval)
+
+    async def scan(self) -> Optional[ModelInfo]:
+        """Load the newest artifact in the registry directory if it is new.
+
+        Returns the loaded model, or ``None`` when there was nothing new or it failed.
+        """
+
+        if self._directory is None:
+            return None
+        candidate = await asyncio.to_thread(self._newest_artifact)
+        if candidate is None:
+            return None
+        key = self._key(candidate)
+        if key is None or key in self._seen:
+            return None
+        async with self._lock:
+            # The poller and ``POST /models/reload`` may both have found it.
+            if key in self._seen:
+                return None
+            return await self._load(candidate, key)
+
+    def _newest_artifact(self) -> Optional[Path]:
+        assert self._directory is not None
+        newest: Optional[Tuple[float, str, Path]] = None
+        settled = time.time() - _SETTLE_S
+        for path in self._directory.glob(f"*{self._suffix}"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if mtime <= settled and (newest is None or (mtime, path.name) > newest[:2]):
+                newest = (mtime, path.name, path)
+        return newest[2] if newest is not None else None
+
+    @staticmethod
+    def _key(path: Path) -> Optional[ArtifactKey]:
+        """Identity of an artifact, or ``None`` if it has been removed meanwhile."""
+
+        try:
+            return str(path), path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    async def _load(self, path: Path, key: ArtifactKey) -> Optional[ModelInfo]:
+        self._seen.add(key)
+        version = path.stem
+        # Stage as shadow everywhere first so a failure on any worker leaves them all on
+        # the current live model; with shadowing off the stage is promoted immediately.
+        shadow = self._shadow_fraction > 0 and self._live is not None
+        try:
+            await asyncio.gather(
+                *(executor.load_model(path, version, "shadow") for executor in self._executors)
+            )
+        except Exception:
+            logger.exception("model_load_failed", path=str(path), version=version)
+            MODEL_RELOADS.labels(result="failed").inc()
+            await self._discard_everywhere()
+            return None
+
+        info = ModelInfo(version=version, path=str(path), loaded_at=datetime.now(tz=timezone.utc))
+        self._shadow = info
+        self._reset_shadow_stats()
+        if not shadow:
+            await self._promote("loaded")
+            return info
+        MODEL_RELOADS.labels(result="shadowed").inc()
+        logger.info("model_shadowed", version=version, live=self._live_version())
+        return info
+
+    async def promote(self) -> Optional[ModelInfo]:
+        """Make the shadow model live now; returns it, or ``None`` without a shadow."""
+
+        async with self._lock:
+            if self._shadow is None:
+                return None
+            return await self._promote("promoted")
+
+    async def discard(self) -> Optional[ModelInfo]:
+        """Stop shadowing and drop the shadow model; returns it, or ``None``."""
+
+        async with self._lock:
+            shadow = self._shadow
+            if shadow is not None:
+                await self._discard_everywhere()
+                MODEL_RELOADS.labels(result="rejected").inc()
+                logger.warning("model_shadow_rejected", version=shadow.version, **self._summary())
+            return shadow
+
+    async def _promote(self, result: str) -> ModelInfo:
+        assert self._shadow is not None
+        await asyncio.gather(*(executor.promote_shadow() for executor in self._executors))
+        previous = self._live_version()
+        self._last_reload = datetime.now(tz=timezone.utc)
+        self._live = self._shadow.model_copy(update={"loaded_at": self._last_reload})
+        self._shadow = None
+        MODEL_RELOADS.labels(result=result).inc()
+        logger.info(
+            "model_reloaded", version=self._live.version, previous=previous, **self._summary()
+        )
+        return self._live
+
+    async def _discard_everywhere(self) -> None:
+        await asyncio.gather(
+            *(executor.discard_shadow() for executor in self._executors), return_exceptions=True
+        )
+        self._shadow = None
+
+    def observe_shadow(self, sample: ShadowSample) -> None:
+        """Record one live-vs-shadow comparison reported by an inference worker."""
+
+        if self._shadow is None or sample.version != self._shadow.version:
+            return
+        self._frames += sample.frames
+        self._agreed += sample.agreed
+        self._batches += 1
+        self._live_ms += sample.live_ms
+        self._shadow_ms += sample.shadow_ms
+        SHADOW_FRAMES.labels(version=sample.version).inc(sample.frames)
+        SHADOW_AGREED.labels(version=sample.version).inc(sample.agreed)
+        SHADOW_LATENCY.labels(model="live").observe(sample.live_ms)
+        SHADOW_LATENCY.labels(model="shadow").observe(sample.shadow_ms)
+        if (
+            self._promote_after
+            and self._frames >= self._promote_after
+            and (self._decision is None or self._decision.done())
+        ):
+            self._decision = asyncio.create_task(self._decide(), name="model-shadow-decision")
+
+    async def _decide(self) -> None:
+        if self._agreement() >= self._min_agreement:
+            await self.promote()
+        else:
+            await self.discard()
+
+    def _agreement(self) -> float:
+        return self._agreed / self._frames if self._frames else 0.0
+
+    def _reset_shadow_stats(self) -> None:
+        self._frames = 0
+        self._agreed = 0
+        self._batches = 0
+        self._live_ms = 0.0
+        self._shadow_ms = 0.0
+
+    def _shadow_stats(self) -> ShadowStats:
+        batches = max(1, self._batches)
+        return ShadowStats(
+            frames=self._frames,
+            agreement_percentage=self._agreement() * 100.0,
+            live_latency_ms=self._live_ms / batches,
+            shadow_latency_ms=self._shadow_ms / batches,
+        )
+
+    def _summary(self) -> dict:
+        return self._shadow_stats().model_dump() if self._frames else {}
+
+    def _live_version(self) -> Optional[str]:
+        return self._live.version if self._live is not None else None
+
+    def status(self) -> ModelRegistryStatus:
+        return ModelRegistryStatus(
+            registry_dir=str(self._directory) if self._directory is not None else None,
+            live=self._live,
+            shadow=self._shadow,
+            shadow_fraction=self._shadow_fraction,
+            shadow_stats=self._shadow_stats() if self._shadow is not None else None,
+            last_model_reload=self._last_reload,
+        )
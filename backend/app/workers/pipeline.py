@@ -1,19 +1,29 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Iterable
-
-import orjson
+import contextlib
+from typing import Iterable, Optional
 
 from ..core.config import Settings
+from ..core.logging import get_logger
+from ..services.prediction_batch import PredictionBatch
 from ..services.prediction_cache import PredictionCache
-from ..services.metrics import PREDICTION_COUNTER, QUEUE_SIZE, record_latency
+from ..services.redis_writer import RedisPredictionWriter
+from ..services.metrics import (
+    PREDICTION_COUNTER,
+    PREDICTION_LATENCY,
+    WORKER_PACKETS,
+    WORKER_QUEUE_SIZE,
+)
 from ..services.device_registry import DeviceRegistry
-from ..services.inference_engine import InferenceEngine
 from ..services.websocket_manager import WebSocketManager
-from ..schemas.prediction import InferenceEnvelope, PredictionRecord
 from ..schemas.csi import CSIPacket
-from ..services import preprocessing
+from .admission import FairShareQueue
+from .batcher import AdaptiveBatcher
+from .executor import BatchResult, InferenceExecutor
+from .model_registry import ModelRegistry
+
+logger = get_logger(__name__)
 
 
 class InferencePipeline:
@@ -21,96 +31,111 @@ class InferencePipeline:
 
     def __init__(
         self,
-        queue: asyncio.Queue[CSIPacket],
+        queue: FairShareQueue,
         settings: Settings,
-        engine: InferenceEngine,
+        executor: InferenceExecutor,
         cache: PredictionCache,
         devices: DeviceRegistry,
         websocket_manager: WebSocketManager,
-        redis_client=None,
-        repository=None,
+        redis_writer: Optional[RedisPredictionWriter] = None,
+        persister=None,
+        models: Optional[ModelRegistry] = None,
+        name: str = "0",
     ) -> None:
+        self.name = name
         self._queue = queue
         self._settings = settings
-        self._engine = engine
+        self._executor = executor
         self._cache = cache
         self._devices = devices
         self._websocket_manager = websocket_manager
-        self._redis = redis_client
-        self._repository = repository
+        self._redis_writer = redis_writer
+        self._persister = persister
+        self._models = models
         self._running = False
+        self._batcher = AdaptiveBatcher.from_settings(queue, settings, name=name)
+        self._inflight = asyncio.Semaphore(max(1, settings.inference_max_inflight_batches))
+        self._pending: asyncio.Queue[tuple[asyncio.Future[BatchResult], list[CSIPacket], int]] = (
+            asyncio.Queue()
+        )
+        # Rate-limited frames are folded into temporal windows only when windows exist.
+        self._fold_skipped = (
+            settings.inference_rate_limit_fold_skipped and settings.temporal_window_size > 1
+        )
 
     async def run(self) -> None:
         self._running = True
-        poll_timeout = self._settings.inference_poll_timeout_ms / 1000.0
-        batch_size = self._settings.inference_batch_size
-        while self._running:
-            QUEUE_SIZE.set(self._queue.qsize())
-            items = await self._drain_batch(batch_size, poll_timeout)
-            if not items:
-                await asyncio.sleep(poll_timeout)
-                continue
-
-            features = [preprocessing.preprocess_packet(packet) for packet in items]
-            with record_latency():
-                envelopes = self._engine.run_batch(features)
-            await self._handle_predictions(envelopes, items)
+        collector = asyncio.create_task(self._collect())
+        try:
+            while self._running:
+                WORKER_QUEUE_SIZE.labels(worker=self.name).set(self._queue.qsize())
+                items = await self._batcher.next_batch()
+                if not items:
+                    continue
+                admitted = self._devices.admit(items)
+                inferred = [packet for packet, keep in zip(items, admitted) if keep]
+                infer: Optional[list[bool]] = None
+                if len(inferred) < len(items):
+                    if self._fold_skipped:
+                        infer = admitted
+                    elif inferred:
+                        items = inferred
+                    else:
+                        continue
+
+                await self._inflight.acquire()
+                future = self._executor.submit(items, infer)
+                self._pending.put_nowait((future, inferred, len(items)))
+        finally:
+            collector.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await collector
 
     async def stop(self) -> None:
         self._running = False
 
-    async def _drain_batch(self, batch_size: int, timeout: float) -> list[CSIPacket]:
-        items: list[CSIPacket] = []
-        for _ in range(batch_size):
+    async def _collect(self) -> None:
+        # Results are handled in submission order so per-device ordering survives
+        # overlapping batches.
+        while True:
+            future, items, processed = await self._pending.get()
             try:
-                packet = await asyncio.wait_for(self._queue.get(), timeout=timeout)
-            except asyncio.TimeoutError:
-                break
-            items.append(packet)
-        return items
+                predictions, elapsed, shadow = await future
+                PREDICTION_LATENCY.observe(elapsed * 1000.0)
+                self._batcher.observe_inference(processed, elapsed)
+                self._queue.observe_service(processed, elapsed)
+                if shadow is not None and self._models is not None:
+                    self._models.observe_shadow(shadow)
+                await self._handle_predictions(predictions, items)
+                WORKER_PACKETS.labels(worker=self.name).inc(processed)
+            except Exception:
+                logger.exception("inference_batch_failed", worker=self.name, batch_size=processed)
+            finally:
+                self._inflight.release()
 
     async def _handle_predictions(
-        self, predictions: Iterable[InferenceEnvelope], packets: Iterable[CSIPacket]
+        self, batch: PredictionBatch, packets: Iterable[CSIPacket]
     ) -> None:
-        envelopes = list(predictions)
-        packet_list = list(packets)
-        if not envelopes:
+        # Every stage reads the batch columns; records are only built for API responses.
+        if not len(batch):
             return
 
-        records = [
-            PredictionRecord(
-                **envelope.model_dump(),
-                sequence_id=packet.sequence_id,
-                rssi=packet.rssi,
-                noise_floor=packet.noise_floor,
-                snr=packet.snr,
-            )
-            for envelope, packet in zip(envelopes, packet_list)
-        ]
-
-        self._cache.bulk_push(records)
-        await self._broadcast(records)
-
-        if self._redis is not None:
-            await self._cache_to_redis(records)
-
-        if self._repository is not None:
-            await self._repository.add_many(records)
-
-        for record in records:
-            PREDICTION_COUNTER.labels(label=record.label).inc()
-            self._devices.mark_prediction(record.mac_address)
-
-        for packet in packet_list:
-            self._devices.upsert(packet.mac_address)
-
-    async def _broadcast(self, records: list[PredictionRecord]) -> None:
-        for record in records:
-            await self._websocket_manager.broadcast(record.model_dump(mode="json"))
-
-    async def _cache_to_redis(self, records: list[PredictionRecord]) -> None:
-        ttl = self._settings.redis_prediction_ttl_seconds
-        for record in records:
-            key = f"prediction:{record.mac_address}"
-            payload = orjson.dumps(record.model_dump(mode="json")).decode("utf-8")
-            await self._redis.set(key, payload, ex=ttl)
+        self._cache.push_batch(batch)
+        await self._broadcast(batch)
+
+        if self._redis_writer is not None:
+            await self._redis_writer.write(batch)
+
+        if self._persister is not None:
+            await self._persister.add_batch(batch)
+
+        for label, count in batch.label_counts().items():
+            PREDICTION_COUNTER.labels(label=label).inc(count)
+        for mac_address, indices in batch.by_device().items():
+            self._devices.mark_prediction(mac_address, len(indices))
+
+        for mac_address in dict.fromkeys(packet.mac_address for packet in packets):
+            self._devices.upsert(mac_address)
+
+    async def _broadcast(self, batch: PredictionBatch) -> None:
+        await self._websocket_manager.broadcast_batch(batch)
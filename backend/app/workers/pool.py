@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+import zlib
+from typing import Callable, Dict, Optional
+
+from ..core.config import Settings
+from ..schemas.csi import CSIPacket
+from ..services.device_registry import DeviceRegistry
+from ..services.prediction_cache import PredictionCache
+from ..services.redis_writer import RedisPredictionWriter
+from ..services.websocket_manager import WebSocketManager
+from .admission import FairShareQueue, ShedPolicy
+from .executor import InferenceExecutor
+from .model_registry import ModelRegistry
+from .pipeline import InferencePipeline
+
+
+class ShardedQueue:
+    """Route CSI packets to per-worker queues by MAC address.
+
+    Every packet from a device lands on the same shard, so per-device ordering is
+    preserved while shards are drained concurrently. Each shard is a ``FairShareQueue``
+    applying admission control and the shedding policy. Packets are stored with their
+    monotonic enqueue time so batchers can enforce latency deadlines. Exposes the
+    subset of the ``asyncio.Queue`` interface used by the ingest routes.
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        maxsize: int,
+        policy: ShedPolicy = "reject",
+        max_delay_s: float = 0.0,
+        on_shed: Optional[Callable[[str, int], None]] = None,
+    ) -> None:
+        shards = max(1, shards)
+        per_shard = max(1, maxsize // shards)
+        self._queues: list[FairShareQueue] = [
+            FairShareQueue(per_shard, policy=policy, max_delay_s=max_delay_s, on_shed=on_shed)
+            for _ in range(shards)
+        ]
+
+    @property
+    def shards(self) -> list[FairShareQueue]:
+        return self._queues
+
+    def shard_index(self, mac_address: str) -> int:
+        return zlib.crc32(mac_address.encode("ascii")) % len(self._queues)
+
+    def shard_for(self, mac_address: str) -> FairShareQueue:
+        return self._queues[self.shard_index(mac_address)]
+
+    def put_nowait(self, packet: CSIPacket) -> None:
+        self.shard_for(packet.mac_address).put_nowait((time.monotonic(), packet))
+
+    async def put(self, packet: CSIPacket) -> None:
+        await self.shard_for(packet.mac_address).put((time.monotonic(), packet))
+
+    def qsize(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    def full(self) -> bool:
+        return all(queue.full() for queue in self._queues)
+
+    def empty(self) -> bool:
+        return all(queue.empty() for queue in self._queues)
+
+
+class InferenceWorkerPool:
+    """Own N inference pipelines, each draining one shard with its own executor."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        cache: PredictionCache,
+        devices: DeviceRegistry,
+        websocket_manager: WebSocketManager,
+        redis_client=None,
+        persister=None,
+    ) -> None:
+        self.queue = ShardedQueue(
+            settings.inference_workers,
+            settings.queue_maxsize,
+            policy=settings.ingest_shed_policy,
+            max_delay_s=settings.ingest_max_queue_delay_ms / 1000.0,
+            on_shed=devices.record_shed,
+        )
+        self.redis_writer = (
+            RedisPredictionWriter.from_settings(redis_client, settings)
+            if redis_client is not None
+            else None
+        )
+        self.executors: list[InferenceExecutor] = [
+            InferenceExecutor.from_settings(settings) for _ in self.queue.shards
+        ]
+        self.models = ModelRegistry.from_settings(settings, self.executors)
+        self.pipelines: list[InferencePipeline] = [
+            InferencePipeline(
+                queue=shard,
+                settings=settings,
+                executor=executor,
+                cache=cache,
+                devices=devices,
+                websocket_manager=websocket_manager,
+                redis_writer=self.redis_writer,
+                persister=persister,
+                models=self.models,
+                name=str(index),
+            )
+            for index, (shard, executor) in enumerate(zip(self.queue.shards, self.executors))
+        ]
+        self.devices = devices
+        self._warmup = settings.inference_warmup
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def size(self) -> int:
+        return len(self.pipelines)
+
+    def start(self) -> None:
+        """Start the background tasks; workers only start draining in ``warm_up``."""
+
+        if self.redis_writer is not None:
+            self.redis_writer.start()
+        if self.devices.reordering:
+            self._tasks.append(
+                asyncio.create_task(self._release_reordered(), name="reorder-expiry")
+            )
+
+    async def warm_up(self) -> Dict[str, float]:
+        """Load (and warm up) every worker's model concurrently, then start the workers.
+
+        Each pipeline starts draining its shard once its own model is ready, so frames
+        ingested meanwhile wait in the queue and a batch never waits on a model load.
+        The model registry is watched once every worker is up. Returns the slowest
+        worker's seconds per phase (``model_load``, ``warmup``).
+        """
+
+        results = await asyncio.gather(
+            *(
+                self._start_worker(pipeline, executor)
+                for pipeline, executor in zip(self.pipelines, self.executors)
+            )
+        )
+        self.models.startup_loaded()
+        self.models.start()
+        phases: Dict[str, float] = {}
+        for timings in results:
+            for name, seconds in timings.items():
+                phases[name] = max(phases.get(name, 0.0), seconds)
+        return phases
+
+    async def _start_worker(
+        self, pipeline: InferencePipeline, executor: InferenceExecutor
+    ) -> Dict[str, float]:
+        timings = await executor.start(warmup=self._warmup)
+        self._tasks.append(
+            asyncio.create_task(pipeline.run(), name=f"inference-worker-{pipeline.name}")
+        )
+        return timings
+
+    async def _release_reordered(self) -> None:
+        """Release frames held for a sequence gap once the device has gone quiet."""
+
+        interval = max(0.005, self.devices.reorder_max_delay_s / 2)
+        while True:
+            await asyncio.sleep(interval)
+            for packet in self.devices.release_expired():
+                # A rejected frame is already counted as shed by admission control; the
+                # rest may belong to other shards (or devices with room), so keep going.
+                with contextlib.suppress(asyncio.QueueFull):
+                    self.queue.put_nowait(packet)
+
+    async def stop(self) -> None:
+        await self.models.stop()
+        for pipeline in self.pipelines:
+            await pipeline.stop()
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        if self.redis_writer is not None:
+            await self.redis_writer.stop()
+        for executor in self.executors:
+            await asyncio.to_thread(executor.shutdown)
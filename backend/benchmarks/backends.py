@@ -0,0 +1,124 @@
+"""CPU latency and throughput of each inference backend on the same model.
+
+The TorchScript model is exported with ``scripts.export_model`` and every artifact is
+served by ``InferenceEngine.run_batch`` with input buckets, as the workers do. Each
+backend runs ``--batches`` full batches of ``--batch-size`` frames (throughput) and
+single-frame batches (latency), and its labels are compared against full-precision
+TorchScript. ONNX Runtime rows are skipped without the ``onnx`` extra.
+Run from ``backend/``::
+
+    python -m benchmarks.backends --batch-size 32 --hidden 1024 --threads 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from app.schemas.csi import CSIPacket
+from app.services.inference_engine import InferenceEngine, batch_buckets
+from scripts.export_model import export_int8, export_onnx, export_onnx_int8
+
+from .common import percentiles, report, synthetic_packets, write_torchscript_model
+
+Batch = List[Tuple[np.ndarray, CSIPacket]]
+
+
+def _artifacts(model: Path, shape: Tuple[int, int]) -> List[Tuple[str, str, bool, Path]]:
+    configs = [
+        ("torchscript", "torchscript", False, model),
+        ("torchscript_optimized", "torchscript", True, model),
+        ("torch_int8", "torch_int8", False, export_int8(model, model.with_suffix(".int8.ts"))),
+    ]
+    if importlib.util.find_spec("onnxruntime") is None:
+        print("onnxruntime not installed; skipping ONNX Runtime backends")
+        return configs
+    onnx = export_onnx(model, model.with_suffix(".onnx"), shape)
+    int8 = export_onnx_int8(onnx, model.with_suffix(".int8.onnx"))
+    configs.append(("onnxruntime", "onnxruntime", False, onnx))
+    configs.append(("onnxruntime_int8", "onnxruntime", False, int8))
+    return configs
+
+
+def _latencies(engine: InferenceEngine, batches: List[Batch]) -> List[float]:
+    latencies = []
+    for batch in batches:
+        began = time.perf_counter()
+        engine.run_batch(batch)
+        latencies.append((time.perf_counter() - began) * 1000.0)
+    return latencies
+
+
+def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    torch.set_num_threads(args.threads)
+    shape = (args.subcarriers, args.antennas)
+    rng = np.random.default_rng(0)
+    packets = list(synthetic_packets(args.batch_size * 4, subcarriers=args.subcarriers))
+    frames: Batch = [
+        (rng.standard_normal(shape).astype(np.float32), packet) for packet in packets
+    ]
+    full = [frames[i : i + args.batch_size] for i in range(0, len(frames), args.batch_size)]
+    full = (full * (args.batches // len(full) + 1))[: args.batches]
+    single = [[frame] for frame in frames] * (args.batches // len(frames) + 1)
+    results = []
+    reference: Optional[List[str]] = None
+    with tempfile.TemporaryDirectory() as tmp:
+        model = write_torchscript_model(Path(tmp) / "model.ts", *shape, hidden=args.hidden)
+        for name, backend, optimize, path in _artifacts(model, shape):
+            began = time.perf_counter()
+            engine = InferenceEngine(
+                path,
+                name,
+                optimize=optimize,
+                batch_sizes=batch_buckets(args.batch_size),
+                frame_shapes=[shape],
+                backend=backend,
+                num_threads=args.threads,
+            )
+            engine.warm_up()
+            load_ms = (time.perf_counter() - began) * 1000.0
+            labels = engine.run_batch(frames).label_names()
+            reference = reference or labels
+            batch_ms = _latencies(engine, full)
+            single_ms = _latencies(engine, single[: args.batches])
+            results.append(
+                {
+                    "backend": name,
+                    "artifact_mb": path.stat().st_size / 1e6,
+                    "load_ms": load_ms,
+                    "frames_per_s": args.batch_size * len(batch_ms) / (sum(batch_ms) / 1000.0),
+                    **percentiles(batch_ms, prefix=f"b{args.batch_size}_ms_"),
+                    **percentiles(single_ms, prefix="b1_ms_"),
+                    "agreement_pct": 100.0 * np.mean([a == b for a, b in zip(labels, reference)]),
+                }
+            )
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--batches", type=int, default=300)
+    parser.add_argument("--subcarriers", type=int, default=64)
+    parser.add_argument("--antennas", type=int, default=2)
+    parser.add_argument("--hidden", type=int, default=1024, help="Model width")
+    parser.add_argument("--threads", type=int, default=1, help="Intra-op threads per backend")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report("backends", run(args), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
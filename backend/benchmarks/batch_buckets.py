@@ -0,0 +1,143 @@
+"""Per-batch input allocation and latency with and without preallocated input buckets.
+
+``stack`` is the previous input path: ``torch.from_numpy(np.stack(features))`` builds a new
+tensor of the exact batch size every call. ``buckets`` is the ``InferenceEngine.run_batch``
+path, which writes features into the preallocated buffer of the nearest padded batch size.
+Batches have random sizes up to ``--batch-size``. Latency is reported per padded batch
+size, allocations as the input bytes traced per batch and the number of input buffers
+created after warm-up.
+Run from ``backend/``::
+
+    python -m benchmarks.batch_buckets --batch-size 32 --batches 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+import torch
+
+from app.schemas.csi import CSIPacket
+from app.services.inference_engine import batch_buckets
+from app.services.input_buckets import InputBuckets
+
+from .common import percentiles, report, synthetic_packets, write_torchscript_model
+
+Batch = List[Tuple[np.ndarray, CSIPacket]]
+
+
+def _frames(count: int, subcarriers: int, antennas: int, seed: int) -> Batch:
+    rng = np.random.default_rng(seed)
+    packets = list(synthetic_packets(count, subcarriers=subcarriers, antennas=antennas, seed=seed))
+    return [
+        (rng.standard_normal((subcarriers, antennas)).astype(np.float32), packet)
+        for packet in packets
+    ]
+
+
+def _stack(model: Any) -> Callable[[Batch], Any]:
+    def run(batch: Batch) -> Any:
+        features = [item[0] for item in batch]
+        with torch.inference_mode():
+            tensor = torch.from_numpy(np.stack(features))
+            return torch.softmax(model(tensor), dim=-1).numpy()
+
+    return run
+
+
+def _buckets(model: Any, inputs: InputBuckets) -> Callable[[Batch], Any]:
+    # The input path of InferenceEngine.run_batch, without building the prediction batch.
+    def run(batch: Batch) -> Any:
+        features = [item[0] for item in batch]
+        probs = np.empty((len(features), 4), dtype=np.float32)
+        with torch.inference_mode():
+            for indices, tensor in inputs.batches(features):
+                logits = model(tensor)[: len(indices)]
+                probs[indices] = torch.softmax(logits, dim=-1).numpy()
+        return probs
+
+    return run
+
+
+def _measure(
+    name: str, run: Callable[[Batch], Any], batches: List[Batch], inputs: InputBuckets
+) -> dict[str, Any]:
+    for batch in batches[:50]:
+        run(batch)
+    buffers = inputs.allocations
+    by_bucket: dict[int, list[float]] = defaultdict(list)
+    traced: list[int] = []
+    for batch in batches:
+        tracemalloc.start()
+        began = time.perf_counter()
+        run(batch)
+        elapsed = time.perf_counter() - began
+        traced.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        by_bucket[inputs.batch_bucket(len(batch))].append(elapsed * 1000.0)
+    latencies = [value for values in by_bucket.values() for value in values]
+    row: dict[str, Any] = {
+        "path": name,
+        "alloc_bytes_per_batch": sum(traced) / len(traced),
+        "buffers_allocated": inputs.allocations - buffers,
+        **percentiles(latencies, prefix="ms_"),
+    }
+    for bucket in sorted(by_bucket):
+        row.update(percentiles(by_bucket[bucket], prefix=f"b{bucket}_ms_"))
+    return row
+
+
+def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    torch.set_num_threads(args.threads)
+    full = _frames(4 * args.batch_size, args.subcarriers, args.antennas, seed=1)
+    rng = random.Random(0)
+
+    def batches(pool: Batch) -> List[Batch]:
+        return [rng.sample(pool, rng.randint(1, args.batch_size)) for _ in range(args.batches)]
+
+    uniform = batches(full)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = write_torchscript_model(
+            Path(tmp) / "model.ts", args.subcarriers, args.antennas, hidden=args.hidden
+        )
+        model = torch.jit.load(str(artifact))
+        model.eval()
+        inputs = InputBuckets(batch_buckets(args.batch_size), [(args.subcarriers, args.antennas)])
+        with torch.inference_mode():
+            for tensor in inputs.buffers():
+                for _ in range(3):
+                    model(tensor)
+        results.append(_measure("stack", _stack(model), uniform, inputs))
+        results.append(_measure("buckets", _buckets(model, inputs), uniform, inputs))
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--batches", type=int, default=2000)
+    parser.add_argument("--subcarriers", type=int, default=64)
+    parser.add_argument("--antennas", type=int, default=2)
+    parser.add_argument("--hidden", type=int, default=1024, help="Model width")
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report("batch_buckets", run(args), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,188 @@
+"""Per-batch cost of turning model outputs into cached, broadcast, stored predictions.
+
+Times the two halves of a worker batch for ``--batch-sizes`` frames from ``--devices``
+receivers: ``InferenceEngine.run_batch`` (model plus result construction) and the
+pipeline's prediction handling (prediction cache, ``--clients`` websocket subscribers,
+the Redis writer on ``fakeredis`` and the database write-behind buffer, whose inserts go
+to a no-op session without rollups). ``model_ms`` is the forward pass alone, so ``run_batch_ms -
+model_ms`` is the result construction overhead. ``--profile`` prints the functions with
+the most own time for the largest batch size.
+Run from ``backend/``::
+
+    python -m benchmarks.batch_results --batch-sizes 64 256 --batches 200 --profile
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import io
+import pstats
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import torch
+from fakeredis import aioredis
+
+from app.core.config import Settings
+from app.repositories.prediction_persister import PredictionPersister
+from app.schemas.stream import StreamSubscription
+from app.services import preprocessing
+from app.services.device_registry import DeviceRegistry
+from app.services.inference_backends import create_backend
+from app.services.inference_engine import InferenceEngine, batch_buckets
+from app.services.prediction_cache import PredictionCache
+from app.services.redis_writer import RedisPredictionWriter
+from app.services.websocket_manager import WebSocketManager
+from app.workers.admission import FairShareQueue
+from app.workers.executor import InferenceExecutor
+from app.workers.pipeline import InferencePipeline
+
+from .common import percentiles, report, synthetic_packets, write_torchscript_model
+from .websocket_fanout import FakeWebSocket
+
+
+class NullSession:
+    """Async session stand-in that accepts and discards every statement."""
+
+    async def __aenter__(self) -> "NullSession":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+    async def execute(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    async def commit(self) -> None:
+        return None
+
+
+async def _pipeline(
+    settings: Settings, clients: list[FakeWebSocket], devices: list[str]
+) -> InferencePipeline:
+    websockets = WebSocketManager.from_settings(settings)
+    for index, client in enumerate(clients):
+        # Every other client watches a single device, the rest watch everything.
+        mac = [devices[index % len(devices)]] if index % 2 else None
+        await websockets.connect(client, StreamSubscription(mac_addresses=mac))  # type: ignore[arg-type]
+    writer = RedisPredictionWriter.from_settings(aioredis.FakeRedis(), settings)
+    writer.start()
+    persister = PredictionPersister.from_settings(NullSession, settings)
+    persister.start()
+    return InferencePipeline(
+        FairShareQueue(),
+        settings,
+        InferenceExecutor.from_settings(settings),
+        PredictionCache(settings.prediction_cache_size),
+        DeviceRegistry.from_settings(settings),
+        websockets,
+        redis_writer=writer,
+        persister=persister,
+    )
+
+
+async def _run_size(
+    size: int, args: argparse.Namespace, settings: Settings, artifact: Path
+) -> tuple[dict[str, Any], Optional[str]]:
+    packets = list(synthetic_packets(size * 8, devices=args.devices, seed=size))
+    batches = [packets[offset : offset + size] for offset in range(0, len(packets), size)]
+    features = [preprocessing.preprocess_batch(batch) for batch in batches]
+    engine = InferenceEngine(
+        artifact, "bench", batch_sizes=batch_buckets(size), frame_shapes=[(64, 2)]
+    )
+    engine.warm_up()
+    backend = create_backend("torchscript", artifact, torch.device("cpu"))
+    clients = [FakeWebSocket(0.0) for _ in range(args.clients)]
+    pipeline = await _pipeline(settings, clients, sorted({p.mac_address for p in packets}))
+
+    model_ms: list[float] = []
+    run_ms: list[float] = []
+    handle_ms: list[float] = []
+    profiler = cProfile.Profile() if args.profile and size == max(args.batch_sizes) else None
+    for index in range(args.batches + 20):
+        items, frames = batches[index % len(batches)], features[index % len(batches)]
+        began = time.perf_counter()
+        for _, tensor in engine.inputs.batches([feature for feature, _ in frames]):
+            backend(tensor)
+        modelled = time.perf_counter()
+        if profiler is not None and index >= 20:
+            profiler.enable()
+        result = engine.run_batch(frames)
+        ran = time.perf_counter()
+        await pipeline._handle_predictions(result, items)
+        handled = time.perf_counter()
+        if profiler is not None:
+            profiler.disable()
+        # Let the writer, persister and websocket tasks drain as they would between batches.
+        await asyncio.sleep(0)
+        if index >= 20:
+            model_ms.append((modelled - began) * 1000.0)
+            run_ms.append((ran - modelled) * 1000.0)
+            handle_ms.append((handled - ran) * 1000.0)
+
+    for client in clients:
+        await pipeline._websocket_manager.disconnect(client)  # type: ignore[arg-type]
+    await pipeline._redis_writer.stop()
+    await pipeline._persister.stop()
+    pipeline._executor.shutdown()
+
+    row = {
+        "batch_size": size,
+        **percentiles(model_ms, prefix="model_ms_"),
+        **percentiles(run_ms, prefix="run_batch_ms_"),
+        **percentiles(handle_ms, prefix="handle_ms_"),
+        "overhead_us_per_frame": 1000.0
+        * (sum(run_ms) - sum(model_ms) + sum(handle_ms))
+        / (len(run_ms) * size),
+    }
+    profile = None
+    if profiler is not None:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("tottime").print_stats(args.profile_lines)
+        profile = out.getvalue()
+    return row, profile
+
+
+async def run(args: argparse.Namespace) -> tuple[list[dict[str, Any]], list[str]]:
+    torch.set_num_threads(args.threads)
+    settings = Settings(redis_url="", prediction_cache_size=512, rollups_enabled=False)
+    results, profiles = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = write_torchscript_model(Path(tmp) / "model.ts", hidden=args.hidden)
+        for size in args.batch_sizes:
+            row, profile = await _run_size(size, args, settings, artifact)
+            results.append(row)
+            if profile:
+                profiles.append(profile)
+    return results, profiles
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[64, 256])
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--devices", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=4, help="Websocket subscribers")
+    parser.add_argument("--hidden", type=int, default=256, help="Model width")
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads")
+    parser.add_argument("--profile", action="store_true", help="cProfile the largest batch size")
+    parser.add_argument("--profile-lines", type=int, default=20)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    results, profiles = asyncio.run(run(args))
+    report("batch_results", results, args.output)
+    for profile in profiles:
+        print(profile)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
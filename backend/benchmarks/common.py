@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import random
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence
+
+import numpy as np
+
+from app.schemas.csi import CSIPacket
+from app.schemas.prediction import PredictionRecord
+
+
+def synthetic_mac(index: int) -> str:
+    octets = (0x24, 0x0A, 0xC4, index >> 16 & 0xFF, index >> 8 & 0xFF, index & 0xFF)
+    return ":".join(f"{octet:02x}" for octet in octets)
+
+
+def synthetic_payload(
+    mac_address: str,
+    sequence_id: int,
+    subcarriers: int = 64,
+    antennas: int = 2,
+    rng: Optional[random.Random] = None,
+) -> dict[str, Any]:
+    """Return a JSON-ready frame shaped like the firmware's ``CSI_JSON`` output."""
+
+    rng = rng or random
+    return {
+        "mac_address": mac_address,
+        "sequence_id": sequence_id,
+        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "rssi": float(rng.randint(-80, -30)),
+        "noise_floor": float(rng.randint(-95, -85)),
+        "snr": float(rng.randint(5, 40)),
+        "csi": [
+            [float(rng.randint(-127, 127)) for _ in range(antennas)] for _ in range(subcarriers)
+        ],
+    }
+
+
+def synthetic_packets(
+    count: int,
+    devices: int = 8,
+    subcarriers: int = 64,
+    antennas: int = 2,
+    seed: int = 0,
+) -> Iterator[CSIPacket]:
+    rng = random.Random(seed)
+    for index in range(count):
+        yield CSIPacket(
+            **synthetic_payload(
+                synthetic_mac(index % devices),
+                (index // devices) % 4096,
+                subcarriers=subcarriers,
+                antennas=antennas,
+                rng=rng,
+            )
+        )
+
+
+def synthetic_records(count: int, devices: int = 8, offset: int = 0) -> list[PredictionRecord]:
+    now = datetime.now(tz=timezone.utc)
+    return [
+        PredictionRecord(
+            mac_address=synthetic_mac((offset + index) % devices),
+            timestamp=now,
+            label="human",
+            confidence=0.9,
+            distance_m=1.5,
+            model_version="bench",
+            latency_ms=3.0,
+            sequence_id=(offset + index) % 4096,
+        )
+        for index in range(count)
+    ]
+
+
+def percentiles(values: Sequence[float], prefix: str = "") -> dict[str, float]:
+    if not values:
+        return {f"{prefix}p50": 0.0, f"{prefix}p99": 0.0, f"{prefix}max": 0.0}
+    array = np.asarray(values, dtype=np.float64)
+    return {
+        f"{prefix}p50": float(np.percentile(array, 50)),
+        f"{prefix}p99": float(np.percentile(array, 99)),
+        f"{prefix}max": float(array.max()),
+    }
+
+
+def write_torchscript_model(
+    path: Path, subcarriers: int = 64, antennas: int = 2, hidden: int = 1024
+) -> Path:
+    """Write a small TorchScript classifier with a realistic per-batch CPU cost."""
+
+    import torch
+    from torch import nn
+
+    layers: list[nn.Module] = [nn.Flatten(), nn.Linear(subcarriers * antennas, hidden), nn.ReLU()]
+    for _ in range(3):
+        layers.extend([nn.Linear(hidden, hidden), nn.ReLU()])
+    layers.append(nn.Linear(hidden, 4))
+    model = torch.jit.script(nn.Sequential(*layers).eval())
+    model.save(str(path))
+    return path
+
+
+def report(name: str, results: list[dict[str, Any]], output: Optional[Path] = None) -> None:
+    """Print results as an aligned table and optionally persist them as JSON."""
+
+    if results:
+        columns = list(results[0].keys())
+        widths = {col: max(len(col), *(len(_fmt(row[col])) for row in results)) for col in columns}
+        print(f"# {name}")
+        print("  ".join(col.ljust(widths[col]) for col in columns))
+        for row in results:
+            print("  ".join(_fmt(row[col]).ljust(widths[col]) for col in columns))
+    if output is not None:
+        output.write_text(json.dumps({"benchmark": name, "results": results}, indent=2))
+
+
+def _fmt(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
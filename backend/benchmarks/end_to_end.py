@@ -0,0 +1,325 @@
+"""End-to-end load test of the full app: ingest RPS, ingest-to-WebSocket latency, CPU, RSS.
+
+Builds the real application (``app.main.create_app`` and its lifespan) in-process with
+local stand-ins for its services: ``fakeredis`` for Redis and a temporary SQLite file
+(``aiosqlite``) for Postgres; ``--no-redis``/``--no-db`` leave them out. A synthetic
+fleet of ``--devices`` receivers emits firmware-shaped ``CSI_JSON`` frames at
+``--rate-hz`` each, posted to ``/csi`` (``--mode single``) or as one ``/csi/batch``
+request per tick. ``--clients`` WebSocket clients are driven through the ASGI
+interface of ``/ws/predictions``; latency is the frame's capture timestamp to its
+arrival in a client's frame. CPU time covers the whole process, load generator included.
+Run from ``backend/``::
+
+    python -m benchmarks.end_to_end --devices 32 --rate-hz 50 --duration 10 --output e2e.json
+    python -m benchmarks.end_to_end --baseline e2e.json   # compare against a previous run
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+import orjson
+
+from .common import percentiles, report, synthetic_mac, synthetic_payload, write_torchscript_model
+
+_TICK_S = 0.01
+
+
+def _rss_mib() -> float:
+    """Current resident set size; peak RSS where ``/proc`` is unavailable."""
+
+    with contextlib.suppress(OSError):
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024.0
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024.0 * 1024.0) if sys.platform == "darwin" else peak / 1024.0
+
+
+class ASGIWebSocketClient:
+    """Minimal in-process WebSocket client speaking the ASGI protocol to the app."""
+
+    def __init__(self, app, path: str) -> None:
+        self._app = app
+        self._path = path
+        self._inbound: asyncio.Queue[dict] = asyncio.Queue()
+        self._accepted = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.latencies_ms: list[float] = []
+        self.records = 0
+
+    async def connect(self) -> None:
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self._path,
+            "raw_path": self._path.encode(),
+            "query_string": b"",
+            "headers": [],
+            "client": ("127.0.0.1", 0),
+            "server": ("bench", 80),
+            "subprotocols": [],
+        }
+        await self._inbound.put({"type": "websocket.connect"})
+        self._task = asyncio.create_task(self._app(scope, self._inbound.get, self._send))
+        await asyncio.wait_for(self._accepted.wait(), 5.0)
+
+    async def _send(self, message: dict) -> None:
+        if message["type"] == "websocket.accept":
+            self._accepted.set()
+        elif message["type"] == "websocket.send":
+            frame = orjson.loads(message.get("text") or message.get("bytes"))
+            if frame.get("type") != "predictions":
+                return
+            now = datetime.now(tz=timezone.utc)
+            for item in frame["items"]:
+                captured = datetime.fromisoformat(item["timestamp"].replace("Z", "+00:00"))
+                self.latencies_ms.append((now - captured).total_seconds() * 1000.0)
+            self.records += len(frame["items"])
+
+    async def close(self) -> None:
+        await self._inbound.put({"type": "websocket.disconnect", "code": 1000})
+        if self._task is not None:
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(self._task, 5.0)
+
+
+class Fleet:
+    """Firmware-like frames: per-device 12-bit sequence IDs and fresh capture timestamps."""
+
+    def __init__(self, devices: int, subcarriers: int, antennas: int) -> None:
+        self._templates = [
+            synthetic_payload(synthetic_mac(index), 0, subcarriers, antennas)
+            for index in range(devices)
+        ]
+        self._sequences = [0] * devices
+
+    def frames(self, device: int, count: int) -> list[dict[str, Any]]:
+        timestamp = datetime.now(tz=timezone.utc).isoformat()
+        frames = []
+        for _ in range(count):
+            sequence = self._sequences[device]
+            self._sequences[device] = (sequence + 1) % 4096
+            frames.append(
+                {**self._templates[device], "sequence_id": sequence, "timestamp": timestamp}
+            )
+        return frames
+
+
+async def _generate(
+    client: httpx.AsyncClient, fleet: Fleet, args: argparse.Namespace
+) -> dict[str, Any]:
+    requests = frames = accepted = rejected = errors = 0
+    pending: set[asyncio.Task] = set()
+    limit = asyncio.Semaphore(args.concurrency)
+
+    async def post(path: str, body: bytes, count: int) -> None:
+        nonlocal requests, accepted, rejected, errors
+        async with limit:
+            response = await client.post(
+                path, content=body, headers={"content-type": "application/json"}
+            )
+        requests += 1
+        if response.status_code == 202:
+            data = response.json()
+            if path == "/csi":
+                accepted += 1
+            else:
+                accepted += data["accepted"]
+                rejected += data["rejected"]
+        elif response.status_code == 429:
+            rejected += count
+        else:
+            errors += count
+
+    def spawn(path: str, body: bytes, count: int) -> None:
+        task = asyncio.create_task(post(path, body, count))
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    owed = [0.0] * args.devices
+    start = time.perf_counter()
+    last = start
+    while (now := time.perf_counter()) - start < args.duration:
+        elapsed, last = now - last, now
+        batch: list[dict[str, Any]] = []
+        for device in range(args.devices):
+            owed[device] += elapsed * args.rate_hz
+            due = int(owed[device])
+            owed[device] -= due
+            if due:
+                batch.extend(fleet.frames(device, due))
+        frames += len(batch)
+        if args.mode == "batch":
+            for offset in range(0, len(batch), args.batch_size):
+                chunk = batch[offset : offset + args.batch_size]
+                spawn("/csi/batch", orjson.dumps({"packets": chunk}), len(chunk))
+        else:
+            for frame in batch:
+                spawn("/csi", orjson.dumps(frame), 1)
+        await asyncio.sleep(_TICK_S)
+    if pending:
+        await asyncio.gather(*pending)
+    seconds = time.perf_counter() - start
+    return {
+        "frames": frames,
+        "requests": requests,
+        "seconds": seconds,
+        "accepted": accepted,
+        "rejected": rejected,
+        "errors": errors,
+    }
+
+
+def _configure(args: argparse.Namespace, workdir: Path):
+    """Build the app with benchmark settings and local service stand-ins."""
+
+    from app import main
+    from app.core.config import Settings
+
+    overrides: dict[str, Any] = {
+        "redis_url": "redis://bench/0" if args.redis else "",
+        "postgres_dsn": f"sqlite+aiosqlite:///{workdir / 'bench.db'}" if args.db else None,
+        "inference_workers": args.workers,
+        "inference_execution_mode": args.execution_mode,
+        "model_artifact_path": workdir / "missing.ts",
+        "metrics_enabled": False,
+    }
+    if args.hidden:
+        overrides["model_artifact_path"] = write_torchscript_model(
+            workdir / "model.ts", args.subcarriers, args.antennas, hidden=args.hidden
+        )
+    main.settings = Settings(**overrides)
+    if args.redis:
+        from fakeredis import aioredis
+
+        async def fake_redis(url: str):
+            return aioredis.FakeRedis()
+
+        main.create_redis = fake_redis
+    return main.create_app()
+
+
+async def _create_tables(dsn: str) -> None:
+    from app.infrastructure.postgres import create_engine, dispose_engine
+    from app.models import rollup  # noqa: F401  (registers the rollup tables)
+    from app.models.prediction import Base
+
+    engine = create_engine(dsn)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    await dispose_engine(engine)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        app = _configure(args, Path(tmp))
+        from app import main
+
+        if main.settings.postgres_dsn:
+            await _create_tables(main.settings.postgres_dsn)
+        rss_before = _rss_mib()
+        async with app.router.lifespan_context(app):
+            clients = [ASGIWebSocketClient(app, "/ws/predictions") for _ in range(args.clients)]
+            for ws in clients:
+                await ws.connect()
+            fleet = Fleet(args.devices, args.subcarriers, args.antennas)
+            transport = httpx.ASGITransport(app=app)
+            cpu_start = time.process_time()
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                load = await _generate(client, fleet, args)
+                # Let queued frames finish and reach the clients.
+                queue = app.state.queue
+                drain_deadline = time.perf_counter() + 10.0
+                while not queue.empty() and time.perf_counter() < drain_deadline:
+                    await asyncio.sleep(0.05)
+                await asyncio.sleep(0.5)
+            cpu = time.process_time() - cpu_start
+            rss_after = _rss_mib()
+            for ws in clients:
+                await ws.close()
+
+    latencies = [value for ws in clients for value in ws.latencies_ms]
+    delivered = min((ws.records for ws in clients), default=0)
+    return {
+        "mode": args.mode,
+        "devices": args.devices,
+        "offered_fps": load["frames"] / load["seconds"],
+        "ingest_rps": load["requests"] / load["seconds"],
+        "accepted_fps": load["accepted"] / load["seconds"],
+        "rejected": load["rejected"],
+        "errors": load["errors"],
+        "delivered_pct": 100.0 * delivered / load["frames"] if load["frames"] else 0.0,
+        **percentiles(latencies, prefix="e2e_ms_"),
+        "cpu_pct": 100.0 * cpu / load["seconds"],
+        "rss_mib": rss_after,
+        "rss_growth_mib": rss_after - rss_before,
+    }
+
+
+def compare(results: dict[str, Any], baseline_path: Path) -> list[dict[str, Any]]:
+    """Side by side numeric columns of this run and a previous ``--output`` file."""
+
+    baseline = json.loads(baseline_path.read_text())["results"][0]
+    rows = []
+    for key, value in results.items():
+        if isinstance(value, (int, float)) and isinstance(baseline.get(key), (int, float)):
+            before = baseline[key]
+            change = (value - before) / before * 100.0 if before else 0.0
+            rows.append({"metric": key, "baseline": before, "current": value, "change_pct": change})
+    return rows
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=32)
+    parser.add_argument("--rate-hz", type=float, default=50.0, help="Frames per second per device")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of load")
+    parser.add_argument("--mode", choices=("single", "batch"), default="batch")
+    parser.add_argument("--batch-size", type=int, default=256, help="Frames per /csi/batch")
+    parser.add_argument("--concurrency", type=int, default=64, help="In-flight HTTP requests")
+    parser.add_argument("--clients", type=int, default=4, help="WebSocket clients")
+    parser.add_argument("--subcarriers", type=int, default=64)
+    parser.add_argument("--antennas", type=int, default=2)
+    parser.add_argument(
+        "--hidden", type=int, default=512, help="TorchScript model width; 0 runs without a model"
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--execution-mode", choices=("inline", "thread", "process"), default="thread"
+    )
+    parser.add_argument("--no-redis", dest="redis", action="store_false")
+    parser.add_argument("--no-db", dest="db", action="store_false")
+    parser.add_argument("--baseline", type=Path, default=None, help="Compare with a results file")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    # The app reads configuration at import time; keep the developer's .env out of it.
+    os.environ.setdefault("CSI_REDIS_URL", "")
+    results = asyncio.run(run(args))
+    report("end_to_end", [results], args.output)
+    if args.baseline is not None:
+        report("end_to_end_vs_baseline", compare(results, args.baseline))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+"""Ingest latency under inference load for each pipeline execution mode.
+
+Drives ``POST /csi`` at a fixed request rate while the pipeline runs a TorchScript model,
+and reports p50/p99 ingest latency per mode. Run from ``backend/``::
+
+    python -m benchmarks.executor_modes --rate 400 --duration 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+import orjson
+from fastapi import FastAPI
+
+from app.api.routes import csi
+from app.core.config import Settings
+from app.services.device_registry import DeviceRegistry
+from app.services.prediction_cache import PredictionCache
+from app.services.websocket_manager import WebSocketManager
+from app.workers.executor import InferenceExecutor
+from app.workers.pipeline import InferencePipeline
+from app.workers.pool import ShardedQueue
+
+from .common import percentiles, report, synthetic_packets, write_torchscript_model
+
+MODES = ("inline", "thread", "process")
+
+
+async def _run_mode(settings: Settings, bodies: list[bytes], rate: float) -> dict[str, Any]:
+    queue = ShardedQueue(1, settings.queue_maxsize)
+    devices = DeviceRegistry()
+    executor = await asyncio.to_thread(InferenceExecutor.from_settings, settings)
+    pipeline = InferencePipeline(
+        queue=queue.shards[0],
+        settings=settings,
+        executor=executor,
+        cache=PredictionCache(settings.prediction_cache_size),
+        devices=devices,
+        websocket_manager=WebSocketManager(),
+    )
+    app = FastAPI()
+    app.include_router(csi.router)
+    app.state.settings = settings
+    app.state.queue = queue
+    app.state.device_registry = devices
+
+    # Warm the worker (process start-up, TorchScript profiling) before measuring.
+    await executor.submit(list(synthetic_packets(settings.inference_batch_size)))
+
+    task = asyncio.create_task(pipeline.run())
+    latencies: list[float] = []
+    rejected = 0
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://bench"
+    ) as client:
+
+        async def send(body: bytes, scheduled: float) -> None:
+            nonlocal rejected
+            response = await client.post(
+                "/csi", content=body, headers={"content-type": "application/json"}
+            )
+            if response.status_code == 429:
+                rejected += 1
+            latencies.append((time.perf_counter() - scheduled) * 1000.0)
+
+        interval = 1.0 / rate
+        start = time.perf_counter()
+        senders = []
+        for index, body in enumerate(bodies):
+            scheduled = start + index * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            senders.append(asyncio.create_task(send(body, scheduled)))
+        await asyncio.gather(*senders)
+
+    await pipeline.stop()
+    await task
+    await asyncio.to_thread(executor.shutdown)
+    return {
+        "mode": settings.inference_execution_mode,
+        "requests": len(bodies),
+        "rejected": rejected,
+        **percentiles(latencies, prefix="ingest_ms_"),
+    }
+
+
+async def run(
+    rate: float, duration: float, batch_size: int, threads: Optional[int], modes: list[str]
+) -> list[dict[str, Any]]:
+    packets = list(synthetic_packets(int(rate * duration), devices=16))
+    bodies = [orjson.dumps(packet.model_dump(mode="json")) for packet in packets]
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = write_torchscript_model(Path(tmp) / "model.ts")
+        for mode in modes:
+            settings = Settings(
+                redis_url="",
+                model_artifact_path=artifact,
+                inference_execution_mode=mode,
+                inference_batch_size=batch_size,
+                inference_torch_threads=threads,
+            )
+            results.append(await _run_mode(settings, bodies, rate))
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=400.0, help="Ingest requests per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load per mode")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads value")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(
+        run(args.rate, args.duration, args.batch_size, args.threads, args.modes)
+    )
+    report("executor_modes", results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
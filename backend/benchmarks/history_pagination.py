@@ -0,0 +1,155 @@
+"""Prediction history page latency by depth: OFFSET vs keyset cursor.
+
+Fills a SQLite database with ``--rows`` predictions (indexes created from the ORM
+metadata), then times ``PredictionRepository.history_page`` at increasing page depths,
+globally and for a single device. The full-size run from the design discussion is
+``--rows 10000000`` (a few minutes to populate). Run from ``backend/``::
+
+    python -m benchmarks.history_pagination --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.postgres import create_engine, create_session_factory, dispose_engine
+from app.models.prediction import Base, PredictionORM
+from app.repositories.prediction_repository import PredictionRepository, encode_cursor
+
+from .common import report, synthetic_mac
+
+_INSERT = (
+    "INSERT INTO predictions (id, mac_address, timestamp, label, confidence, distance_m,"
+    " model_version, latency_ms, sequence_id) VALUES (?, ?, ?, 'human', 0.9, 1.5, 'bench',"
+    " 3.0, ?)"
+)
+
+_SQLITE_DATETIME = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def populate(path: Path, rows: int, devices: int, chunk: int = 100_000) -> None:
+    engine = create_sync_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    start = datetime(2025, 1, 1)
+    with sqlite3.connect(path) as connection:
+        connection.execute("PRAGMA journal_mode=OFF")
+        connection.execute("PRAGMA synchronous=OFF")
+        for offset in range(0, rows, chunk):
+            connection.executemany(
+                _INSERT,
+                (
+                    (
+                        index + 1,
+                        synthetic_mac(index % devices),
+                        # SQLAlchemy's SQLite DATETIME storage format (always with micros).
+                        (start + timedelta(milliseconds=index * 10)).strftime(_SQLITE_DATETIME),
+                        index % 4096,
+                    )
+                    for index in range(offset, min(rows, offset + chunk))
+                ),
+            )
+        connection.execute("ANALYZE")
+
+
+async def _cursor_at(session: AsyncSession, mac_address: Optional[str], position: int) -> str:
+    query = (
+        select(PredictionORM.timestamp, PredictionORM.id)
+        .order_by(PredictionORM.timestamp.desc(), PredictionORM.id.desc())
+        .offset(position - 1)
+        .limit(1)
+    )
+    if mac_address:
+        query = query.where(PredictionORM.mac_address == mac_address)
+    row = (await session.execute(query)).one()
+    return encode_cursor(row.timestamp, row.id)
+
+
+async def _time(coro_factory, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        await coro_factory()
+        best = min(best, (time.perf_counter() - began) * 1000.0)
+    return best
+
+
+async def _measure(path: Path, args: argparse.Namespace) -> list[dict[str, Any]]:
+    engine = create_engine(f"sqlite+aiosqlite:///{path}")
+    session = create_session_factory(engine)()
+    repository = PredictionRepository(session)
+    results: list[dict[str, Any]] = []
+    for scope, mac_address in (("all", None), ("device", synthetic_mac(0))):
+        scope_rows = args.rows if mac_address is None else args.rows // args.devices
+        for depth in args.depths:
+            offset = depth * args.page_size
+            if offset >= scope_rows:
+                continue
+            # Resolve the cursor for this depth once (untimed), as a client would hold it.
+            cursor = await _cursor_at(session, mac_address, offset) if offset else None
+            offset_ms = await _time(
+                lambda: repository.history_page(
+                    mac_address=mac_address, page_size=args.page_size, offset=offset
+                ),
+                args.repeats,
+            )
+            keyset_ms = await _time(
+                lambda: repository.history_page(
+                    mac_address=mac_address, page_size=args.page_size, cursor=cursor
+                ),
+                args.repeats,
+            )
+            results.append(
+                {
+                    "scope": scope,
+                    "page": depth + 1,
+                    "offset_ms": offset_ms,
+                    "keyset_ms": keyset_ms,
+                }
+            )
+    count_ms = await _time(lambda: repository.count(), 1)
+    cached_count_ms = await _time(lambda: repository.count(), args.repeats)
+    results.append(
+        {"scope": "total", "page": 0, "offset_ms": count_ms, "keyset_ms": cached_count_ms}
+    )
+    await session.close()
+    await dispose_engine(engine)
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--devices", type=int, default=16)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 10, 100, 1000, 5000, 9000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--database", type=Path, default=None, help="Reuse/keep this SQLite file")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.database or Path(tmp) / "history.db"
+        if not path.exists():
+            populate(path, args.rows, args.devices)
+        results = asyncio.run(_measure(path, args))
+    report("history_pagination", results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
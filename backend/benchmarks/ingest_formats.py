@@ -0,0 +1,117 @@
+"""Compare ingest throughput for JSON single, JSON batch and binary batch uploads.
+
+Run from ``backend/``::
+
+    python -m benchmarks.ingest_formats --frames 4096 --batch-size 128
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import httpx
+import orjson
+from fastapi import FastAPI
+
+from app.api.routes import csi
+from app.core.config import Settings
+from app.services.csi_codec import BINARY_CONTENT_TYPE, encode_binary_batch
+from app.services.device_registry import DeviceRegistry
+
+from .common import report, synthetic_packets
+
+
+def build_app(settings: Settings) -> FastAPI:
+    app = FastAPI()
+    app.include_router(csi.router)
+    app.state.settings = settings
+    app.state.queue = asyncio.Queue(maxsize=settings.queue_maxsize)
+    app.state.device_registry = DeviceRegistry()
+    return app
+
+
+async def _drain(queue: asyncio.Queue) -> None:
+    while True:
+        await queue.get()
+
+
+Request = tuple[str, bytes, str]
+
+
+async def _measure(app: FastAPI, requests: list[Request], frames: int) -> dict[str, Any]:
+    drain = asyncio.create_task(_drain(app.state.queue))
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            for path, body, content_type in requests:
+                response = await client.post(
+                    path, content=body, headers={"content-type": content_type}
+                )
+                response.raise_for_status()
+            elapsed = time.perf_counter() - start
+    finally:
+        drain.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await drain
+    return {
+        "requests": len(requests),
+        "frames": frames,
+        "seconds": elapsed,
+        "frames_per_sec": frames / elapsed if elapsed else 0.0,
+        "bytes_per_frame": sum(len(body) for _, body, _ in requests) / frames,
+    }
+
+
+async def run(
+    frames: int, batch_size: int, subcarriers: int, antennas: int
+) -> list[dict[str, Any]]:
+    settings = Settings(queue_maxsize=frames + 1, csi_batch_max_frames=batch_size)
+    packets = list(synthetic_packets(frames, subcarriers=subcarriers, antennas=antennas))
+    dumped = [orjson.dumps(packet.model_dump(mode="json")) for packet in packets]
+    batches = [packets[i : i + batch_size] for i in range(0, frames, batch_size)]
+
+    json_type = "application/json"
+    json_batches = [
+        b'{"packets":[' + b",".join(dumped[i : i + batch_size]) + b"]}"
+        for i in range(0, frames, batch_size)
+    ]
+    scenarios: dict[str, list[Request]] = {
+        "json-single": [("/csi", body, json_type) for body in dumped],
+        "json-batch": [("/csi/batch", body, json_type) for body in json_batches],
+        "binary-batch": [
+            ("/csi/batch", encode_binary_batch(batch), BINARY_CONTENT_TYPE) for batch in batches
+        ],
+    }
+
+    results: list[dict[str, Any]] = []
+    for name, requests in scenarios.items():
+        app = build_app(settings)
+        results.append({"scenario": name, **await _measure(app, requests, frames)})
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=128)
+    parser.add_argument("--subcarriers", type=int, default=64)
+    parser.add_argument("--antennas", type=int, default=2)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args.frames, args.batch_size, args.subcarriers, args.antennas))
+    report("ingest_formats", results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,189 @@
+"""End-to-end latency and fairness with ingest offered at a multiple of inference capacity.
+
+Measures the worker's capacity (frames/s) with a TorchScript model, then offers
+``--load`` times that rate for ``--duration`` seconds from ``--devices`` receivers, one of
+which sends ``--chatty-share`` of all frames. Frames go through the sharded ingest queue
+and a running ``InferencePipeline``; latency is ingest to prediction cached. Compares
+shedding only when the queue is full against each policy with a queueing delay target.
+Run from ``backend/``::
+
+    python -m benchmarks.overload --load 2 --duration 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import Settings
+from app.services.device_registry import DeviceRegistry
+from app.services.prediction_batch import PredictionBatch
+from app.services.prediction_cache import PredictionCache
+from app.services.websocket_manager import WebSocketManager
+from app.workers.executor import InferenceExecutor
+from app.workers.pipeline import InferencePipeline
+from app.workers.pool import ShardedQueue
+
+from .common import percentiles, report, synthetic_mac, synthetic_packets, write_torchscript_model
+
+SCENARIOS = (
+    ("full_only", "reject", False),
+    ("reject", "reject", True),
+    ("drop_oldest", "drop_oldest", True),
+    ("decimate", "decimate", True),
+)
+
+
+class _LatencyCache(PredictionCache):
+    """Record ingest-to-cache latency per device as predictions arrive."""
+
+    def __init__(self, max_size: int) -> None:
+        super().__init__(max_size)
+        self.latencies: dict[str, list[float]] = {}
+
+    def push_batch(self, batch: PredictionBatch) -> None:
+        now = datetime.now(tz=timezone.utc)
+        for mac_address, timestamp in zip(batch.mac_addresses, batch.timestamps):
+            self.latencies.setdefault(mac_address, []).append(
+                (now - timestamp).total_seconds() * 1000.0
+            )
+        super().push_batch(batch)
+
+
+def _traffic(frames: int, devices: int, chatty_share: float) -> list:
+    rng = random.Random(1)
+    packets = list(synthetic_packets(frames, devices=1))
+    for packet in packets:
+        device = 0 if rng.random() < chatty_share else rng.randrange(1, devices)
+        packet.mac_address = synthetic_mac(device)
+    return packets
+
+
+async def _capacity(settings: Settings, packets: list) -> float:
+    executor = await asyncio.to_thread(InferenceExecutor.from_settings, settings)
+    batch = packets[: settings.inference_batch_size]
+    await executor.submit(batch)
+    began = time.perf_counter()
+    for _ in range(20):
+        await executor.submit(batch)
+    elapsed = time.perf_counter() - began
+    await asyncio.to_thread(executor.shutdown)
+    return 20 * len(batch) / elapsed
+
+
+async def _scenario(
+    name: str, settings: Settings, packets: list, rate: float
+) -> dict[str, Any]:
+    devices = DeviceRegistry()
+    queue = ShardedQueue(
+        1,
+        settings.queue_maxsize,
+        policy=settings.ingest_shed_policy,
+        max_delay_s=settings.ingest_max_queue_delay_ms / 1000.0,
+        on_shed=devices.record_shed,
+    )
+    executor = await asyncio.to_thread(InferenceExecutor.from_settings, settings)
+    cache = _LatencyCache(settings.prediction_cache_size)
+    pipeline = InferencePipeline(
+        queue=queue.shards[0],
+        settings=settings,
+        executor=executor,
+        cache=cache,
+        devices=devices,
+        websocket_manager=WebSocketManager(),
+    )
+    await executor.submit(packets[: settings.inference_batch_size])
+    task = asyncio.create_task(pipeline.run())
+
+    rejected = 0
+    sent = 0
+    start = time.perf_counter()
+    while sent < len(packets):
+        due = min(len(packets), int((time.perf_counter() - start) * rate) + 1)
+        now = datetime.now(tz=timezone.utc)
+        for packet in packets[sent:due]:
+            packet.timestamp = now
+            try:
+                queue.put_nowait(packet)
+            except asyncio.QueueFull:
+                rejected += 1
+        sent = due
+        await asyncio.sleep(0.002)
+    offered_seconds = time.perf_counter() - start
+    while not queue.empty():
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.5)
+    await pipeline.stop()
+    await task
+    await asyncio.to_thread(executor.shutdown)
+
+    chatty = synthetic_mac(0)
+    quiet = [value for mac, values in cache.latencies.items() if mac != chatty for value in values]
+    served = sum(len(values) for values in cache.latencies.values())
+    shed = {device.mac_address: device.shed_frames for device in devices.list()}
+    return {
+        "scenario": name,
+        "offered_fps": len(packets) / offered_seconds,
+        "served_fps": served / offered_seconds,
+        "rejected": rejected,
+        "shed_chatty": shed.get(chatty, 0),
+        "shed_quiet": sum(count for mac, count in shed.items() if mac != chatty),
+        **percentiles(quiet, prefix="quiet_ms_"),
+        **percentiles(cache.latencies.get(chatty, []), prefix="chatty_ms_"),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = write_torchscript_model(Path(tmp) / "model.ts", hidden=args.hidden)
+        base = dict(
+            redis_url="",
+            model_artifact_path=artifact,
+            inference_execution_mode="thread",
+            inference_batch_size=args.batch_size,
+            queue_maxsize=args.queue_size,
+        )
+        capacity = await _capacity(Settings(**base), list(synthetic_packets(args.batch_size)))
+        rate = capacity * args.load
+        print(f"capacity {capacity:.0f} frames/s, offering {rate:.0f} frames/s")
+        for name, policy, delay_target in SCENARIOS:
+            settings = Settings(
+                **base,
+                ingest_shed_policy=policy,
+                ingest_max_queue_delay_ms=args.max_delay_ms if delay_target else 0.0,
+            )
+            packets = _traffic(int(rate * args.duration), args.devices, args.chatty_share)
+            results.append(await _scenario(name, settings, packets, rate))
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--load", type=float, default=2.0, help="Offered load / capacity")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of load per run")
+    parser.add_argument("--devices", type=int, default=16)
+    parser.add_argument("--chatty-share", type=float, default=0.5)
+    parser.add_argument("--max-delay-ms", type=float, default=250.0)
+    parser.add_argument("--queue-size", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--hidden", type=int, default=2048, help="Model width (sets capacity)")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    results = asyncio.run(run(args))
+    report("overload", results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
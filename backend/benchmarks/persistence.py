@@ -0,0 +1,103 @@
+"""Prediction persistence throughput: ORM add/commit vs bulk insert vs write-behind.
+
+Writes inference-sized batches of predictions to a SQLite database (via aiosqlite) and
+reports rows/sec plus how long each batch blocks the caller. ``--dsn`` points the run at
+another database (e.g. a local Postgres) instead. Run from ``backend/``::
+
+    python -m benchmarks.persistence --batches 300 --batch-size 32
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from sqlalchemy import delete, func, select
+
+from app.infrastructure.postgres import create_engine, create_session_factory, dispose_engine
+from app.models.prediction import Base, PredictionORM
+from app.repositories.prediction_persister import PredictionPersister
+from app.repositories.prediction_repository import PredictionRepository
+
+from .common import percentiles, report, synthetic_records
+
+STRATEGIES = ("orm", "bulk_insert", "write_behind")
+
+
+async def _run(args: argparse.Namespace, dsn: str, strategy: str) -> dict[str, Any]:
+    engine = create_engine(dsn)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    session_factory = create_session_factory(engine)
+    async with session_factory() as session:
+        await session.execute(delete(PredictionORM))
+        await session.commit()
+
+    shared_session = session_factory()
+    repository = PredictionRepository(shared_session)
+    persister = PredictionPersister(
+        session_factory,
+        batch_size=args.flush_size,
+        flush_interval=args.flush_interval_ms / 1000.0,
+    )
+    if strategy == "write_behind":
+        persister.start()
+    sink = repository if strategy == "orm" else persister
+
+    batches = [
+        synthetic_records(args.batch_size, args.devices, offset=index * args.batch_size)
+        for index in range(args.batches)
+    ]
+    blocked: list[float] = []
+    start = time.perf_counter()
+    for records in batches:
+        began = time.perf_counter()
+        await sink.add_many(records)
+        blocked.append((time.perf_counter() - began) * 1000.0)
+        await asyncio.sleep(0)
+    await persister.stop()
+    elapsed = time.perf_counter() - start
+
+    async with session_factory() as session:
+        rows = (await session.execute(select(func.count()).select_from(PredictionORM))).scalar()
+    await shared_session.close()
+    await dispose_engine(engine)
+    return {
+        "strategy": strategy,
+        "rows": rows,
+        "rows_per_s": (args.batches * args.batch_size) / elapsed,
+        **percentiles(blocked, prefix="blocked_ms_"),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        dsn = args.dsn or f"sqlite+aiosqlite:///{Path(tmp) / 'predictions.db'}"
+        return [await _run(args, dsn, strategy) for strategy in args.strategies]
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batches", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--devices", type=int, default=16)
+    parser.add_argument("--flush-size", type=int, default=500, help="Write-behind flush rows")
+    parser.add_argument("--flush-interval-ms", type=float, default=200.0)
+    parser.add_argument("--dsn", default=None, help="SQLAlchemy async DSN (default: SQLite)")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report("persistence", asyncio.run(run(args)), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+"""Prediction cache memory and read latency: deque of records vs columnar ring buffers.
+
+Pushes ``--devices`` x ``--records`` predictions (1M by default, generated in chunks so
+only what the cache retains stays alive) into the previous deque-of-``PredictionRecord``
+cache and the columnar ``PredictionCache``. Reports retained memory per 1M predictions
+(``tracemalloc``), push cost, and per-device / global / top-100 history latency. Run
+from ``backend/``::
+
+    python -m benchmarks.prediction_cache --devices 5000 --records 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from app.schemas.prediction import PredictionRecord
+from app.services.prediction_cache import PredictionCache
+
+from .common import report, synthetic_mac
+
+
+class LegacyPredictionCache:
+    """The previous implementation: one deque of pydantic records per device."""
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._store: Dict[str, Deque[PredictionRecord]] = {}
+
+    def push(self, prediction: PredictionRecord) -> None:
+        buffer = self._store.setdefault(prediction.mac_address, deque(maxlen=self._max_size))
+        buffer.append(prediction)
+
+    def history(
+        self, mac: Optional[str] = None, limit: Optional[int] = None
+    ) -> list[PredictionRecord]:
+        if mac:
+            buffer = self._store.get(mac)
+            return list(buffer) if buffer else []
+        results: list[PredictionRecord] = []
+        for buffer in self._store.values():
+            results.extend(buffer)
+        results.sort(key=lambda record: record.timestamp, reverse=True)
+        return results[:limit]
+
+
+def records(devices: int, per_device: int, chunk: int = 10_000) -> Iterator[list]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    batch: list[PredictionRecord] = []
+    for step in range(per_device):
+        for device in range(devices):
+            batch.append(
+                PredictionRecord(
+                    mac_address=synthetic_mac(device),
+                    timestamp=start + timedelta(milliseconds=10 * step, microseconds=device),
+                    label="human",
+                    confidence=0.9,
+                    distance_m=1.5,
+                    model_version="bench",
+                    latency_ms=3.0,
+                    sequence_id=step % 4096,
+                    rssi=-55.0,
+                    noise_floor=-92.0,
+                    snr=37.0,
+                )
+            )
+            if len(batch) == chunk:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _time(func, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - began) * 1000.0)
+    return best
+
+
+def _fill(cache, args: argparse.Namespace) -> tuple[int, float]:
+    pushed = 0
+    push_seconds = 0.0
+    for batch in records(args.devices, args.records):
+        began = time.perf_counter()
+        for record in batch:
+            cache.push(record)
+        push_seconds += time.perf_counter() - began
+        pushed += len(batch)
+    return pushed, push_seconds
+
+
+def _measure(name: str, factory, args: argparse.Namespace) -> dict[str, Any]:
+    # Memory pass under tracemalloc (which slows allocation), then an untraced pass for
+    # push and read timings.
+    gc.collect()
+    tracemalloc.start()
+    cache = factory(args.records)
+    baseline = tracemalloc.get_traced_memory()[0]
+    pushed, _ = _fill(cache, args)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del cache
+    gc.collect()
+
+    cache = factory(args.records)
+    pushed, push_seconds = _fill(cache, args)
+    mac = synthetic_mac(args.devices // 2)
+    return {
+        "cache": name,
+        "predictions": pushed,
+        "mib_per_1m": retained / pushed * 1_000_000 / (1024 * 1024),
+        "push_us": push_seconds / pushed * 1e6,
+        "device_history_ms": _time(lambda: cache.history(mac), args.repeats),
+        "top100_ms": _time(lambda: cache.history(limit=100), args.repeats),
+        "global_history_ms": _time(lambda: cache.history(), 1),
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=5000)
+    parser.add_argument("--records", type=int, default=200, help="Cached records per device")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    results = [
+        _measure("deque_records", LegacyPredictionCache, args),
+        _measure("columnar", PredictionCache, args),
+    ]
+    report("prediction_cache", results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
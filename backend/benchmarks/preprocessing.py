@@ -0,0 +1,66 @@
+"""Per-frame preprocessing cost: per-packet loop versus vectorized ``preprocess_batch``.
+
+Run from ``backend/``::
+
+    python -m benchmarks.preprocessing --sizes 1 8 32 128 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from app.services import preprocessing
+
+from .common import report, synthetic_packets
+
+
+def _best_of(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes: list[int], repeat: int, subcarriers: int, antennas: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    for size in sizes:
+        packets = list(synthetic_packets(size, subcarriers=subcarriers, antennas=antennas))
+        looped = _best_of(
+            lambda: [preprocessing.preprocess_packet(packet) for packet in packets], repeat
+        )
+        batched = _best_of(lambda: preprocessing.preprocess_batch(packets), repeat)
+        results.append(
+            {
+                "batch_size": size,
+                "per_packet_us_per_frame": looped / size * 1e6,
+                "batch_us_per_frame": batched / size * 1e6,
+                "speedup": looped / batched if batched else 0.0,
+            }
+        )
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 8, 32, 64, 128, 256])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--subcarriers", type=int, default=64)
+    parser.add_argument("--antennas", type=int, default=2)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    results = run(args.sizes, args.repeat, args.subcarriers, args.antennas)
+    report("preprocessing", results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,117 @@
+"""Worker CPU cost of per-device rate limiting (``inference_frequency_hz``).
+
+Replays ``--devices`` receivers streaming at ``--stream-hz`` for ``--seconds`` of capture
+time through the worker path (``DeviceRegistry.admit`` + ``infer_packets``) with a
+TorchScript model, unlimited and with every device limited to ``--limit-hz``, both
+dropping skipped frames and folding them into a temporal window. Run from ``backend/``::
+
+    python -m benchmarks.rate_limit --devices 8 --stream-hz 100 --limit-hz 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Optional
+
+from app.schemas.device import DeviceSettingsUpdate
+from app.services.device_registry import DeviceRegistry
+from app.services.inference_engine import InferenceEngine
+from app.services.temporal_features import TemporalFeatureEngine
+from app.workers.executor import WorkerState, infer_packets
+
+from .common import report, synthetic_packets, write_torchscript_model
+
+_SUBCARRIERS = 64
+_ANTENNAS = 2
+
+
+def _stream(args: argparse.Namespace) -> list:
+    frames = int(args.devices * args.stream_hz * args.seconds)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    step = timedelta(seconds=1.0 / args.stream_hz)
+    packets = list(synthetic_packets(frames, args.devices, _SUBCARRIERS, _ANTENNAS))
+    for index, packet in enumerate(packets):
+        packet.timestamp = start + step * (index // args.devices)
+    return packets
+
+
+def _run(
+    name: str, state: WorkerState, packets: list, args: argparse.Namespace, limit: bool, fold: bool
+) -> dict[str, Any]:
+    registry = DeviceRegistry()
+    if limit:
+        for device in {packet.mac_address for packet in packets}:
+            registry.update_settings(
+                device, DeviceSettingsUpdate(inference_frequency_hz=args.limit_hz)
+            )
+    inferred = 0
+    began_cpu, began = time.process_time(), time.perf_counter()
+    for offset in range(0, len(packets), args.batch_size):
+        batch = packets[offset : offset + args.batch_size]
+        admitted = registry.admit(batch)
+        if fold:
+            inferred += len(infer_packets(state, batch, admitted).predictions)
+        else:
+            kept = [packet for packet, keep in zip(batch, admitted) if keep]
+            inferred += len(infer_packets(state, kept).predictions) if kept else 0
+    cpu = time.process_time() - began_cpu
+    return {
+        "mode": name,
+        "frames": len(packets),
+        "inferred": inferred,
+        "cpu_s": cpu,
+        "wall_s": time.perf_counter() - began,
+        "cpu_us_per_frame": cpu / len(packets) * 1e6,
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--stream-hz", type=float, default=100.0)
+    parser.add_argument("--limit-hz", type=float, default=10.0)
+    parser.add_argument("--seconds", type=float, default=10.0, help="Capture time replayed")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--window", type=int, default=16, help="Temporal window for fold mode")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    packets = _stream(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = WorkerState(
+            engine=InferenceEngine(
+                write_torchscript_model(Path(tmp) / "plain.ts", _SUBCARRIERS, _ANTENNAS),
+                "bench",
+            )
+        )
+        temporal = TemporalFeatureEngine(args.window)
+        windowed = WorkerState(
+            engine=InferenceEngine(
+                write_torchscript_model(
+                    Path(tmp) / "windowed.ts", _SUBCARRIERS * temporal.channels, _ANTENNAS
+                ),
+                "bench",
+            ),
+            temporal=temporal,
+        )
+        infer_packets(plain, packets[: args.batch_size])
+        infer_packets(windowed, packets[: args.batch_size])
+        results = [
+            _run("unlimited", plain, packets, args, limit=False, fold=False),
+            _run("limited_drop", plain, packets, args, limit=True, fold=False),
+            _run("unlimited_windowed", windowed, packets, args, limit=False, fold=False),
+            _run("limited_fold", windowed, packets, args, limit=True, fold=True),
+        ]
+    report("rate_limit", results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
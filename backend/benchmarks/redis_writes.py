@@ -0,0 +1,138 @@
+"""Redis round trips and pipeline blocking time per inference batch.
+
+Writes prediction batches to an in-memory fakeredis server wrapped with a simulated
+network round-trip time, comparing the old one-``SET``-per-record loop with the
+pipelined writer (inline and background). Run from ``backend/``::
+
+    python -m benchmarks.redis_writes --batches 200 --rtt-ms 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+from fakeredis import FakeServer
+from fakeredis.aioredis import FakeRedis
+
+from app.schemas.prediction import PredictionRecord
+from app.services.prediction_batch import PredictionBatch
+from app.services.redis_writer import RedisPredictionWriter
+
+from .common import percentiles, report, synthetic_records
+
+STRATEGIES = ("per_record", "pipelined", "background")
+
+
+class _CountingPipeline:
+    def __init__(self, owner: "CountingRedis", pipeline: Any) -> None:
+        self._owner = owner
+        self._pipeline = pipeline
+
+    async def __aenter__(self) -> "_CountingPipeline":
+        await self._pipeline.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self._pipeline.__aexit__(*exc_info)
+
+    def set(self, *args: Any, **kwargs: Any) -> "_CountingPipeline":
+        self._pipeline.set(*args, **kwargs)
+        return self
+
+    async def execute(self) -> Any:
+        await self._owner.round_trip()
+        return await self._pipeline.execute()
+
+
+class CountingRedis:
+    """Forward to fakeredis, charging one simulated RTT per command or pipeline."""
+
+    def __init__(self, inner: FakeRedis, rtt: float) -> None:
+        self._inner = inner
+        self._rtt = rtt
+        self.round_trips = 0
+
+    async def round_trip(self) -> None:
+        self.round_trips += 1
+        await asyncio.sleep(self._rtt)
+
+    async def set(self, *args: Any, **kwargs: Any) -> Any:
+        await self.round_trip()
+        return await self._inner.set(*args, **kwargs)
+
+    def pipeline(self, transaction: bool = True) -> _CountingPipeline:
+        return _CountingPipeline(self, self._inner.pipeline(transaction=transaction))
+
+
+async def _legacy_write(
+    redis: CountingRedis, records: list[PredictionRecord], ttl: int
+) -> None:
+    for record in records:
+        key = f"prediction:{record.mac_address}"
+        payload = orjson.dumps(record.model_dump(mode="json")).decode("utf-8")
+        await redis.set(key, payload, ex=ttl)
+
+
+async def _run(args: argparse.Namespace, strategy: str) -> dict[str, Any]:
+    inner = FakeRedis(server=FakeServer(), decode_responses=True)
+    redis = CountingRedis(inner, args.rtt_ms / 1000.0)
+    writer = RedisPredictionWriter(
+        redis, ttl_seconds=60, background=strategy == "background"  # type: ignore[arg-type]
+    )
+    writer.start()
+
+    blocked: list[float] = []
+    for batch in range(args.batches):
+        offset = batch * args.batch_size
+        records = synthetic_records(args.batch_size, args.devices, offset=offset)
+        batch_columns = PredictionBatch.from_records(records)
+        began = time.perf_counter()
+        if strategy == "per_record":
+            await _legacy_write(redis, records, 60)
+        else:
+            await writer.write(batch_columns)
+        blocked.append((time.perf_counter() - began) * 1000.0)
+        await asyncio.sleep(args.interval_ms / 1000.0)
+
+    await writer.stop()
+    keys = len(await inner.keys("prediction:*"))
+    await inner.aclose()
+    return {
+        "strategy": strategy,
+        "batches": args.batches,
+        "round_trips": redis.round_trips,
+        "round_trips_per_batch": redis.round_trips / args.batches,
+        "keys": keys,
+        **percentiles(blocked, prefix="blocked_ms_"),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    return [await _run(args, strategy) for strategy in args.strategies]
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--rtt-ms", type=float, default=0.5, help="Simulated network RTT")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Gap between batches")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report("redis_writes", asyncio.run(run(args)), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
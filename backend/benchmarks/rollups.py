@@ -0,0 +1,172 @@
+"""Long-range summary latency: aggregating raw predictions vs reading rollups.
+
+Fills a SQLite database with ``--rows`` predictions spread evenly over ``--days`` days
+plus the matching per-minute/per-hour rollups, then times, for each range, a ``GROUP BY``
+over the raw rows against ``PredictionRepository.aggregates`` at the resolution the API
+would pick. Run from ``backend/``::
+
+    python -m benchmarks.rollups --rows 1000000 --days 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import create_engine as create_sync_engine
+from sqlalchemy import func, select
+
+from app.infrastructure.postgres import create_engine, create_session_factory, dispose_engine
+from app.models.prediction import Base, PredictionORM
+from app.models.rollup import ROLLUP_MODELS
+from app.repositories.prediction_repository import PredictionRepository
+from app.repositories.prediction_rollups import aggregate_rows, choose_resolution
+
+from .common import report, synthetic_mac
+
+_LABELS = ("empty", "human", "object", "unknown")
+_SQLITE_DATETIME = "%Y-%m-%d %H:%M:%S.%f"
+_START = datetime(2025, 1, 1)
+
+
+def _rows(rows: int, days: int, devices: int) -> Iterator[Dict[str, Any]]:
+    step = timedelta(days=days) / rows
+    for index in range(rows):
+        rssi = -50.0 - index % 30
+        snr = 20.0 + index % 10
+        yield {
+            "mac_address": synthetic_mac(index % devices),
+            "timestamp": _START + step * index,
+            "label": _LABELS[index % len(_LABELS)],
+            "confidence": 0.5 + (index % 50) / 100.0,
+            "distance_m": 1.5,
+            "model_version": "bench",
+            "latency_ms": 3.0,
+            "sequence_id": index % 4096,
+            "rssi": rssi,
+            "noise_floor": rssi - snr,
+            "snr": snr,
+        }
+
+
+def _insert_many(
+    connection: sqlite3.Connection, table: str, rows: Iterator[Dict[str, Any]]
+) -> None:
+    first = next(rows, None)
+    if first is None:
+        return
+    columns = list(first)
+    statement = (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    )
+
+    def values(row: Dict[str, Any]) -> tuple:
+        return tuple(
+            value.strftime(_SQLITE_DATETIME) if isinstance(value, datetime) else value
+            for value in (row[column] for column in columns)
+        )
+
+    connection.execute(statement, values(first))
+    connection.executemany(statement, (values(row) for row in rows))
+
+
+def populate(path: Path, rows: int, days: int, devices: int) -> None:
+    engine = create_sync_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    with sqlite3.connect(path) as connection:
+        connection.execute("PRAGMA journal_mode=OFF")
+        connection.execute("PRAGMA synchronous=OFF")
+        _insert_many(connection, "predictions", _rows(rows, days, devices))
+        for resolution, model in ROLLUP_MODELS.items():
+            rollups = aggregate_rows(_rows(rows, days, devices), resolution)
+            _insert_many(connection, model.__tablename__, iter(rollups))
+        connection.execute("ANALYZE")
+
+
+async def _time(coro_factory, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        await coro_factory()
+        best = min(best, (time.perf_counter() - began) * 1000.0)
+    return best
+
+
+async def _measure(path: Path, args: argparse.Namespace) -> list[dict[str, Any]]:
+    engine = create_engine(f"sqlite+aiosqlite:///{path}")
+    session = create_session_factory(engine)()
+    repository = PredictionRepository(session)
+    end = _START + timedelta(days=args.days)
+    results: list[dict[str, Any]] = []
+    for hours in args.ranges:
+        start = max(_START, end - timedelta(hours=hours))
+        raw_query = (
+            select(
+                PredictionORM.label,
+                func.count(),
+                func.avg(PredictionORM.confidence),
+                func.avg(PredictionORM.rssi),
+                func.avg(PredictionORM.snr),
+            )
+            .where(PredictionORM.timestamp >= start, PredictionORM.timestamp < end)
+            .group_by(PredictionORM.label)
+        )
+        resolution = choose_resolution(start, end, args.max_points)
+
+        async def raw() -> None:
+            (await session.execute(raw_query)).all()
+
+        async def rollup() -> list:
+            return await repository.aggregates(start, end, resolution)
+
+        raw_ms = await _time(raw, args.repeats)
+        rollup_ms = await _time(rollup, args.repeats)
+        buckets = await rollup()
+        results.append(
+            {
+                "range_hours": hours,
+                "raw_rows": sum(bucket.count for bucket in buckets),
+                "resolution": resolution,
+                "buckets": len(buckets),
+                "raw_ms": raw_ms,
+                "rollup_ms": rollup_ms,
+            }
+        )
+    await session.close()
+    await dispose_engine(engine)
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--devices", type=int, default=16)
+    parser.add_argument("--ranges", type=int, nargs="+", default=[1, 24, 168, 720])
+    parser.add_argument("--max-points", type=int, default=500)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--database", type=Path, default=None, help="Reuse/keep this SQLite file")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.database or Path(tmp) / "rollups.db"
+        if not path.exists():
+            populate(path, args.rows, args.days, args.devices)
+        results = asyncio.run(_measure(path, args))
+    report("rollups", results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
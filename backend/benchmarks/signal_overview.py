@@ -0,0 +1,132 @@
+"""``/signal/overview`` cost: recomputing from cached history vs running aggregates.
+
+Fills a ``PredictionCache`` with ``--devices`` x ``--records`` predictions (dropping
+every ``--loss-every``-th sequence ID), then times the previous implementation, which
+copied and sorted ``cache.history()`` and averaged Python lists on every request,
+against ``cache.signal.overview()``. Also reports what maintaining the aggregates adds
+to each push. Run from ``backend/``::
+
+    python -m benchmarks.signal_overview --devices 1000 --records 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from statistics import mean
+from typing import Any, Optional
+
+from app.schemas.prediction import PredictionRecord
+from app.schemas.signal import SignalOverview
+from app.services.prediction_cache import PredictionCache
+
+from .common import report, synthetic_mac
+
+
+def legacy_overview(cache: PredictionCache) -> SignalOverview:
+    history = cache.history()
+    rssi_values = [record.rssi for record in history if record.rssi is not None]
+    noise_values = [record.noise_floor for record in history if record.noise_floor is not None]
+    snr_values = [record.snr for record in history if record.snr is not None]
+    latency_values = [record.latency_ms for record in history]
+
+    def avg(values: list[float]) -> float:
+        return float(mean(values)) if values else 0.0
+
+    return SignalOverview(
+        average_rssi=avg(rssi_values),
+        average_noise_floor=avg(noise_values),
+        average_snr=avg(snr_values),
+        packet_loss_percentage=0.0,
+        inference_latency_ms=sorted(latency_values)[:50],
+    )
+
+
+def build_records(devices: int, records: int, loss_every: int) -> list[PredictionRecord]:
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    items: list[PredictionRecord] = []
+    for device in range(devices):
+        mac_address = synthetic_mac(device)
+        sequence = 0
+        for index in range(records):
+            sequence += 2 if loss_every and index % loss_every == loss_every - 1 else 1
+            rssi = -50.0 - (index + device) % 30
+            items.append(
+                PredictionRecord(
+                    mac_address=mac_address,
+                    timestamp=start + timedelta(milliseconds=10 * index),
+                    label="human",
+                    confidence=0.9,
+                    distance_m=1.5,
+                    model_version="bench",
+                    latency_ms=1.0 + (index * 7 + device) % 40 / 4.0,
+                    sequence_id=sequence % 4096,
+                    rssi=rssi,
+                    noise_floor=-92.0,
+                    snr=rssi + 92.0,
+                )
+            )
+    return items
+
+
+def _time(func, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        began = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - began) * 1000.0)
+    return best
+
+
+def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    records = build_records(args.devices, args.records, args.loss_every)
+    cache = PredictionCache(args.records)
+    began = time.perf_counter()
+    cache.bulk_push(records)
+    push_us = (time.perf_counter() - began) / len(records) * 1e6
+
+    # Same pushes without the running aggregates, to isolate their per-record cost.
+    plain = PredictionCache(args.records)
+    plain.signal.add = lambda record: None  # type: ignore[method-assign]
+    began = time.perf_counter()
+    plain.bulk_push(records)
+    plain_push_us = (time.perf_counter() - began) / len(records) * 1e6
+
+    legacy = legacy_overview(cache)
+    current = cache.signal.overview()
+    return [
+        {
+            "implementation": "recompute_history",
+            "overview_ms": _time(lambda: legacy_overview(cache), args.repeats),
+            "push_us": plain_push_us,
+            "average_rssi": legacy.average_rssi,
+        },
+        {
+            "implementation": "running_aggregates",
+            "overview_ms": _time(lambda: cache.signal.overview(), args.repeats),
+            "push_us": push_us,
+            "average_rssi": current.average_rssi,
+        },
+    ]
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--records", type=int, default=200, help="Cached records per device")
+    parser.add_argument("--loss-every", type=int, default=50, help="Skip one sequence ID per N")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report("signal_overview", run(args), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
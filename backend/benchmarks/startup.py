@@ -0,0 +1,92 @@
+"""Startup phases and first-batch latency with and without warm-up and inference optimization.
+
+For each configuration a fresh executor loads a TorchScript model (``InferenceExecutor.start``)
+and then runs ``--first`` batches of mixed sizes, as traffic arriving right after readiness
+would, followed by ``--steady`` more. Without warm-up the first batch of every new size pays
+TorchScript's profiling passes. ``torch_import`` is near zero here because writing the
+model already imported torch.
+Run from ``backend/``::
+
+    python -m benchmarks.startup --batch-size 32 --hidden 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import Settings
+from app.workers.executor import InferenceExecutor
+
+from .common import percentiles, report, synthetic_packets, write_torchscript_model
+
+CONFIGURATIONS = (
+    ("cold", False, False),
+    ("warm", True, False),
+    ("warm_optimized", True, True),
+)
+
+
+async def _run(
+    name: str, settings: Settings, packets: list, args: argparse.Namespace
+) -> dict[str, Any]:
+    executor = InferenceExecutor.from_settings(settings)
+    timings = await executor.start(warmup=settings.inference_warmup)
+    rng = random.Random(0)
+    latencies: list[float] = []
+    for _ in range(args.first + args.steady):
+        size = rng.randint(1, settings.inference_batch_size)
+        offset = rng.randrange(0, len(packets) - size)
+        result = await executor.submit(packets[offset : offset + size])
+        latencies.append(result.seconds * 1000.0)
+    await asyncio.to_thread(executor.shutdown)
+    return {
+        "config": name,
+        **{f"{phase}_ms": seconds * 1000.0 for phase, seconds in timings.items()},
+        **percentiles(latencies[: args.first], prefix="first_ms_"),
+        **percentiles(latencies[args.first :], prefix="steady_ms_"),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    packets = list(synthetic_packets(4 * args.batch_size))
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = write_torchscript_model(Path(tmp) / "model.ts", hidden=args.hidden)
+        for name, warmup, optimize in CONFIGURATIONS:
+            settings = Settings(
+                redis_url="",
+                model_artifact_path=artifact,
+                inference_execution_mode="thread",
+                inference_batch_size=args.batch_size,
+                inference_warmup=warmup,
+                model_optimize_for_inference=optimize,
+            )
+            row = await _run(name, settings, packets, args)
+            row.setdefault("warmup_ms", 0.0)
+            results.append(row)
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--hidden", type=int, default=1024, help="Model width")
+    parser.add_argument("--first", type=int, default=20, help="Batches right after startup")
+    parser.add_argument("--steady", type=int, default=200, help="Batches measured afterwards")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report("startup", asyncio.run(run(args)), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
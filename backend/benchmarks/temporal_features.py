@@ -0,0 +1,78 @@
+"""Per-frame cost of incremental sliding-window features versus recomputing the window.
+
+Run from ``backend/``::
+
+    python -m benchmarks.temporal_features --windows 16 64 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+from app.services.temporal_features import TemporalFeatureEngine
+
+from .common import report
+
+
+def _recompute(frames: np.ndarray, doppler_bins: int) -> np.ndarray:
+    ordered = frames.astype(np.float64)
+    doppler = np.abs(np.fft.fft(ordered, axis=0)[1 : doppler_bins + 1]) / len(frames)
+    return np.concatenate(
+        [ordered[-1:], ordered.mean(axis=0)[None], ordered.std(axis=0)[None], doppler]
+    ).astype(np.float32)
+
+
+def run(
+    windows: list[int], frames: int, doppler_bins: int, subcarriers: int, antennas: int
+) -> list[dict[str, Any]]:
+    rng = np.random.default_rng(0)
+    stream = rng.standard_normal((frames, subcarriers, antennas)).astype(np.float32)
+    results: list[dict[str, Any]] = []
+    for window in windows:
+        engine = TemporalFeatureEngine(window, doppler_bins=doppler_bins)
+        start = time.perf_counter()
+        for frame in stream:
+            engine.push("24:0a:c4:00:00:01", frame, now=0.0).features()
+        incremental = (time.perf_counter() - start) / frames
+
+        start = time.perf_counter()
+        for index in range(frames):
+            _recompute(stream[max(0, index - window + 1) : index + 1], doppler_bins)
+        recomputed = (time.perf_counter() - start) / frames
+
+        results.append(
+            {
+                "window": window,
+                "incremental_us_per_frame": incremental * 1e6,
+                "recompute_us_per_frame": recomputed * 1e6,
+                "bytes_per_device": engine.nbytes,
+            }
+        )
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--doppler-bins", type=int, default=4)
+    parser.add_argument("--subcarriers", type=int, default=64)
+    parser.add_argument("--antennas", type=int, default=2)
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    results = run(args.windows, args.frames, args.doppler_bins, args.subcarriers, args.antennas)
+    report("temporal_features", results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,157 @@
+"""Pipeline stall time while broadcasting predictions to many websocket clients.
+
+Connects fake clients (a fraction of them slow) to a ``WebSocketManager`` and measures
+how long each pipeline batch is blocked in the broadcast call, compared with the old
+per-record, sequential-send broadcast. Run from ``backend/``::
+
+    python -m benchmarks.websocket_fanout --clients 300 --slow-fraction 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from app.schemas.prediction import PredictionRecord
+from app.services.prediction_batch import PredictionBatch
+from app.services.websocket_manager import WebSocketManager
+
+from .common import percentiles, report, synthetic_records
+
+POLICIES = ("drop_oldest", "conflate", "disconnect")
+
+
+class FakeWebSocket:
+    """Minimal stand-in for ``fastapi.WebSocket`` with a fixed per-send latency."""
+
+    def __init__(self, send_delay: float) -> None:
+        self._send_delay = send_delay
+        self.frames = 0
+        self.bytes_sent = 0
+        self.closed = False
+
+    async def accept(self) -> None:
+        return None
+
+    async def send_text(self, payload: str) -> None:
+        if self._send_delay:
+            await asyncio.sleep(self._send_delay)
+        else:
+            await asyncio.sleep(0)
+        self.frames += 1
+        self.bytes_sent += len(payload)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class LegacyBroadcaster:
+    """The previous behaviour: one JSON dump and one awaited send per record per client."""
+
+    def __init__(self, clients: list[FakeWebSocket]) -> None:
+        self._clients = clients
+
+    async def broadcast_batch(self, records: list[PredictionRecord]) -> None:
+        for record in records:
+            payload = json.dumps(record.model_dump(mode="json"), default=str)
+            for client in self._clients:
+                await client.send_text(payload)
+
+
+def _clients(count: int, slow_fraction: float, slow_delay: float) -> list[FakeWebSocket]:
+    slow = int(count * slow_fraction)
+    return [FakeWebSocket(slow_delay if index < slow else 0.0) for index in range(count)]
+
+
+async def _drive(broadcaster: Any, batches: int, batch_size: int, devices: int, interval: float):
+    stalls: list[float] = []
+    start = time.perf_counter()
+    for index in range(batches):
+        records: Any = synthetic_records(batch_size, devices, offset=index * batch_size)
+        if isinstance(broadcaster, WebSocketManager):
+            records = PredictionBatch.from_records(records)
+        began = time.perf_counter()
+        await broadcaster.broadcast_batch(records)
+        stalls.append((time.perf_counter() - began) * 1000.0)
+        await asyncio.sleep(interval)
+    return stalls, time.perf_counter() - start
+
+
+async def _run_legacy(args: argparse.Namespace) -> dict[str, Any]:
+    clients = _clients(args.clients, args.slow_fraction, args.slow_delay_ms / 1000.0)
+    batches = args.legacy_batches  # the sequential path is far too slow for a full run
+    stalls, elapsed = await _drive(
+        LegacyBroadcaster(clients),
+        batches,
+        args.batch_size,
+        args.devices,
+        args.interval_ms / 1000.0,
+    )
+    return {
+        "broadcaster": "legacy",
+        "batches": batches,
+        "frames_sent": sum(client.frames for client in clients),
+        "clients_connected": len(clients),
+        "elapsed_s": elapsed,
+        **percentiles(stalls, prefix="stall_ms_"),
+    }
+
+
+async def _run_manager(args: argparse.Namespace, policy: str) -> dict[str, Any]:
+    manager = WebSocketManager(max_pending=args.queue_size, policy=policy)  # type: ignore[arg-type]
+    clients = _clients(args.clients, args.slow_fraction, args.slow_delay_ms / 1000.0)
+    for client in clients:
+        await manager.connect(client)  # type: ignore[arg-type]
+    stalls, elapsed = await _drive(
+        manager, args.batches, args.batch_size, args.devices, args.interval_ms / 1000.0
+    )
+    await asyncio.sleep(args.slow_delay_ms / 1000.0 * 2)
+    connected = await manager.count()
+    for client in clients:
+        await manager.disconnect(client)  # type: ignore[arg-type]
+    return {
+        "broadcaster": f"queued/{policy}",
+        "batches": args.batches,
+        "frames_sent": sum(client.frames for client in clients),
+        "clients_connected": connected,
+        "elapsed_s": elapsed,
+        **percentiles(stalls, prefix="stall_ms_"),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    results = [await _run_manager(args, policy) for policy in args.policies]
+    if not args.skip_legacy:
+        results.append(await _run_legacy(args))
+    return results
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--slow-fraction", type=float, default=0.1)
+    parser.add_argument("--slow-delay-ms", type=float, default=20.0, help="Per-send latency")
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--devices", type=int, default=16)
+    parser.add_argument("--interval-ms", type=float, default=10.0, help="Gap between batches")
+    parser.add_argument("--queue-size", type=int, default=32, help="Per-client send queue")
+    parser.add_argument("--policies", nargs="+", choices=POLICIES, default=list(POLICIES))
+    parser.add_argument("--legacy-batches", type=int, default=2)
+    parser.add_argument("--skip-legacy", action="store_true")
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report("websocket_fanout", asyncio.run(run(args)), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,85 @@
+"""Broadcast cost when every websocket client watches a different device.
+
+Connects one client per device and routes prediction batches through the
+``WebSocketManager`` subscription index, compared with every client receiving the full
+stream. Reports the CPU time of each broadcast call and the bytes delivered per client.
+Run from ``backend/``::
+
+    python -m benchmarks.websocket_subscriptions --clients 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from app.schemas.stream import StreamSubscription
+from app.services.prediction_batch import PredictionBatch
+from app.services.websocket_manager import WebSocketManager
+
+from .common import percentiles, report, synthetic_mac, synthetic_records
+from .websocket_fanout import FakeWebSocket
+
+SCENARIOS = ("per_device", "unfiltered")
+
+
+async def _run(args: argparse.Namespace, scenario: str) -> dict[str, Any]:
+    manager = WebSocketManager(max_pending=args.batches + 1)
+    clients = [FakeWebSocket(0.0) for _ in range(args.clients)]
+    for index, client in enumerate(clients):
+        subscription = StreamSubscription()
+        if scenario == "per_device":
+            subscription = StreamSubscription(mac_addresses=[synthetic_mac(index)])
+        await manager.connect(client, subscription)  # type: ignore[arg-type]
+
+    costs: list[float] = []
+    for batch in range(args.batches):
+        offset = batch * args.batch_size
+        records = synthetic_records(args.batch_size, args.clients, offset=offset)
+        batch_columns = PredictionBatch.from_records(records)
+        began = time.perf_counter()
+        await manager.broadcast_batch(batch_columns)
+        costs.append((time.perf_counter() - began) * 1000.0)
+        # Let the writer tasks drain so their cost is not attributed to the next batch.
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    await asyncio.sleep(0.05)
+    for client in clients:
+        await manager.disconnect(client)  # type: ignore[arg-type]
+    records_sent = args.batches * args.batch_size
+    return {
+        "scenario": scenario,
+        "clients": args.clients,
+        "records": records_sent,
+        "frames_sent": sum(client.frames for client in clients),
+        "kib_per_client": sum(client.bytes_sent for client in clients) / 1024 / args.clients,
+        **percentiles(costs, prefix="broadcast_ms_"),
+    }
+
+
+async def run(args: argparse.Namespace) -> list[dict[str, Any]]:
+    return [await _run(args, scenario) for scenario in args.scenarios]
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=500, help="Clients (one device each)")
+    parser.add_argument("--batches", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--output", type=Path, default=None, help="Write JSON results to this path")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    report("websocket_subscriptions", asyncio.run(run(args)), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
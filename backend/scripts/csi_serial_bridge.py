@@ -1,27 +1,80 @@
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
 import logging
 import os
 import sys
+import threading
 import time
-from typing import Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import httpx
+import orjson
 import serial
 
 DEFAULT_PREFIX = "CSI_JSON:"
+BATCH_PATH = "/csi/batch"
+STATS_INTERVAL_S = 10.0
+READER_RESTART_S = 2.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# The backend refuses the whole batch with these; halving it isolates the culprit.
+SPLIT_STATUSES = (413, 422)
+FrameKey = Tuple[str, int]
+
+
+class Frame(NamedTuple):
+    key: FrameKey
+    payload: bytes
+
+
+def _number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def frame_key(frame: Any) -> FrameKey:
+    """Check a decoded frame the way the backend's ``CSIPacket`` does; returns its key.
+
+    Raises ``ValueError`` for frames the backend would answer with 422, so a bad line
+    is dropped on its own instead of failing the batch it would be sent in.
+    """
+
+    if not isinstance(frame, dict):
+        raise ValueError("frame is not an object")
+    mac = frame.get("mac_address")
+    if not isinstance(mac, str):
+        raise ValueError("mac_address missing")
+    mac = mac.replace("-", ":").lower()
+    parts = mac.split(":")
+    if len(parts) != 6 or any(len(part) != 2 for part in parts):
+        raise ValueError("mac_address must contain 6 octets")
+    sequence_id = frame.get("sequence_id")
+    if not isinstance(sequence_id, int) or isinstance(sequence_id, bool) or sequence_id < 0:
+        raise ValueError("sequence_id must be a non-negative integer")
+    if not isinstance(frame.get("timestamp"), (str, int, float)):
+        raise ValueError("timestamp missing")
+    for field in ("rssi", "noise_floor", "snr"):
+        if frame.get(field) is not None and not _number(frame[field]):
+            raise ValueError(f"{field} must be a number")
+    csi = frame.get("csi")
+    if not isinstance(csi, list) or not csi or not all(isinstance(row, list) for row in csi):
+        raise ValueError("csi must be a non-empty matrix")
+    width = len(csi[0])
+    if any(len(row) != width or not all(_number(value) for value in row) for row in csi):
+        raise ValueError("csi rows must be numbers of the same length")
+    return mac, sequence_id
 
 
 def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="Forward CSI JSON lines from an ESP32 serial port into the FastAPI backend.",
+        description="Forward CSI JSON lines from ESP32 serial ports into the FastAPI backend.",
     )
     parser.add_argument(
         "--port",
-        default=os.getenv("CSI_SERIAL_PORT", "COM5"),
-        help="Serial port exposing the receiver (default: %(default)s)",
+        action="append",
+        default=None,
+        help="Serial port exposing a receiver; repeat for several receivers "
+        "(default: $CSI_SERIAL_PORT or COM5)",
     )
     parser.add_argument(
         "--baud",
@@ -43,57 +96,257 @@ def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
         "--retry",
         type=float,
         default=float(os.getenv("CSI_HTTP_RETRY", "0.5")),
-        help="Delay in seconds before retrying after an HTTP failure (default: %(default)s)",
+        help="Initial delay in seconds before retrying a failed batch; doubles per attempt "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-retry-delay",
+        type=float,
+        default=8.0,
+        help="Upper bound for the retry backoff in seconds (default: %(default)s)",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=5,
+        help="Attempts per batch before its frames are dropped; 0 retries forever "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=64,
+        help="Frames per POST; keep at or below the backend's CSI_CSI_BATCH_MAX_FRAMES "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--linger-ms",
+        type=float,
+        default=20.0,
+        help="How long to wait for a batch to fill before sending it (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--buffer-size",
+        type=int,
+        default=10_000,
+        help="Frames buffered while the backend is slow; the oldest are dropped beyond "
+        "this (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=2,
+        help="Concurrent POSTs over the keep-alive pool (default: %(default)s)",
+    )
+    args = parser.parse_args(argv)
+    if not args.port:
+        args.port = [os.getenv("CSI_SERIAL_PORT", "COM5")]
+    return args
 
 
-def forward_stream(args: argparse.Namespace) -> None:
-    logging.info(
-        "Starting serial bridge on %s @ %d baud -> %s",
-        args.port,
-        args.baud,
-        args.backend,
-    )
+class SerialBridge:
+    """Read CSI lines from serial ports and forward them to ``/csi/batch`` in batches.
+
+    Each port has a reader task that runs the blocking pyserial reads in a worker thread,
+    which only parses lines and hands payloads to the event loop, so reads never wait on
+    HTTP. The task restarts its reader after any error, so one failing port does not
+    stop the others. Lines are checked against the backend's frame schema as they are
+    read, so a malformed frame is dropped alone. Payloads wait in a bounded buffer that
+    drops the oldest frame when full. Sender tasks drain it into batches of up to
+    ``batch_size`` frames (or whatever arrived within ``linger_ms``) and POST them over
+    a shared keep-alive connection pool. A failed batch is retried with exponential
+    backoff by its sender while reading carries on, as are the frames of an accepted
+    batch that the backend's queue rejected; the backend drops frames it already has,
+    so retries are safe. A batch refused as too large or invalid is halved until the
+    offending frames are isolated.
+    """
+
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self._args = args
+        self._transport = transport
+        self._prefix = args.prefix.encode("utf-8")
+        self._buffer: asyncio.Queue[Frame] = asyncio.Queue(maxsize=max(1, args.buffer_size))
+        self._stop = threading.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.read = 0
+        self.sent = 0
+        self.dropped = 0
+        self.malformed = 0
+        self.rejected = 0
+        self.failed_posts = 0
+
+    async def run(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        connections = max(1, self._args.connections)
+        limits = httpx.Limits(
+            max_connections=connections, max_keepalive_connections=connections
+        )
+        async with httpx.AsyncClient(
+            base_url=self._args.backend,
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            limits=limits,
+            transport=self._transport,
+        ) as client:
+            tasks = [
+                asyncio.create_task(self._reader(port), name=f"read-{port}")
+                for port in self._args.port
+            ]
+            tasks.extend(
+                asyncio.create_task(self._send(client), name=f"send-{index}")
+                for index in range(connections)
+            )
+            tasks.append(asyncio.create_task(self._report(), name="stats"))
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                self._stop.set()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def _reader(self, port: str) -> None:
+        while not self._stop.is_set():
+            try:
+                await asyncio.to_thread(self._read_port, port)
+            except Exception:
+                logging.exception("Reader for %s failed, restarting", port)
+                await asyncio.sleep(READER_RESTART_S)
+
+    def _read_port(self, port: str) -> None:
+        logging.info("Reading %s @ %d baud -> %s", port, self._args.baud, self._args.backend)
+        while not self._stop.is_set():
+            try:
+                with serial.Serial(port, self._args.baud, timeout=1) as ser:
+                    while not self._stop.is_set():
+                        frame = self._parse(ser.readline())
+                        if frame is not None:
+                            assert self._loop is not None
+                            self._loop.call_soon_threadsafe(self._offer, frame)
+            except serial.SerialException as exc:
+                logging.error("Serial connection error on %s: %s", port, exc)
+                self._stop.wait(READER_RESTART_S)
+
+    def _parse(self, raw: bytes) -> Optional[Frame]:
+        line = raw.strip()
+        if not line.startswith(self._prefix):
+            return None
+        payload = line[len(self._prefix) :]
+        try:
+            # Validate only; the raw text is forwarded as is.
+            key = frame_key(orjson.loads(payload))
+        except (orjson.JSONDecodeError, ValueError) as exc:
+            self.malformed += 1
+            logging.warning("Malformed frame from serial (%s): %s", exc, payload[:80])
+            return None
+        return Frame(key, payload)
+
+    def _offer(self, frame: Frame) -> None:
+        self.read += 1
+        if self._buffer.full():
+            self._buffer.get_nowait()
+            self.dropped += 1
+        self._buffer.put_nowait(frame)
+
+    async def _next_batch(self) -> List[Frame]:
+        batch = [await self._buffer.get()]
+        deadline = time.monotonic() + self._args.linger_ms / 1000.0
+        while len(batch) < self._args.batch_size:
+            try:
+                batch.append(self._buffer.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._buffer.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _send(self, client: httpx.AsyncClient) -> None:
+        while True:
+            batch = await self._next_batch()
+            await self._post(client, batch)
+
+    async def _post(self, client: httpx.AsyncClient, batch: List[Frame]) -> None:
+        delay = self._args.retry
+        attempt = 0
+        while True:
+            attempt += 1
+            body = b'{"packets":[' + b",".join(frame.payload for frame in batch) + b"]}"
+            try:
+                response = await client.post(
+                    BATCH_PATH, content=body, headers={"content-type": "application/json"}
+                )
+            except httpx.HTTPError as exc:
+                logging.warning("HTTP post failed: %s", exc)
+            else:
+                if response.status_code < 400:
+                    batch = self._rejected(batch, response)
+                    if not batch:
+                        return
+                    logging.warning("Backend queue full, retrying %d frames", len(batch))
+                elif response.status_code in SPLIT_STATUSES and len(batch) > 1:
+                    half = len(batch) // 2
+                    await self._post(client, batch[:half])
+                    await self._post(client, batch[half:])
+                    return
+                elif response.status_code not in RETRY_STATUSES:
+                    # The frames themselves are bad; retrying will not help.
+                    logging.warning(
+                        "Backend refused batch of %d: %d %s",
+                        len(batch),
+                        response.status_code,
+                        response.text[:200],
+                    )
+                    self.dropped += len(batch)
+                    return
+                else:
+                    logging.warning("Backend busy (%d), retrying batch", response.status_code)
+            self.failed_posts += 1
+            if self._args.max_attempts and attempt >= self._args.max_attempts:
+                self.dropped += len(batch)
+                return
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self._args.max_retry_delay)
+
+    def _rejected(self, batch: List[Frame], response: httpx.Response) -> List[Frame]:
+        """Count an accepted batch; returns its frames the backend's queue rejected."""
 
-    while True:
         try:
-            with serial.Serial(args.port, args.baud, timeout=1) as ser, httpx.Client(
-                base_url=args.backend,
-                timeout=httpx.Timeout(10.0, connect=5.0),
-            ) as client:
-                while True:
-                    raw = ser.readline()
-                    if not raw:
-                        continue
-                    try:
-                        text = raw.decode("utf-8", errors="ignore").strip()
-                    except UnicodeDecodeError:
-                        logging.debug("Skipping undecodable line")
-                        continue
-
-                    if not text.startswith(args.prefix):
-                        continue
-
-                    payload_text = text[len(args.prefix) :]
-                    try:
-                        payload = json.loads(payload_text)
-                    except json.JSONDecodeError:
-                        logging.warning("Malformed JSON from serial: %s", payload_text[:80])
-                        continue
-
-                    try:
-                        response = client.post("/csi", json=payload)
-                        response.raise_for_status()
-                    except httpx.HTTPError as exc:
-                        logging.warning("HTTP post failed: %s", exc)
-                        time.sleep(args.retry)
-        except serial.SerialException as exc:
-            logging.error("Serial connection error: %s", exc)
-            time.sleep(2.0)
-        except KeyboardInterrupt:
-            logging.info("Interrupted, stopping")
-            break
+            body: Dict[str, Any] = response.json()
+            refs = body.get("rejected_frames") or []
+            keys = {(ref["mac_address"], ref["sequence_id"]) for ref in refs}
+        except (ValueError, AttributeError, KeyError, TypeError):
+            keys = set()
+        rejected = [frame for frame in batch if frame.key in keys]
+        self.sent += len(batch) - len(rejected)
+        self.rejected += len(rejected)
+        return rejected
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(STATS_INTERVAL_S)
+            logging.info(
+                "read=%d sent=%d rejected=%d dropped=%d malformed=%d failed_posts=%d "
+                "buffered=%d",
+                self.read,
+                self.sent,
+                self.rejected,
+                self.dropped,
+                self.malformed,
+                self.failed_posts,
+                self._buffer.qsize(),
+            )
 
 
 def main(argv: Optional[list[str]] = None) -> int:
@@ -101,8 +354,16 @@ def main(argv: Optional[list[str]] = None) -> int:
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(message)s",
     )
+    # httpx logs every request at INFO; at CSI rates that drowns the bridge's own logs.
+    logging.getLogger("httpx").setLevel(logging.WARNING)
     args = parse_args(argv)
-    forward_stream(args)
+    bridge = SerialBridge(args)
+    try:
+        asyncio.run(bridge.run())
+    except KeyboardInterrupt:
+        logging.info("Interrupted, stopping")
+    finally:
+        bridge.stop()
     return 0
 
 
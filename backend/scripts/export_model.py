@@ -0,0 +1,134 @@
+"""Export a TorchScript model for the other inference backends and check they agree with it.
+
+Writes next to the input (or into ``--out-dir``):
+
+* ``<stem>.int8.ts``: linear layers dynamically quantized to int8 (``torch_int8`` backend)
+* ``<stem>.onnx``: ONNX with a dynamic batch axis (``onnxruntime`` backend)
+* ``<stem>.int8.onnx``: the ONNX model with int8 weights (``onnxruntime`` backend)
+
+Every artifact is then loaded through the backend that serves it and run on the same
+frames as the original. A backend passes when its top-1 label matches the original on at
+least ``--min-agreement`` of frames. Frames come from ``--inputs`` (a ``.npy`` array of
+preprocessed frames, e.g. recorded from a receiver) or are standard normal noise of
+``--shape``. The ONNX artifacts need the ``onnx`` extra. Run from ``backend/``::
+
+    python -m scripts.export_model models/artifacts/model.ts --shape 64 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.services.inference_backends import create_backend, quantize_dynamic, softmax
+
+BATCH = 64
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("model", type=Path, help="TorchScript artifact to export")
+    parser.add_argument("--out-dir", type=Path, default=None, help="Default: next to the model")
+    parser.add_argument(
+        "--shape",
+        type=int,
+        nargs="+",
+        default=[64, 2],
+        help="Frame shape without the batch axis (default: %(default)s)",
+    )
+    parser.add_argument("--inputs", type=Path, default=None, help=".npy array of frames")
+    parser.add_argument("--samples", type=int, default=2048, help="Noise frames without --inputs")
+    parser.add_argument("--min-agreement", type=float, default=0.99)
+    parser.add_argument("--no-onnx", action="store_true", help="Only write the int8 TorchScript")
+    return parser.parse_args(argv)
+
+
+def export_int8(model_path: Path, target: Path) -> Path:
+    import torch
+
+    model = torch.jit.load(str(model_path), map_location="cpu").eval()
+    torch.jit.save(quantize_dynamic(model), str(target))
+    return target
+
+
+def export_onnx(model_path: Path, target: Path, shape: Tuple[int, ...]) -> Path:
+    import torch
+
+    model = torch.jit.load(str(model_path), map_location="cpu").eval()
+    torch.onnx.export(
+        model,
+        (torch.zeros((1, *shape)),),
+        str(target),
+        input_names=["csi"],
+        output_names=["logits"],
+        dynamic_axes={"csi": {0: "batch"}, "logits": {0: "batch"}},
+        dynamo=False,
+    )
+    return target
+
+
+def export_onnx_int8(onnx_path: Path, target: Path) -> Path:
+    from onnxruntime import quantization
+
+    quantization.quantize_dynamic(
+        str(onnx_path), str(target), weight_type=quantization.QuantType.QInt8
+    )
+    return target
+
+
+def predict(backend_name: str, path: Path, frames: np.ndarray) -> np.ndarray:
+    import torch
+
+    backend = create_backend(backend_name, path, torch.device("cpu"))
+    chunks = [
+        softmax(backend(torch.from_numpy(frames[offset : offset + BATCH])))
+        for offset in range(0, len(frames), BATCH)
+    ]
+    return np.concatenate(chunks)
+
+
+def load_frames(args: argparse.Namespace) -> np.ndarray:
+    if args.inputs is not None:
+        return np.ascontiguousarray(np.load(args.inputs), dtype=np.float32)
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((args.samples, *args.shape)).astype(np.float32)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = parse_args(argv)
+    out_dir = args.out_dir or args.model.parent
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = args.model.stem
+    frames = load_frames(args)
+
+    artifacts: List[Tuple[str, Path]] = [
+        ("torch_int8", export_int8(args.model, out_dir / f"{stem}.int8.ts"))
+    ]
+    if not args.no_onnx:
+        onnx_path = export_onnx(args.model, out_dir / f"{stem}.onnx", frames.shape[1:])
+        int8_path = export_onnx_int8(onnx_path, out_dir / f"{stem}.int8.onnx")
+        artifacts.extend([("onnxruntime", onnx_path), ("onnxruntime", int8_path)])
+
+    reference = predict("torchscript", args.model, frames)
+    labels = reference.argmax(axis=1)
+    failed = False
+    print(f"{len(frames)} frames of shape {frames.shape[1:]}")
+    for backend_name, path in artifacts:
+        probs = predict(backend_name, path, frames)
+        agreement = float((probs.argmax(axis=1) == labels).mean())
+        drift = float(np.abs(probs - reference).max())
+        ok = agreement >= args.min_agreement
+        failed |= not ok
+        print(
+            f"{'ok  ' if ok else 'FAIL'} {path.name:<28} {backend_name:<12} "
+            f"agreement={agreement:.2%} max_prob_diff={drift:.4f}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
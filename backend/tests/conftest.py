@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+import numpy as np
+import pytest
+
+from app.schemas.csi import CSIPacket
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def make_packet(
+    sequence_id: int = 0,
+    mac_address: str = "24:0a:c4:00:00:01",
+    subcarriers: int = 8,
+    antennas: int = 2,
+    seconds: float = 0.0,
+    seed: Optional[int] = None,
+) -> CSIPacket:
+    rng = np.random.default_rng(sequence_id if seed is None else seed)
+    return CSIPacket(
+        mac_address=mac_address,
+        sequence_id=sequence_id,
+        timestamp=T0 + timedelta(seconds=seconds),
+        rssi=-40.0,
+        noise_floor=-90.0,
+        snr=50.0,
+        csi=rng.standard_normal((subcarriers, antennas)).tolist(),
+    )
+
+
+@pytest.fixture
+def packet() -> Callable[..., CSIPacket]:
+    return make_packet
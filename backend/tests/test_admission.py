@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Dict, List
+
+import pytest
+
+from app.workers.admission import FairShareQueue
+
+A = "24:0a:c4:00:00:0a"
+B = "24:0a:c4:00:00:0b"
+
+
+def _drain(queue: FairShareQueue) -> List[tuple]:
+    items = []
+    while not queue.empty():
+        _, packet = queue.get_nowait()
+        items.append((packet.mac_address, packet.sequence_id))
+    return items
+
+
+def _shed_counter() -> tuple:
+    shed: Dict[str, int] = {}
+
+    def on_shed(mac_address: str, frames: int) -> None:
+        shed[mac_address] = shed.get(mac_address, 0) + frames
+
+    return shed, on_shed
+
+
+def test_dequeues_round_robin_across_devices(packet) -> None:
+    queue = FairShareQueue()
+    for sid in range(3):
+        queue.put_nowait((0.0, packet(sid, mac_address=A)))
+    queue.put_nowait((0.0, packet(0, mac_address=B)))
+    assert queue.qsize() == 4
+    assert _drain(queue) == [(A, 0), (B, 0), (A, 1), (A, 2)]
+    assert queue.qsize() == 0
+
+
+def test_reject_refuses_a_device_over_its_share(packet) -> None:
+    shed, on_shed = _shed_counter()
+    queue = FairShareQueue(4, policy="reject", on_shed=on_shed)
+    for sid in range(4):
+        queue.put_nowait((0.0, packet(sid, mac_address=A)))
+    with pytest.raises(asyncio.QueueFull):
+        queue.put_nowait((0.0, packet(4, mac_address=A)))
+    # A quiet device still gets in, at the expense of the heaviest one.
+    queue.put_nowait((0.0, packet(0, mac_address=B)))
+    assert shed == {A: 2}
+    assert _drain(queue) == [(A, 1), (B, 0), (A, 2), (A, 3)]
+
+
+def test_drop_oldest_makes_room(packet) -> None:
+    shed, on_shed = _shed_counter()
+    queue = FairShareQueue(3, policy="drop_oldest", on_shed=on_shed)
+    for sid in range(5):
+        queue.put_nowait((0.0, packet(sid, mac_address=A)))
+    assert shed == {A: 2}
+    assert _drain(queue) == [(A, 2), (A, 3), (A, 4)]
+
+
+def test_decimate_halves_the_backlog(packet) -> None:
+    shed, on_shed = _shed_counter()
+    queue = FairShareQueue(4, policy="decimate", on_shed=on_shed)
+    for sid in range(5):
+        queue.put_nowait((0.0, packet(sid, mac_address=A)))
+    # Full at 0..3: keep the newest and every second one before it.
+    assert shed == {A: 2}
+    assert _drain(queue) == [(A, 1), (A, 3), (A, 4)]
+
+
+def test_delay_budget_limits_capacity(packet) -> None:
+    queue = FairShareQueue(100, policy="drop_oldest", max_delay_s=0.25)
+    queue.observe_service(frames=10, seconds=1.0)
+    for sid in range(5):
+        queue.put_nowait((0.0, packet(sid, mac_address=A)))
+    assert queue.qsize() == 2
+    assert queue.estimated_delay() == pytest.approx(0.2)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from app.workers.batcher import AdaptiveBatcher
+
+
+def _batcher(queue: asyncio.Queue, **kwargs) -> AdaptiveBatcher:
+    options = dict(max_batch_size=8, max_delay=0.05, adaptive=False, idle_timeout=0.5)
+    options.update(kwargs)
+    return AdaptiveBatcher(queue, name="test", **options)
+
+
+async def test_full_batch_flushes_without_waiting(packet) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    for sid in range(10):
+        queue.put_nowait((time.monotonic(), packet(sid)))
+    began = time.monotonic()
+    batch = await _batcher(queue, max_delay=5.0).next_batch()
+    assert [item.sequence_id for item in batch] == list(range(8))
+    assert time.monotonic() - began < 1.0
+    assert queue.qsize() == 2
+
+
+async def test_partial_batch_flushes_at_the_deadline(packet) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    enqueued = time.monotonic()
+    queue.put_nowait((enqueued, packet(0)))
+    batch = await _batcher(queue).next_batch()
+    waited = time.monotonic() - enqueued
+    assert len(batch) == 1
+    assert 0.04 <= waited < 0.5
+
+
+async def test_frames_arriving_before_the_deadline_join_the_batch(packet) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    queue.put_nowait((time.monotonic(), packet(0)))
+
+    async def late() -> None:
+        await asyncio.sleep(0.01)
+        queue.put_nowait((time.monotonic(), packet(1)))
+
+    task = asyncio.create_task(late())
+    batch = await _batcher(queue, max_delay=0.2).next_batch()
+    await task
+    assert [item.sequence_id for item in batch] == [0, 1]
+
+
+async def test_deadline_counts_from_the_first_enqueue(packet) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    # Already older than the deadline: flushed with whatever is queued.
+    queue.put_nowait((time.monotonic() - 1.0, packet(0)))
+    began = time.monotonic()
+    batch = await _batcher(queue, max_delay=0.5).next_batch()
+    assert len(batch) == 1
+    assert time.monotonic() - began < 0.1
+
+
+async def test_idle_timeout_returns_an_empty_batch() -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    assert await _batcher(queue, idle_timeout=0.01).next_batch() == []
+
+
+async def test_adaptive_target_tracks_the_arrival_rate(packet) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    batcher = _batcher(queue, adaptive=True, max_batch_size=64, max_delay=0.1)
+    assert batcher.target_size == 1
+    now = time.monotonic()
+    # 100 frames/s, enqueued 10 ms apart, drained in two batches.
+    for first in (0, 10):
+        for sid in range(first, first + 10):
+            queue.put_nowait((now - 0.2 + sid * 0.01, packet(sid)))
+        await batcher.next_batch()
+    batcher.observe_inference(batch_size=10, seconds=0.1)
+    # 100/s x (0.1 s deadline + 0.1 s inference)
+    assert batcher.target_size == 20
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.services.csi_codec import (
+    BATCH_HEADER,
+    BINARY_MAGIC,
+    CSIDecodeError,
+    batch_frame_count,
+    decode_binary_batch,
+    encode_binary_batch,
+)
+
+
+def test_round_trip_preserves_every_field(packet) -> None:
+    packets = [packet(sid, seconds=sid * 0.001) for sid in range(3)]
+    packets[1] = packets[1].model_copy(update={"rssi": None, "snr": None})
+    decoded = decode_binary_batch(encode_binary_batch(packets))
+    assert len(decoded) == len(packets)
+    for original, copy in zip(packets, decoded):
+        assert copy.mac_address == original.mac_address
+        assert copy.sequence_id == original.sequence_id
+        assert copy.timestamp == original.timestamp
+        assert copy.rssi == original.rssi
+        assert copy.noise_floor == original.noise_floor
+        assert copy.snr == original.snr
+        assert copy.csi.dtype == np.float32
+        np.testing.assert_allclose(copy.csi, np.asarray(original.csi, dtype=np.float32))
+
+
+def test_frames_of_different_shapes_share_a_batch(packet) -> None:
+    packets = [packet(0, subcarriers=64), packet(1, subcarriers=52, antennas=3)]
+    decoded = decode_binary_batch(encode_binary_batch(packets))
+    assert [frame.csi.shape for frame in decoded] == [(64, 2), (52, 3)]
+
+
+@pytest.mark.parametrize(
+    "mutate, message",
+    [
+        (lambda data: data[:4], "shorter than batch header"),
+        (lambda data: b"XXXX" + data[4:], "magic"),
+        (lambda data: data[:4] + b"\x09\x00" + data[6:], "version"),
+        (lambda data: data[: BATCH_HEADER.size + 10], "Truncated frame header"),
+        (lambda data: data[:-4], "Truncated CSI matrix"),
+        (lambda data: data + b"\x00", "Trailing bytes"),
+    ],
+)
+def test_malformed_batches_are_rejected(packet, mutate, message) -> None:
+    data = encode_binary_batch([packet(0)])
+    assert data.startswith(BINARY_MAGIC)
+    with pytest.raises(CSIDecodeError, match=message):
+        decode_binary_batch(mutate(data))
+
+
+def test_frame_count_is_read_from_the_header_alone(packet) -> None:
+    data = encode_binary_batch([packet(sid) for sid in range(3)])
+    assert batch_frame_count(data[: BATCH_HEADER.size]) == 3
+    with pytest.raises(CSIDecodeError, match="magic"):
+        batch_frame_count(b"XXXX" + data[4:])
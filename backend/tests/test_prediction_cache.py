@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from app.schemas.prediction import PredictionRecord
+from app.services.prediction_batch import PredictionBatch
+from app.services.prediction_cache import PredictionCache
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+A = "24:0a:c4:00:00:0a"
+B = "24:0a:c4:00:00:0b"
+
+
+def _record(mac: str, second: float, sequence_id: int = 0) -> PredictionRecord:
+    return PredictionRecord(
+        mac_address=mac,
+        timestamp=T0 + timedelta(seconds=second),
+        label="human",
+        confidence=0.9,
+        distance_m=1.0,
+        model_version="v1",
+        latency_ms=2.0,
+        sequence_id=sequence_id,
+        rssi=-40.0,
+    )
+
+
+def test_ring_keeps_the_newest_rows_in_order() -> None:
+    cache = PredictionCache(max_size=4)
+    for second in range(50):
+        cache.push(_record(A, second, sequence_id=second))
+    assert cache.count(A) == 4
+    history = cache.history(A)
+    assert [record.sequence_id for record in history] == [46, 47, 48, 49]
+    assert history[-1] == _record(A, 49, sequence_id=49)
+    assert [record.sequence_id for record in cache.history(A, limit=2)] == [48, 49]
+
+
+def test_batch_pushes_wrap_like_single_pushes() -> None:
+    single, batched = PredictionCache(max_size=5), PredictionCache(max_size=5)
+    for start in range(0, 40, 7):
+        records = [_record(A, second, sequence_id=second) for second in range(start, start + 7)]
+        single.bulk_push(records)
+        batched.push_batch(PredictionBatch.from_records(records))
+    assert batched.history(A) == single.history(A)
+    assert [record.sequence_id for record in batched.history(A)] == [37, 38, 39, 40, 41]
+    np.testing.assert_array_equal(batched.columns(A)["sequence_id"], [37, 38, 39, 40, 41])
+
+
+def test_merge_returns_the_newest_rows_across_devices() -> None:
+    cache = PredictionCache(max_size=100)
+    for second in range(0, 20, 2):
+        cache.push(_record(A, second))
+    for second in range(1, 20, 2):
+        cache.push(_record(B, second))
+    newest = cache.history(limit=5)
+    assert [record.timestamp for record in newest] == [
+        T0 + timedelta(seconds=second) for second in (19, 18, 17, 16, 15)
+    ]
+    assert [record.mac_address for record in newest] == [B, A, B, A, B]
+    assert len(cache.history()) == 20
+    assert cache.history() == cache.history(limit=20)
+
+
+def test_merge_sorts_out_of_order_rows() -> None:
+    cache = PredictionCache(max_size=100)
+    for second in (5, 1, 3):
+        cache.push(_record(A, second))
+    cache.push(_record(B, 4))
+    seconds = [int((record.timestamp - T0).total_seconds()) for record in cache.history(limit=3)]
+    assert seconds == [5, 4, 3]
+
+
+def test_latest_returns_one_row_per_device() -> None:
+    cache = PredictionCache(max_size=10)
+    cache.push(_record(A, 1))
+    cache.push(_record(A, 2))
+    cache.push(_record(B, 0))
+    latest = {record.mac_address: record.timestamp for record in cache.latest()}
+    assert latest == {A: T0 + timedelta(seconds=2), B: T0}
+
+
+def test_timestamps_come_back_with_their_original_offset() -> None:
+    moments = [
+        T0,
+        T0.replace(tzinfo=None),
+        T0.astimezone(timezone(timedelta(hours=5, minutes=30))),
+        T0.astimezone(timezone(-timedelta(hours=8))),
+    ]
+    records = [
+        _record(A, 0, sequence_id=index).model_copy(update={"timestamp": moment})
+        for index, moment in enumerate(moments)
+    ]
+    single, batched = PredictionCache(max_size=10), PredictionCache(max_size=10)
+    single.bulk_push(records)
+    batched.push_batch(PredictionBatch.from_records(records))
+    for cache in (single, batched):
+        history = cache.history(A)
+        assert history == records
+        assert [record.timestamp.utcoffset() for record in history] == [
+            moment.utcoffset() for moment in moments
+        ]
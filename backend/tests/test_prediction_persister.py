@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+import app.models.rollup  # noqa: F401  (registers the rollup tables)
+from app.infrastructure.postgres import create_engine, create_session_factory
+from app.models.prediction import Base, PredictionORM
+from app.repositories.prediction_persister import PredictionPersister
+from app.schemas.prediction import PredictionRecord
+from app.services.metrics import PERSIST_REJECTED
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _records(count: int) -> List[PredictionRecord]:
+    return [
+        PredictionRecord(
+            mac_address=f"24:0a:c4:00:00:{index % 4:02x}",
+            timestamp=T0 + timedelta(milliseconds=index),
+            label="human",
+            confidence=0.9,
+            distance_m=1.0,
+            model_version="v1",
+            latency_ms=2.0,
+            sequence_id=index,
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'predictions.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield create_session_factory(engine)
+    await engine.dispose()
+
+
+async def _stored(session_factory) -> List[int]:
+    async with session_factory() as session:
+        result = await session.execute(
+            select(PredictionORM.sequence_id).order_by(PredictionORM.sequence_id)
+        )
+        return list(result.scalars())
+
+
+async def test_flushes_in_batches(session_factory) -> None:
+    persister = PredictionPersister(session_factory, batch_size=32, flush_interval=0.01)
+    persister.start()
+    await persister.add_many(_records(100))
+    await persister.stop()
+    assert await _stored(session_factory) == list(range(100))
+    assert persister.buffered == 0
+
+
+async def test_bad_rows_are_isolated_by_halving(session_factory) -> None:
+    persister = PredictionPersister(session_factory, batch_size=100, flush_interval=0.01)
+    records = _records(100)
+    # Too large for SQLite's INTEGER: the driver refuses to bind these rows.
+    for index in (7, 8, 63):
+        records[index].sequence_id = 2**70
+    rejected = PERSIST_REJECTED._value.get()
+    persister.start()
+    await persister.add_many(records)
+    await persister.stop()
+    assert await _stored(session_factory) == [
+        index for index in range(100) if index not in (7, 8, 63)
+    ]
+    assert PERSIST_REJECTED._value.get() - rejected == 3
+
+
+async def test_connection_errors_keep_rows_buffered(session_factory) -> None:
+    persister = PredictionPersister(session_factory, batch_size=10, flush_interval=0.01)
+    attempts = []
+
+    class Unavailable:
+        async def __aenter__(self):
+            attempts.append(1)
+            raise OperationalError("INSERT", {}, Exception("database is down"))
+
+        async def __aexit__(self, *exc) -> None:
+            return None
+
+    persister._session_factory = Unavailable
+    persister.start()
+    await persister.add_many(_records(10))
+    while len(attempts) < 5:
+        await asyncio.sleep(0.01)
+    assert persister.buffered == 10
+    persister._session_factory = session_factory
+    await persister.stop()
+    assert await _stored(session_factory) == list(range(10))
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.infrastructure.postgres import create_engine, create_session_factory
+from app.models.prediction import Base
+from app.repositories.prediction_repository import (
+    PredictionRepository,
+    decode_cursor,
+    encode_cursor,
+)
+from app.schemas.prediction import PredictionRecord
+
+T0 = datetime(2026, 1, 1)
+
+
+@pytest.mark.parametrize(
+    "timestamp",
+    [T0, T0 + timedelta(microseconds=123456), datetime(2026, 1, 1, 2, tzinfo=timezone.utc)],
+)
+def test_cursor_round_trip(timestamp: datetime) -> None:
+    cursor = encode_cursor(timestamp, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "bm9waXBl", encode_cursor(T0, 1)[:-3]])
+def test_malformed_cursor_raises_value_error(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.fixture
+async def repository(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'predictions.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    async with create_session_factory(engine)() as session:
+        yield PredictionRepository(session)
+    await engine.dispose()
+
+
+async def test_keyset_pages_cover_every_row_once(repository) -> None:
+    # Pairs of rows share a timestamp, so pages must break ties on id.
+    await repository.add_many(
+        PredictionRecord(
+            mac_address="24:0a:c4:00:00:01",
+            timestamp=T0 + timedelta(seconds=index // 2),
+            label="human",
+            confidence=0.9,
+            distance_m=1.0,
+            model_version="v1",
+            latency_ms=2.0,
+            sequence_id=index,
+        )
+        for index in range(25)
+    )
+    seen = []
+    cursor = None
+    while True:
+        items, cursor = await repository.history_page(page_size=4, cursor=cursor)
+        seen.extend(item.sequence_id for item in items)
+        if cursor is None:
+            break
+    assert sorted(seen) == list(range(25))
+    assert len(seen) == 25
+    assert seen[:3] == [24, 23, 22]
+    assert await repository.count() == 25
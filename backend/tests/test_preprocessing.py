@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import numpy as np
+
+from app.services.preprocessing import preprocess_batch, preprocess_packet
+
+
+def test_batch_matches_the_per_packet_baseline(packet) -> None:
+    packets = [packet(sid) for sid in range(6)]
+    packets += [packet(sid, subcarriers=52, antennas=3) for sid in range(6, 9)]
+    packets.insert(2, packet(9, subcarriers=52, antennas=3))
+    batched = preprocess_batch(packets)
+    assert [item[1] for item in batched] == packets
+    for (feature, _), original in zip(batched, packets):
+        expected, _ = preprocess_packet(original)
+        assert feature.dtype == np.float32
+        assert feature.shape == expected.shape
+        np.testing.assert_allclose(feature, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_features_are_normalized_per_frame(packet) -> None:
+    loud = packet(0).model_copy(update={"csi": (np.array(packet(0).csi) * 100).tolist()})
+    features = [feature for feature, _ in preprocess_batch([packet(0), loud])]
+    for feature in features:
+        assert abs(float(feature.mean())) < 1e-4
+        assert abs(float(feature.std()) - 1.0) < 1e-3
+
+
+def test_empty_batch() -> None:
+    assert preprocess_batch([]) == []
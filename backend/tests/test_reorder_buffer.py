@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from app.services.reorder_buffer import ReorderBuffer
+
+
+def _ids(packets) -> list:
+    return [packet.sequence_id for packet in packets]
+
+
+def test_in_order_frames_pass_straight_through(packet) -> None:
+    buffer = ReorderBuffer(depth=4, max_delay_s=1.0)
+    for sid in range(3):
+        released, skipped = buffer.push(sid, packet(sid), now=0.0)
+        assert _ids(released) == [sid]
+        assert skipped == 0
+    assert len(buffer) == 0
+
+
+def test_gap_is_filled_by_a_late_frame(packet) -> None:
+    buffer = ReorderBuffer(depth=4, max_delay_s=1.0)
+    buffer.push(0, packet(0), now=0.0)
+    assert buffer.push(2, packet(2), now=0.0) == ([], 0)
+    assert buffer.push(3, packet(3), now=0.0) == ([], 0)
+    released, skipped = buffer.push(1, packet(1), now=0.1)
+    assert _ids(released) == [1, 2, 3]
+    assert skipped == 0
+    assert len(buffer) == 0
+
+
+def test_gap_expires_after_max_delay(packet) -> None:
+    buffer = ReorderBuffer(depth=4, max_delay_s=0.05)
+    buffer.push(0, packet(0), now=0.0)
+    buffer.push(3, packet(3), now=1.0)
+    buffer.push(4, packet(4), now=1.01)
+    assert buffer.expire(now=1.04) == ([], 0)
+    released, skipped = buffer.expire(now=1.05)
+    assert _ids(released) == [3, 4]
+    assert skipped == 2
+    assert len(buffer) == 0
+
+
+def test_depth_overflow_gives_up_on_the_gap(packet) -> None:
+    buffer = ReorderBuffer(depth=2, max_delay_s=10.0)
+    buffer.push(0, packet(0), now=0.0)
+    buffer.push(2, packet(2), now=0.0)
+    buffer.push(3, packet(3), now=0.0)
+    released, skipped = buffer.push(4, packet(4), now=0.0)
+    assert _ids(released) == [2, 3, 4]
+    assert skipped == 1
+
+
+def test_frame_behind_the_released_run_is_passed_through(packet) -> None:
+    buffer = ReorderBuffer(depth=4, max_delay_s=0.01)
+    buffer.push(0, packet(0), now=0.0)
+    buffer.push(2, packet(2), now=0.0)
+    buffer.expire(now=1.0)
+    released, skipped = buffer.push(1, packet(1), now=1.0)
+    assert _ids(released) == [1]
+    assert skipped == 0
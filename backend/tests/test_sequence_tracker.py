@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from app.services.sequence_tracker import SEQUENCE_MODULUS, SequenceTracker
+
+
+def test_in_order_frames_have_no_loss() -> None:
+    tracker = SequenceTracker()
+    assert [tracker.observe(sid) for sid in range(5)] == [0, 1, 2, 3, 4]
+    assert (tracker.received, tracker.expected, tracker.lost) == (5, 5, 0)
+
+
+def test_unwraps_the_12_bit_counter() -> None:
+    tracker = SequenceTracker()
+    ids = [SEQUENCE_MODULUS - 2, SEQUENCE_MODULUS - 1, 0, 1]
+    assert [tracker.observe(sid) for sid in ids] == [4094, 4095, 4096, 4097]
+    assert tracker.lost == 0
+    assert tracker.reordered == 0
+
+
+def test_gap_counts_as_lost_until_a_late_frame_fills_it() -> None:
+    tracker = SequenceTracker()
+    tracker.observe(0)
+    tracker.observe(3)
+    assert tracker.lost == 2
+    assert tracker.observe(1) == 1
+    assert tracker.reordered == 1
+    assert tracker.lost == 1
+
+
+def test_late_frame_across_the_wrap_is_reordered() -> None:
+    tracker = SequenceTracker()
+    tracker.observe(4094)
+    tracker.observe(0)
+    assert tracker.observe(4095) == 4095
+    assert tracker.lost == 0
+    assert tracker.reordered == 1
+
+
+def test_duplicates_are_detected_within_the_window() -> None:
+    tracker = SequenceTracker(reorder_window=8)
+    for sid in range(10):
+        tracker.observe(sid)
+    assert tracker.observe(9) is None
+    assert tracker.observe(4) is None
+    assert tracker.duplicates == 2
+    assert tracker.received == 10
+    assert tracker.duplicate_ratio == 2 / 12
+
+
+def test_forward_jump_past_the_window_resets_the_bitmap() -> None:
+    tracker = SequenceTracker(reorder_window=8)
+    tracker.observe(0)
+    tracker.observe(100)
+    assert tracker.lost == 99
+    # 95 was never seen: a late frame, not a duplicate.
+    assert tracker.observe(95) == 95
+    assert tracker.observe(95) is None
+
+
+def test_forget_lets_a_retry_through() -> None:
+    tracker = SequenceTracker()
+    for sid in range(3):
+        tracker.observe(sid)
+    assert tracker.forget(1)
+    assert tracker.received == 2
+    assert tracker.lost == 1
+    assert tracker.observe(1) == 1
+    assert tracker.lost == 0
+    assert tracker.duplicates == 0
+
+
+def test_forget_ignores_unknown_ids() -> None:
+    tracker = SequenceTracker(reorder_window=8)
+    assert not tracker.forget(0)
+    for sid in range(20):
+        tracker.observe(sid)
+    assert not tracker.forget(2)
+    assert tracker.forget(19)
+    assert not tracker.forget(19)
+    assert tracker.received == 19
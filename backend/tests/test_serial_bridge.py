@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import pty
+import termios
+import time
+from typing import Callable, Iterator, List, Tuple
+
+import httpx
+import orjson
+import pytest
+
+from scripts.csi_serial_bridge import SerialBridge, frame_key, parse_args
+
+MAC = "24:0a:c4:00:00:01"
+
+
+def _line(sequence_id: int, mac: str = MAC) -> bytes:
+    frame = {
+        "mac_address": mac,
+        "sequence_id": sequence_id,
+        "timestamp": "2026-01-01T00:00:00Z",
+        "rssi": -40.0,
+        "csi": [[1.0, 2.0], [3.0, 4.0]],
+    }
+    return b"CSI_JSON:" + orjson.dumps(frame) + b"\n"
+
+
+def _ids(request: httpx.Request) -> List[int]:
+    return [packet["sequence_id"] for packet in orjson.loads(request.content)["packets"]]
+
+
+def _accepted(request: httpx.Request, rejected: Tuple[int, ...] = ()) -> httpx.Response:
+    ids = _ids(request)
+    return httpx.Response(
+        202,
+        json={
+            "accepted": len(ids) - len(rejected),
+            "rejected": len(rejected),
+            "queued": 0,
+            "rejected_frames": [{"mac_address": MAC, "sequence_id": sid} for sid in rejected],
+        },
+    )
+
+
+async def _wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+def serial_port() -> Iterator[Tuple[int, int]]:
+    master, slave = pty.openpty()
+    try:
+        yield master, slave
+    finally:
+        os.close(master)
+        os.close(slave)
+
+
+class Harness:
+    def __init__(self, slave: int, handler, *extra: str) -> None:
+        self._slave = slave
+        args = parse_args(
+            [
+                "--port",
+                os.ttyname(slave),
+                "--backend",
+                "http://backend",
+                "--retry",
+                "0.01",
+                "--max-retry-delay",
+                "0.05",
+                "--connections",
+                "1",
+                *extra,
+            ]
+        )
+        self.requests: List[List[int]] = []
+
+        async def record(request: httpx.Request) -> httpx.Response:
+            self.requests.append(_ids(request))
+            response = handler(request)
+            if asyncio.iscoroutine(response):
+                response = await response
+            return response
+
+        self.bridge = SerialBridge(args, transport=httpx.MockTransport(record))
+
+    async def __aenter__(self) -> "Harness":
+        self._task = asyncio.create_task(self.bridge.run())
+        # pyserial flushes the port while opening it, which ends with raw mode.
+        await _wait_for(lambda: not termios.tcgetattr(self._slave)[3] & termios.ICANON)
+        await asyncio.sleep(0.1)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.bridge.stop()
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+async def test_batches_frames_in_order(serial_port) -> None:
+    master, slave = serial_port
+    async with Harness(slave, _accepted, "--batch-size", "4", "--linger-ms", "200") as harness:
+        os.write(master, b"boot log line\n" + b"".join(_line(sid) for sid in range(10)))
+        await _wait_for(lambda: harness.bridge.sent == 10)
+
+    assert [sid for batch in harness.requests for sid in batch] == list(range(10))
+    assert max(len(batch) for batch in harness.requests) == 4
+    assert len(harness.requests) < 10
+
+
+async def test_retries_failed_batches_with_backoff(serial_port) -> None:
+    master, slave = serial_port
+    attempts: List[float] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(time.monotonic())
+        if len(attempts) <= 3:
+            return httpx.Response(503)
+        return _accepted(request)
+
+    async with Harness(slave, handler, "--batch-size", "8", "--linger-ms", "100") as harness:
+        os.write(master, b"".join(_line(sid) for sid in range(3)))
+        await _wait_for(lambda: harness.bridge.sent == 3)
+
+    assert harness.requests == [[0, 1, 2]] * 4
+    assert harness.bridge.failed_posts == 3
+    assert harness.bridge.dropped == 0
+    gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+    assert gaps[0] >= 0.01 and gaps[1] >= 0.02 and gaps[2] >= 0.04
+
+
+async def test_gives_up_after_max_attempts(serial_port) -> None:
+    master, slave = serial_port
+    async with Harness(
+        slave, lambda request: httpx.Response(503), "--max-attempts", "2", "--linger-ms", "100"
+    ) as harness:
+        os.write(master, b"".join(_line(sid) for sid in range(2)))
+        await _wait_for(lambda: harness.bridge.dropped == 2)
+
+    assert len(harness.requests) == 2
+    assert harness.bridge.sent == 0
+
+
+async def test_resends_only_frames_the_queue_rejected(serial_port) -> None:
+    master, slave = serial_port
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return _accepted(request, rejected=(1, 3) if len(calls) == 1 else ())
+
+    async with Harness(slave, handler, "--batch-size", "4", "--linger-ms", "200") as harness:
+        os.write(master, b"".join(_line(sid) for sid in range(4)))
+        await _wait_for(lambda: harness.bridge.sent == 4)
+
+    assert harness.requests == [[0, 1, 2, 3], [1, 3]]
+    assert harness.bridge.rejected == 2
+    assert harness.bridge.dropped == 0
+
+
+async def test_invalid_frames_are_isolated(serial_port) -> None:
+    master, slave = serial_port
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        # The backend refuses a whole batch for one frame it cannot validate.
+        if 2 in _ids(request):
+            return httpx.Response(422, json={"detail": "invalid"})
+        return _accepted(request)
+
+    async with Harness(slave, handler, "--batch-size", "4", "--linger-ms", "200") as harness:
+        os.write(master, _line(9, mac="not-a-mac") + b"".join(_line(sid) for sid in range(4)))
+        await _wait_for(lambda: harness.bridge.sent + harness.bridge.dropped == 4)
+
+    assert harness.bridge.malformed == 1
+    assert harness.bridge.sent == 3
+    assert harness.bridge.dropped == 1
+    assert all(9 not in batch for batch in harness.requests)
+
+
+async def test_drops_oldest_frames_on_overflow(serial_port) -> None:
+    master, slave = serial_port
+    posted = asyncio.Event()
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        posted.set()
+        await release.wait()
+        return _accepted(request)
+
+    async with Harness(
+        slave, handler, "--batch-size", "1", "--linger-ms", "0", "--buffer-size", "3"
+    ) as harness:
+        os.write(master, _line(0))
+        await asyncio.wait_for(posted.wait(), 5.0)
+        os.write(master, b"".join(_line(sid) for sid in range(1, 10)))
+        await _wait_for(lambda: harness.bridge.read == 10)
+        release.set()
+        await _wait_for(lambda: harness.bridge.sent == 4)
+
+    assert harness.bridge.dropped == 6
+    assert harness.requests == [[0], [7], [8], [9]]
+
+
+@pytest.mark.parametrize(
+    "frame",
+    [
+        [],
+        {"mac_address": "24:0a:c4:00:01", "sequence_id": 1, "timestamp": "t", "csi": [[1]]},
+        {"mac_address": MAC, "sequence_id": -1, "timestamp": "t", "csi": [[1]]},
+        {"mac_address": MAC, "sequence_id": 1, "csi": [[1]]},
+        {"mac_address": MAC, "sequence_id": 1, "timestamp": "t", "csi": []},
+        {"mac_address": MAC, "sequence_id": 1, "timestamp": "t", "csi": [[1, 2], [3]]},
+        {"mac_address": MAC, "sequence_id": 1, "timestamp": "t", "rssi": "x", "csi": [[1]]},
+    ],
+)
+def test_frame_key_rejects_invalid_frames(frame) -> None:
+    with pytest.raises(ValueError):
+        frame_key(frame)
+
+
+def test_frame_key_normalizes_mac() -> None:
+    frame = {"mac_address": "24-0A-C4-00-00-01", "sequence_id": 7, "timestamp": 0, "csi": [[1]]}
+    assert frame_key(frame) == (MAC, 7)
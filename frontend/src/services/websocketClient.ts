@@ -65,12 +65,28 @@ export function connectWebSocket(): void {
   currentSocket.onmessage = (event) => {
     try {
       const data = JSON.parse(event.data);
-      if (data?.type === "ping") {
-        return;
+      let items: Record<string, unknown>[];
+      switch (data?.type) {
+        case "predictions":
+          // The backend coalesces each inference batch into one frame.
+          items = Array.isArray(data.items) ? data.items : [];
+          break;
+        case "error":
+          console.warn("WebSocket subscription rejected", data.detail);
+          return;
+        case undefined:
+          // Untyped frames carry a single prediction.
+          items = [data];
+          break;
+        default:
+          // Control frames such as "ping" and "subscribed".
+          return;
       }
-      const prediction = normalizePrediction(data);
-      useAppStore.getState().addPrediction(prediction);
-      frameCount += 1;
+      const { addPrediction } = useAppStore.getState();
+      for (const item of items) {
+        addPrediction(normalizePrediction(item));
+      }
+      frameCount += items.length;
       const now = performance.now();
       const elapsed = now - lastTimestamp;
       if (elapsed >= 1000) {